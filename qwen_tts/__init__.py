@@ -18,7 +18,13 @@
 qwen_tts: Qwen-TTS package.
 """
 
-from .inference.qwen3_tts_model import Qwen3TTSModel, VoiceClonePromptItem
+from .inference.qwen3_tts_model import (
+    Qwen3TTSModel,
+    VoiceClonePromptCache,
+    VoiceClonePromptItem,
+    VoiceLibrary,
+)
+from .inference.qwen3_tts_scheduler import Qwen3TTSScheduler
 from .inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
 
 __all__ = ["__version__"]
\ No newline at end of file
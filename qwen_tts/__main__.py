@@ -18,6 +18,8 @@ def main():
         "qwen_tts package.\n"
         "Use CLI entrypoints:\n"
         "  - qwen-tts-demo\n"
+        "  - python -m qwen_tts.cli.export_onnx\n"
+        "  - python -m qwen_tts.cli.benchmark_dit\n"
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Compare the 25Hz DiT ODE solvers and guidance options: mel distance to the default decode against the DiT cost.
+"""
+
+import argparse
+
+from ..inference.qwen3_tts_benchmark import (
+    DEFAULT_DIT_SOLVER_SETTINGS,
+    benchmark_dit_guidance,
+    benchmark_dit_solvers,
+)
+from ..inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
+
+_METRICS = ("nfe", "forward_cost", "mel_distance", "seconds")
+
+
+def _parse_setting(value: str):
+    solver, _, num_steps = value.partition(":")
+    if not num_steps.isdigit():
+        raise argparse.ArgumentTypeError(f"expected SOLVER:NUM_STEPS, got {value!r}")
+    return solver, int(num_steps)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="qwen-tts-benchmark-dit",
+        description=(
+            "Benchmark the DiT ODE solvers (or, with --guidance, the guidance options) of a 25Hz speech\n"
+            "tokenizer on real audio.\n"
+            "Each setting is scored by its mel distance to the reference decode (same noise).\n\n"
+            "Examples:\n"
+            "  python -m qwen_tts.cli.benchmark_dit Qwen/Qwen3-TTS-Tokenizer-25Hz a.wav b.wav\n"
+            "  python -m qwen_tts.cli.benchmark_dit ./speech_tokenizer a.wav --setting heun:3 --setting multistep:6\n"
+            "  python -m qwen_tts.cli.benchmark_dit Qwen/Qwen3-TTS-Tokenizer-25Hz a.wav --guidance\n"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument("tokenizer", help="25Hz speech tokenizer repo id or local directory.")
+    parser.add_argument("audios", nargs="+", help="Audio files encoded to get the codes and speaker conditioning.")
+    parser.add_argument(
+        "--setting",
+        dest="settings",
+        type=_parse_setting,
+        action="append",
+        help=(
+            "SOLVER:NUM_STEPS to benchmark, repeatable (default: "
+            + " ".join(f"{s}:{n}" for s, n in DEFAULT_DIT_SOLVER_SETTINGS)
+            + ")."
+        ),
+    )
+    parser.add_argument(
+        "--reference",
+        type=_parse_setting,
+        default=("euler", 10),
+        help=(
+            "Reference SOLVER:NUM_STEPS (default: euler:10, the default decode).\n"
+            "With --guidance, every guidance setting also runs with it."
+        ),
+    )
+    parser.add_argument(
+        "--guidance",
+        action="store_true",
+        help=(
+            "Benchmark the default guidance-interval / guidance-reuse settings instead of the solvers\n"
+            "(cannot be combined with --setting)."
+        ),
+    )
+    parser.add_argument("--device", default="cpu", help="Device to run on (default: cpu).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the DiT initial noise.")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.guidance and args.settings:
+        parser.error("--setting selects solver settings and cannot be combined with --guidance.")
+
+    tokenizer = Qwen3TTSTokenizer.from_pretrained(args.tokenizer, device_map=args.device)
+    encoded = tokenizer.encode(args.audios)
+    if args.guidance:
+        solver, num_steps = args.reference
+        rows = benchmark_dit_guidance(
+            tokenizer, encoded, reference=dict(solver=solver, num_steps=num_steps), seed=args.seed
+        )
+    else:
+        rows = benchmark_dit_solvers(
+            tokenizer, encoded, settings=args.settings, reference=args.reference, seed=args.seed
+        )
+
+    print(f"{'setting':<48} {'nfe':>4} {'cost':>5} {'mel dist':>9} {'seconds':>8}")
+    for row in rows:
+        setting = " ".join(f"{key}={value}" for key, value in row.items() if key not in _METRICS) or "reference"
+        print(
+            f"{setting:<48} {row['nfe']:>4} {row['forward_cost']:>5} "
+            f"{row['mel_distance']:>9.4f} {row['seconds']:>8.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
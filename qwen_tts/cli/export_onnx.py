@@ -0,0 +1,76 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Export the speech tokenizer decoder of a Qwen3 TTS checkpoint to ONNX.
+"""
+
+import argparse
+import os
+
+from ..inference.qwen3_tts_onnx import Qwen3TTSOnnxDecoder, check_onnx_decoder_parity, export_onnx_decoder
+from ..inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="qwen-tts-export-onnx",
+        description=(
+            "Export the speech tokenizer decoder (12Hz or 25Hz) to ONNX for CPU inference with ONNX Runtime,\n"
+            "then check the exported graphs against the PyTorch decoder.\n\n"
+            "Examples:\n"
+            "  python -m qwen_tts.cli.export_onnx Qwen/Qwen3-TTS-Tokenizer-12Hz -o onnx/tokenizer_12hz\n"
+            "  python -m qwen_tts.cli.export_onnx ./Qwen3-TTS-12Hz-1.7B-Base/speech_tokenizer -o onnx --no-check\n\n"
+            "Load the result with `Qwen3TTSTokenizer.load_onnx_decoder(output_dir)`.\n"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument("tokenizer", help="Speech tokenizer repo id or local directory.")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directory for the ONNX graphs.")
+    parser.add_argument("--opset", type=int, default=18, help="ONNX opset version (default: 18).")
+    parser.add_argument(
+        "--check",
+        default=True,
+        action=argparse.BooleanOptionalAction,
+        help="Compare ONNX Runtime and PyTorch outputs on random codes after export (default: enabled).",
+    )
+    parser.add_argument("--check-frames", type=int, default=150, help="Codec frames per utterance for --check.")
+    parser.add_argument(
+        "--tolerance", type=float, default=1e-3, help="Maximum absolute sample difference accepted by --check."
+    )
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    tokenizer = Qwen3TTSTokenizer.from_pretrained(args.tokenizer, device_map="cpu")
+    paths = export_onnx_decoder(tokenizer, args.output_dir, opset_version=args.opset)
+    for path in paths:
+        print(f"exported {path} ({os.path.getsize(path) / 2**20:.1f} MiB)")
+
+    if args.check:
+        diff = check_onnx_decoder_parity(
+            tokenizer, Qwen3TTSOnnxDecoder(args.output_dir), num_frames=args.check_frames
+        )
+        print(f"max abs difference to PyTorch: {diff:.3e}")
+        if diff > args.tolerance:
+            print(f"parity check failed (tolerance {args.tolerance:.1e})")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,4 +15,5 @@
 # limitations under the License.
 from .configuration_qwen3_tts import Qwen3TTSConfig
 from .modeling_qwen3_tts import Qwen3TTSForConditionalGeneration
-from .processing_qwen3_tts import Qwen3TTSProcessor
\ No newline at end of file
+from .processing_qwen3_tts import Qwen3TTSProcessor
+from .scheduling_qwen3_tts import Qwen3TTSTalkerPrefixCache, Qwen3TTSTalkerScheduler
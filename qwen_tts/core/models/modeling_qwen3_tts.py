@@ -147,8 +147,16 @@ class SqueezeExcitationBlock(nn.Module):
         )
         self.sigmoid = nn.Sigmoid()
 
-    def forward(self, hidden_states):
-        hidden_states_mean = hidden_states.mean(dim=2, keepdim=True)
+    def forward(self, hidden_states, lengths=None):
+        if lengths is None:
+            hidden_states_mean = hidden_states.mean(dim=2, keepdim=True)
+        else:
+            # average over the real frames of each sequence only
+            seq_length = hidden_states.shape[-1]
+            mask = (
+                torch.arange(seq_length, device=hidden_states.device) < (lengths * seq_length).unsqueeze(1)
+            ).to(hidden_states.dtype).unsqueeze(1)
+            hidden_states_mean = (hidden_states * mask).sum(dim=2, keepdim=True) / mask.sum(dim=2, keepdim=True)
 
         hidden_states_mean = self.relu(self.conv1(hidden_states_mean))
         hidden_states_mean = self.sigmoid(self.conv2(hidden_states_mean))
@@ -211,9 +219,18 @@ class AttentiveStatisticsPooling(nn.Module):
         std = torch.sqrt((m * (x - mean.unsqueeze(dim)).pow(2)).sum(dim).clamp(self.eps))
         return mean, std
 
-    def forward(self, hidden_states):
+    def forward(self, hidden_states, lengths=None):
+        """
+        Args:
+            hidden_states (`torch.FloatTensor` of shape `(batch_size, channels, seq_length)`):
+                Right-padded input features.
+            lengths (`torch.FloatTensor` of shape `(batch_size,)`, *optional*):
+                Relative length of each sequence in `(0, 1]`. Padded frames are excluded from the statistics and the
+                attention. If None, every frame is used.
+        """
         seq_length = hidden_states.shape[-1]
-        lengths = torch.ones(hidden_states.shape[0], device=hidden_states.device)
+        if lengths is None:
+            lengths = torch.ones(hidden_states.shape[0], device=hidden_states.device)
 
         # Make binary mask of shape [N, 1, L]
         mask = self._length_to_mask(
@@ -297,13 +314,13 @@ class SqueezeExcitationRes2NetBlock(nn.Module):
         )
         self.se_block = SqueezeExcitationBlock(out_channels, se_channels, out_channels)
 
-    def forward(self, hidden_state):
+    def forward(self, hidden_state, lengths=None):
         residual = hidden_state
 
         hidden_state = self.tdnn1(hidden_state)
         hidden_state = self.res2net_block(hidden_state)
         hidden_state = self.tdnn2(hidden_state)
-        hidden_state = self.se_block(hidden_state)
+        hidden_state = self.se_block(hidden_state, lengths=lengths)
 
         return hidden_state + residual
 
@@ -370,13 +387,24 @@ class Qwen3TTSSpeakerEncoder(torch.nn.Module):
             padding_mode="reflect",
         )
 
-    def forward(self, hidden_states):
+    def forward(self, hidden_states, lengths=None):
+        """
+        Args:
+            hidden_states (`torch.FloatTensor` of shape `(batch_size, seq_length, mel_dim)`):
+                Right-padded mel spectrograms.
+            lengths (`torch.FloatTensor` of shape `(batch_size,)`, *optional*):
+                Relative length of each spectrogram in `(0, 1]`, used to ignore padding in the squeeze-excitation
+                averages and in the attentive statistics pooling.
+        """
         # Minimize transpose for efficiency
         hidden_states = hidden_states.transpose(1, 2)
 
         hidden_states_list = []
         for layer in self.blocks:
-            hidden_states = layer(hidden_states)
+            if isinstance(layer, SqueezeExcitationRes2NetBlock):
+                hidden_states = layer(hidden_states, lengths=lengths)
+            else:
+                hidden_states = layer(hidden_states)
             hidden_states_list.append(hidden_states)
 
         # Multi-layer feature aggregation
@@ -384,7 +412,7 @@ class Qwen3TTSSpeakerEncoder(torch.nn.Module):
         hidden_states = self.mfa(hidden_states)
 
         # Attentive Statistical Pooling
-        hidden_states = self.asp(hidden_states)
+        hidden_states = self.asp(hidden_states, lengths=lengths)
 
         # Final linear transformation
         hidden_states = self.fc(hidden_states)
@@ -396,6 +424,111 @@ class Qwen3TTSSpeakerEncoder(torch.nn.Module):
 def dynamic_range_compression_torch(x, C=1, clip_val=1e-5):
     return torch.log(torch.clamp(x, min=clip_val) * C)
 
+class MelSpectrogramFrontend:
+    """
+    Log-mel spectrogram with slaney-normalized librosa filterbank and Hann-window STFT, as `mel_spectrogram`.
+
+    The filterbank and the window are built once per (device, dtype) and reused across calls. Batched input may carry
+    per-row lengths: every row is reflect-padded at its own end, so each row's frames equal those of the row computed
+    alone.
+
+    Args:
+        check_range (bool): Print a warning when the waveform leaves [-1, 1]. This costs two reductions over the
+            input; disable it on hot paths.
+    """
+
+    def __init__(
+        self,
+        n_fft: int,
+        num_mels: int,
+        sampling_rate: int,
+        hop_size: int,
+        win_size: int,
+        fmin: int,
+        fmax: int = None,
+        center: bool = False,
+        check_range: bool = True,
+    ):
+        self.n_fft = n_fft
+        self.num_mels = num_mels
+        self.sampling_rate = sampling_rate
+        self.hop_size = hop_size
+        self.win_size = win_size
+        self.fmin = fmin
+        self.fmax = fmax
+        self.center = center
+        self.check_range = check_range
+        self.mel_basis = {}
+        self.hann_window = {}
+
+    def _buffers(self, device: torch.device, dtype: torch.dtype) -> tuple[torch.Tensor, torch.Tensor]:
+        key = (str(device), dtype)
+        if key not in self.mel_basis:
+            mel = librosa_mel_fn(
+                sr=self.sampling_rate, n_fft=self.n_fft, n_mels=self.num_mels, fmin=self.fmin, fmax=self.fmax
+            )
+            self.mel_basis[key] = torch.from_numpy(mel).to(device=device, dtype=dtype)
+            self.hann_window[key] = torch.hann_window(self.win_size).to(device=device, dtype=dtype)
+        return self.mel_basis[key], self.hann_window[key]
+
+    def num_frames(self, lengths: torch.Tensor) -> torch.Tensor:
+        """Number of frames produced for waveforms of `lengths` samples."""
+        padding = (self.n_fft - self.hop_size) // 2
+        return (lengths + 2 * padding - self.n_fft) // self.hop_size + 1
+
+    def __call__(self, y: torch.Tensor, lengths: Optional[torch.Tensor] = None) -> torch.Tensor:
+        """
+        Args:
+            y (`torch.Tensor` of shape `(batch_size, num_samples)`): Right-padded waveforms.
+            lengths (`torch.LongTensor` of shape `(batch_size,)`, *optional*): Valid samples of each row. If None,
+                every row is `num_samples` long.
+
+        Returns:
+            `torch.Tensor` of shape `(batch_size, num_mels, num_frames)`. Frames past `num_frames(lengths)` of a row
+            are computed from its padding and should be ignored.
+        """
+        if self.check_range:
+            if torch.min(y) < -1.0:
+                print(f"[WARNING] Min value of input waveform signal is {torch.min(y)}")
+            if torch.max(y) > 1.0:
+                print(f"[WARNING] Max value of input waveform signal is {torch.max(y)}")
+
+        mel_basis, hann_window = self._buffers(y.device, y.dtype)
+
+        padding = (self.n_fft - self.hop_size) // 2
+        if lengths is None or bool((lengths == y.shape[-1]).all()):
+            y = torch.nn.functional.pad(y.unsqueeze(1), (padding, padding), mode="reflect").squeeze(1)
+        else:
+            # reflect each row at its own end, then right-pad the batch
+            rows = [
+                torch.nn.functional.pad(row[:length].view(1, 1, -1), (padding, padding), mode="reflect").view(-1)
+                for row, length in zip(y, lengths.tolist())
+            ]
+            y = torch.nn.utils.rnn.pad_sequence(rows, batch_first=True)
+
+        spec = torch.stft(
+            y,
+            self.n_fft,
+            hop_length=self.hop_size,
+            win_length=self.win_size,
+            window=hann_window,
+            center=self.center,
+            pad_mode="reflect",
+            normalized=False,
+            onesided=True,
+            return_complex=True,
+        )
+        spec = torch.sqrt(torch.view_as_real(spec).pow(2).sum(-1) + 1e-9)
+
+        mel_spec = torch.matmul(mel_basis, spec)
+        mel_spec = dynamic_range_compression_torch(mel_spec)
+
+        return mel_spec
+
+
+_MEL_FRONTENDS = {}
+
+
 def mel_spectrogram(
     y: torch.Tensor,
     n_fft: int,
@@ -406,10 +539,12 @@ def mel_spectrogram(
     fmin: int,
     fmax: int = None,
     center: bool = False,
+    check_range: bool = True,
 ) -> torch.Tensor:
     """
     Calculate the mel spectrogram of an input signal.
     This function uses slaney norm for the librosa mel filterbank (using librosa.filters.mel) and uses Hann window for STFT (using torch.stft).
+    The filterbank and window are cached by a shared `MelSpectrogramFrontend` per configuration.
 
     Args:
         y (torch.Tensor): Input signal.
@@ -421,47 +556,15 @@ def mel_spectrogram(
         fmin (int): Minimum frequency for mel filterbank.
         fmax (int): Maximum frequency for mel filterbank. If None, defaults to half the sampling rate (fmax = sr / 2.0) inside librosa_mel_fn
         center (bool): Whether to pad the input to center the frames. Default is False.
+        check_range (bool): Whether to warn about samples outside [-1, 1]. Default is True.
 
     Returns:
         torch.Tensor: Mel spectrogram.
     """
-    if torch.min(y) < -1.0:
-        print(f"[WARNING] Min value of input waveform signal is {torch.min(y)}")
-    if torch.max(y) > 1.0:
-        print(f"[WARNING] Max value of input waveform signal is {torch.max(y)}")
-
-    device = y.device
-
-    mel = librosa_mel_fn(
-        sr=sampling_rate, n_fft=n_fft, n_mels=num_mels, fmin=fmin, fmax=fmax
-    )
-
-    mel_basis = torch.from_numpy(mel).float().to(device)
-    hann_window = torch.hann_window(win_size).to(device)
-
-    padding = (n_fft - hop_size) // 2
-    y = torch.nn.functional.pad(
-        y.unsqueeze(1), (padding, padding), mode="reflect"
-    ).squeeze(1)
-
-    spec = torch.stft(
-        y,
-        n_fft,
-        hop_length=hop_size,
-        win_length=win_size,
-        window=hann_window,
-        center=center,
-        pad_mode="reflect",
-        normalized=False,
-        onesided=True,
-        return_complex=True,
-    )
-    spec = torch.sqrt(torch.view_as_real(spec).pow(2).sum(-1) + 1e-9)
-
-    mel_spec = torch.matmul(mel_basis, spec)
-    mel_spec = dynamic_range_compression_torch(mel_spec)
-
-    return mel_spec
+    key = (n_fft, num_mels, sampling_rate, hop_size, win_size, fmin, fmax, center, check_range)
+    if key not in _MEL_FRONTENDS:
+        _MEL_FRONTENDS[key] = MelSpectrogramFrontend(*key)
+    return _MEL_FRONTENDS[key](y)
 
 
 class Qwen3TTSPreTrainedModel(PreTrainedModel):
@@ -1153,6 +1256,39 @@ class Qwen3TTSTalkerCodePredictorModel(Qwen3TTSPreTrainedModel):
         )
 
 
+def sample_next_token(
+    logits: torch.Tensor,
+    do_sample: bool = True,
+    top_k: Optional[int] = None,
+    top_p: Optional[float] = None,
+    temperature: Optional[float] = None,
+) -> torch.LongTensor:
+    """
+    Pick the next token from `(batch_size, vocab_size)` logits.
+
+    Mirrors the temperature -> top-k -> top-p warper chain of `GenerationMixin.generate` (including its
+    `min_tokens_to_keep=1` behaviour), so a fixed seed samples the same tokens as the generic path.
+    """
+    if not do_sample:
+        return torch.argmax(logits, dim=-1)
+    scores = logits.float()
+    if temperature is not None and temperature != 1.0:
+        scores = scores / temperature
+    if top_k is not None and top_k != 0:
+        top_k = min(top_k, scores.shape[-1])
+        kth_score = torch.topk(scores, top_k)[0][..., -1, None]
+        scores = scores.masked_fill(scores < kth_score, -float("inf"))
+    if top_p is not None and top_p < 1.0:
+        sorted_logits, sorted_indices = torch.sort(scores, descending=False)
+        cumulative_probs = sorted_logits.softmax(dim=-1).cumsum(dim=-1)
+        sorted_indices_to_remove = cumulative_probs <= (1 - top_p)
+        sorted_indices_to_remove[..., -1:] = 0
+        indices_to_remove = sorted_indices_to_remove.scatter(1, sorted_indices, sorted_indices_to_remove)
+        scores = scores.masked_fill(indices_to_remove, -float("inf"))
+    probs = nn.functional.softmax(scores, dim=-1)
+    return torch.multinomial(probs, num_samples=1).squeeze(1)
+
+
 class Qwen3TTSTalkerCodePredictorModelForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin):
     _tied_weights_keys = ["lm_head.weight"]
     _tp_plan = {"lm_head": "colwise_rep"}
@@ -1194,6 +1330,88 @@ class Qwen3TTSTalkerCodePredictorModelForConditionalGeneration(Qwen3TTSPreTraine
     def get_decoder(self):
         return self.model
     
+    @torch.no_grad()
+    def generate_codes(
+        self,
+        inputs_embeds: torch.Tensor,
+        do_sample: bool = True,
+        top_k: Optional[int] = None,
+        top_p: Optional[float] = None,
+        temperature: Optional[float] = None,
+    ) -> torch.LongTensor:
+        """
+        Sample the residual codec groups of one talker frame with a fused decode loop.
+
+        Equivalent to `generate(inputs_embeds=..., max_new_tokens=num_code_groups - 1, ...).sequences`, but runs the
+        decoder layers directly on a preallocated KV buffer and indexes `lm_head[i]` / `codec_embedding[i]` per step
+        instead of going through `GenerationMixin`, its logits processors and a fresh `DynamicCache`.
+
+        Args:
+            inputs_embeds (`torch.Tensor` of shape `(batch_size, 2, talker_hidden_size)`):
+                The talker's last hidden state followed by the embedding of the sampled first codec group.
+            do_sample, top_k, top_p, temperature:
+                Sampling parameters, see `sample_next_token`.
+
+        Returns:
+            `torch.LongTensor` of shape `(batch_size, num_code_groups - 1)`.
+        """
+        num_steps = self.config.num_code_groups - 1
+        batch_size = inputs_embeds.shape[0]
+        max_len = inputs_embeds.shape[1] + num_steps - 1
+        layers = self.model.layers[: self.config.num_hidden_layers]
+        attn = layers[0].self_attn
+        num_kv_heads = self.config.num_key_value_heads
+
+        # allocated per call rather than kept on the module: streaming runs `generate` in a background thread, so
+        # calls on the same model can overlap
+        cache_shape = (len(layers), 2, batch_size, num_kv_heads, max_len, attn.head_dim)
+        kv_cache = torch.empty(cache_shape, dtype=inputs_embeds.dtype, device=inputs_embeds.device)
+
+        hidden_states = self.small_to_mtp_projection(inputs_embeds)
+        position_ids = torch.arange(max_len, device=inputs_embeds.device).unsqueeze(0)
+        cos_all, sin_all = self.model.rotary_emb(hidden_states, position_ids)
+
+        sequences = torch.empty((batch_size, num_steps), dtype=torch.long, device=inputs_embeds.device)
+        past_len = 0
+        for step in range(num_steps):
+            seq_len = hidden_states.shape[1]
+            end = past_len + seq_len
+            cos = cos_all[:, past_len:end]
+            sin = sin_all[:, past_len:end]
+            for layer_idx, layer in enumerate(layers):
+                self_attn = layer.self_attn
+                residual = hidden_states
+                hidden_states = layer.input_layernorm(hidden_states)
+                hidden_shape = (batch_size, seq_len, -1, self_attn.head_dim)
+                query = self_attn.q_norm(self_attn.q_proj(hidden_states).view(hidden_shape)).transpose(1, 2)
+                key = self_attn.k_norm(self_attn.k_proj(hidden_states).view(hidden_shape)).transpose(1, 2)
+                value = self_attn.v_proj(hidden_states).view(hidden_shape).transpose(1, 2)
+                query, key = apply_rotary_pos_emb(query, key, cos, sin)
+                kv_cache[layer_idx, 0, :, :, past_len:end] = key
+                kv_cache[layer_idx, 1, :, :, past_len:end] = value
+                start = 0 if self_attn.sliding_window is None else max(0, end - self_attn.sliding_window)
+                key = repeat_kv(kv_cache[layer_idx, 0, :, :, start:end], self_attn.num_key_value_groups)
+                value = repeat_kv(kv_cache[layer_idx, 1, :, :, start:end], self_attn.num_key_value_groups)
+                attn_output = F.scaled_dot_product_attention(
+                    query, key, value, is_causal=seq_len > 1, scale=self_attn.scaling
+                )
+                attn_output = attn_output.transpose(1, 2).reshape(batch_size, seq_len, -1)
+                hidden_states = residual + self_attn.o_proj(attn_output)
+                residual = hidden_states
+                hidden_states = residual + layer.mlp(layer.post_attention_layernorm(hidden_states))
+            last_hidden = self.model.norm(hidden_states[:, -1])
+            logits = self.lm_head[step](last_hidden)
+            next_tokens = sample_next_token(
+                logits, do_sample=do_sample, top_k=top_k, top_p=top_p, temperature=temperature
+            )
+            sequences[:, step] = next_tokens
+            past_len = end
+            if step + 1 < num_steps:
+                hidden_states = self.small_to_mtp_projection(
+                    self.model.codec_embedding[step](next_tokens.unsqueeze(1))
+                )
+        return sequences
+
     def forward_finetune(
         self,
         input_ids=None,
@@ -1345,6 +1563,29 @@ class Qwen3TTSTalkerOutputWithPast(ModelOutput):
     tts_pad_embed: Optional[torch.FloatTensor] = None
 
 
+class Qwen3TTSTalkerOutputBuffer:
+    """
+    Preallocated per-frame outputs of [`Qwen3TTSTalkerForConditionalGeneration`] for lean generation.
+
+    Passed to the talker as `talker_output_buffer`, it receives the codec ids of every frame and the last-layer hidden
+    state that predicted it, so `generate` does not need `output_hidden_states` / `return_dict_in_generate` and no
+    per-layer hidden states are kept alive across steps.
+    """
+
+    def __init__(self, batch_size, max_frames, num_code_groups, hidden_size, device=None, dtype=None):
+        self.codes = torch.zeros((batch_size, max_frames, num_code_groups), dtype=torch.long, device=device)
+        self.hidden_states = torch.empty((batch_size, max_frames, hidden_size), dtype=dtype, device=device)
+        self.num_frames = 0
+
+    def write(self, generation_step, codec_ids, last_hidden_state):
+        # `generation_step` is -1 on prefill, whose last hidden state predicts frame 0
+        if generation_step + 1 < self.hidden_states.shape[1]:
+            self.hidden_states[:, generation_step + 1] = last_hidden_state
+        if codec_ids is not None:
+            self.codes[:, generation_step] = codec_ids
+            self.num_frames = generation_step + 1
+
+
 class Qwen3TTSTalkerDecoderLayer(GradientCheckpointingLayer):
     def __init__(self, config, layer_idx):
         super().__init__()
@@ -1632,6 +1873,43 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         sub_talker_loss = sub_talker_outputs.loss
         return sub_talker_logits, sub_talker_loss
 
+    def predict_codec_frame(
+        self,
+        input_ids,
+        past_hidden,
+        subtalker_dosample=True,
+        subtalker_top_k=None,
+        subtalker_top_p=None,
+        subtalker_temperature=None,
+    ):
+        """
+        Complete sampled first-group tokens into full codec frames and embed them as the next talker input.
+
+        Args:
+            input_ids (`torch.LongTensor` of shape `(batch_size, 1)`): first-group codec tokens.
+            past_hidden (`torch.FloatTensor` of shape `(batch_size, 1, hidden_size)`): talker hidden state that
+                predicted them.
+
+        Returns:
+            codec_ids (`torch.LongTensor` of shape `(batch_size, num_code_groups)`) and the summed embedding of all
+            groups, of shape `(batch_size, 1, hidden_size)` (without the text embedding).
+        """
+        last_id_hidden = self.get_input_embeddings()(input_ids)
+        predictor_sequences = self.code_predictor.generate_codes(
+            inputs_embeds=torch.cat((past_hidden, last_id_hidden), dim=1),
+            do_sample=subtalker_dosample,
+            top_p=subtalker_top_p,
+            top_k=subtalker_top_k,
+            temperature=subtalker_temperature,
+        )
+        codec_ids = torch.cat((input_ids, predictor_sequences), dim=-1)
+        codec_hiddens = torch.cat(
+            [last_id_hidden]
+            + [self.code_predictor.get_input_embeddings()[i](predictor_sequences[..., i:i+1]) for i in range(self.config.num_code_groups - 1)],
+            dim=1,
+        )
+        return codec_ids, codec_hiddens.sum(1, keepdim=True)
+
     @can_return_tuple
     def forward(
         self,
@@ -1653,6 +1931,8 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         subtalker_top_p=None,
         subtalker_top_k=None,
         subtalker_temperature=None,
+        codec_streamer=None,
+        talker_output_buffer=None,
         **kwargs,
     ) -> CausalLMOutputWithPast:
         r"""
@@ -1660,6 +1940,12 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
             Labels for computing the masked language modeling loss. Indices should either be in `[0, ...,
             config.vocab_size]` or -100 (see `input_ids` docstring). Tokens with indices set to `-100` are ignored
             (masked), the loss is only computed for the tokens with labels in `[0, ..., config.vocab_size]`.
+        codec_streamer (*optional*):
+            Object with a `put(codec_ids)` method. It receives the complete `(batch_size, num_code_groups)` codec
+            frame as soon as the code predictor has filled in the residual groups of the last sampled token.
+        talker_output_buffer ([`Qwen3TTSTalkerOutputBuffer`], *optional*):
+            Receives the codec ids and the last hidden state of every step, for generation without
+            `output_hidden_states`.
         ```"""
         # Prefill
         if inputs_embeds is not None and inputs_embeds.shape[1] > 1:
@@ -1667,24 +1953,16 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
             codec_ids = None
         # Generate
         else:
-            last_id_hidden = self.get_input_embeddings()(input_ids)
-            predictor_result = self.code_predictor.generate(
-                inputs_embeds=torch.cat((past_hidden, last_id_hidden), dim=1),
-                max_new_tokens=self.config.num_code_groups - 1,
-                do_sample=subtalker_dosample,
-                top_p=subtalker_top_p,
-                top_k=subtalker_top_k,
-                temperature=subtalker_temperature,
-                output_hidden_states=True,
-                return_dict_in_generate=True,
+            codec_ids, inputs_embeds = self.predict_codec_frame(
+                input_ids,
+                past_hidden,
+                subtalker_dosample=subtalker_dosample,
+                subtalker_top_k=subtalker_top_k,
+                subtalker_top_p=subtalker_top_p,
+                subtalker_temperature=subtalker_temperature,
             )
-            codec_ids = torch.cat((input_ids, predictor_result.sequences), dim=-1)
-            codec_hiddens = torch.cat(
-                [last_id_hidden]
-                + [self.code_predictor.get_input_embeddings()[i](predictor_result.sequences[..., i:i+1]) for i in range(self.config.num_code_groups - 1)],
-                dim=1,
-            )
-            inputs_embeds = codec_hiddens.sum(1, keepdim=True)
+            if codec_streamer is not None:
+                codec_streamer.put(codec_ids)
 
             if generation_step < trailing_text_hidden.shape[1]:
                 inputs_embeds = inputs_embeds + trailing_text_hidden[:, generation_step].unsqueeze(1)
@@ -1725,6 +2003,8 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
 
         hidden_states = outputs.last_hidden_state
         logits = self.codec_head(hidden_states)
+        if talker_output_buffer is not None:
+            talker_output_buffer.write(generation_step, codec_ids, hidden_states[:, -1])
 
         loss = None
         if labels is not None:
@@ -1834,6 +2114,15 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
                 self.supported_languages.append(language_id)
         
         self.speaker_encoder_sample_rate = self.config.speaker_encoder_config.sample_rate
+        self.speaker_mel_frontend = MelSpectrogramFrontend(
+            n_fft=1024,
+            num_mels=128,
+            sampling_rate=24000,
+            hop_size=256,
+            win_size=1024,
+            fmin=0,
+            fmax=12000,
+        )
         self.tokenizer_type = self.config.tokenizer_type
         self.tts_model_size = self.config.tts_model_size
         self.tts_model_type = self.config.tts_model_type
@@ -1939,19 +2228,46 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
     
     @torch.inference_mode()
     def extract_speaker_embedding(self, audio, sr):
+        return self.extract_speaker_embeddings([audio], sr)[0]
+
+    @torch.inference_mode()
+    def extract_speaker_embeddings(self, audios, sr, batch_size: int = 32):
+        """
+        Batched `extract_speaker_embedding`.
+
+        Clips are sorted by length and run through `speaker_mel_frontend` and the speaker encoder `batch_size` at a
+        time as right-padded batches; squeeze-excitation and attentive statistics pooling only look at each clip's
+        real frames. Set `speaker_mel_frontend.check_range = False` to skip the waveform range warnings.
+
+        Args:
+            audios (`list[np.ndarray]`):
+                Mono waveforms sampled at `sr`.
+            sr (`int`):
+                Sampling rate, must be 24000.
+            batch_size (`int`):
+                Maximum number of clips per speaker encoder call.
+
+        Returns:
+            `list[torch.Tensor]`: one `(enc_dim,)` embedding per clip, in input order.
+        """
         assert sr == 24000, "Only support 24kHz audio"
-        mels = mel_spectrogram(
-            torch.from_numpy(audio).unsqueeze(0), 
-            n_fft=1024, 
-            num_mels=128, 
-            sampling_rate=24000,
-            hop_size=256, 
-            win_size=1024, 
-            fmin=0, 
-            fmax=12000
-        ).transpose(1, 2)
-        speaker_embedding = self.speaker_encoder(mels.to(self.device).to(self.dtype))[0]
-        return speaker_embedding
+        order = sorted(range(len(audios)), key=lambda i: len(audios[i]))
+        speaker_embeddings = [None] * len(audios)
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            wav_lengths = torch.tensor([len(audios[i]) for i in indices], device=self.device)
+            wavs = torch.nn.utils.rnn.pad_sequence(
+                [torch.from_numpy(audios[i]) for i in indices], batch_first=True
+            ).to(self.device)
+            mels = self.speaker_mel_frontend(wavs, wav_lengths).transpose(1, 2)
+            lengths = self.speaker_mel_frontend.num_frames(wav_lengths).float()
+            embeddings = self.speaker_encoder(
+                mels.to(self.dtype),
+                lengths=None if lengths.min() == lengths.max() else lengths / lengths.max(),
+            )
+            for i, embedding in zip(indices, embeddings):
+                speaker_embeddings[i] = embedding
+        return speaker_embeddings
     
     @torch.inference_mode()
     def generate_speaker_prompt(
@@ -2019,53 +2335,31 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
                 return text_embed + codec_embed, tts_pad_embed
 
     @torch.no_grad()
-    def generate(
+    def build_talker_prompts(
         self,
-        input_ids: Optional[list[torch.Tensor]] = None,
+        input_ids: list[torch.Tensor],
         instruct_ids: Optional[list[torch.Tensor]] = None,
         ref_ids: Optional[list[torch.Tensor]] = None,
-        voice_clone_prompt: list[dict] = None,
-        languages: list[str] = None,
-        speakers: list[str] = None,
-        non_streaming_mode = False,
-        max_new_tokens: int = 4096,
-        do_sample: bool = True,
-        top_k: int = 50,
-        top_p: float = 1.0,
-        temperature: float = 0.9,
-        subtalker_dosample: bool = True,
-        subtalker_top_k: int = 50,
-        subtalker_top_p: float = 1.0,
-        subtalker_temperature: float = 0.9,
-        eos_token_id: Optional[int] = None,
-        repetition_penalty: float = 1.05,
-        **kwargs,
+        voice_clone_prompt: Optional[dict] = None,
+        languages: Optional[list[str]] = None,
+        speakers: Optional[list[str]] = None,
+        non_streaming_mode: bool = False,
+        return_prefix_lengths: bool = False,
     ):
-        talker_kwargs = {
-            "max_new_tokens": max_new_tokens,
-            "min_new_tokens": 2,
-            "do_sample": do_sample,
-            "top_k": top_k,
-            "top_p": top_p,
-            "temperature": temperature,
-            "subtalker_dosample": subtalker_dosample, 
-            "subtalker_top_k": subtalker_top_k,
-            "subtalker_top_p": subtalker_top_p,
-            "subtalker_temperature": subtalker_temperature,
-            "eos_token_id": eos_token_id
-            if eos_token_id is not None
-            else self.config.talker_config.codec_eos_token_id,
-            "repetition_penalty": repetition_penalty,
-            "suppress_tokens": [
-                i
-                for i in range(self.config.talker_config.vocab_size - 1024, self.config.talker_config.vocab_size)
-                if i not in (self.config.talker_config.codec_eos_token_id,)
-            ],
-            "output_hidden_states": getattr(kwargs, "output_hidden_states", True),
-            "return_dict_in_generate": getattr(kwargs, "return_dict_in_generate", True)
-        }
-        
+        """
+        Build the talker prefill embeddings of every sample, before any batching or padding.
+
+        Returns:
+            talker_input_embeds (`list[torch.FloatTensor]`): one `(1, prompt_length, hidden_size)` tensor per sample.
+            trailing_text_hiddens (`list[torch.FloatTensor]`): one `(1, text_length, hidden_size)` tensor per sample,
+                the text embeddings added to the codec input of the following decode steps.
+            tts_pad_embed (`torch.FloatTensor` of shape `(1, 1, hidden_size)`): added once the trailing text is used up.
+            prefix_lengths (`list[int]`, only if `return_prefix_lengths=True`): per sample, the number of leading
+                prompt positions that do not depend on the text to synthesize (instruct, role, codec tags, speaker and,
+                in ICL mode, the reference text positions). Prompts sharing a voice share this prefix.
+        """
         talker_input_embeds = [[] for _ in range(len(input_ids))]
+        prefix_lengths = []
 
         voice_clone_spk_embeds = None
         # voice clone speaker prompt generate
@@ -2184,8 +2478,11 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
                                             ), dim=1) + codec_input_emebdding[:, :-1]
 
             talker_input_embed = torch.cat((_talker_input_embed_role, _talker_input_embed), dim=1)
+            prefix_length = talker_input_embed.shape[1] + sum(item.shape[1] for item in talker_input_embeds[index])
 
             if voice_clone_prompt is not None and voice_clone_prompt["ref_code"] is not None and voice_clone_prompt["icl_mode"][index]:
+                # the reference text leads the ICL text stream, the target text follows it
+                prefix_length += min(ref_ids[index][:, 3:-2].shape[1], voice_clone_prompt["ref_code"][index].shape[0] + 1)
                 icl_input_embed, trailing_text_hidden = self.generate_icl_prompt(
                     text_id=input_id[:, 3:-5],
                     ref_id=ref_ids[index][:, 3:-2],
@@ -2232,10 +2529,119 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
                                                     ), tts_eos_embed), dim=1)
             talker_input_embeds[index].append(talker_input_embed)
             trailing_text_hiddens.append(trailing_text_hidden)
+            prefix_lengths.append(prefix_length)
         
         for index, talker_input_embed in enumerate(talker_input_embeds):
             talker_input_embeds[index] = torch.cat([item for item in talker_input_embed if item is not None], dim=1)
 
+        if return_prefix_lengths:
+            return talker_input_embeds, trailing_text_hiddens, tts_pad_embed, prefix_lengths
+        return talker_input_embeds, trailing_text_hiddens, tts_pad_embed
+
+    @torch.no_grad()
+    def generate(
+        self,
+        input_ids: Optional[list[torch.Tensor]] = None,
+        instruct_ids: Optional[list[torch.Tensor]] = None,
+        ref_ids: Optional[list[torch.Tensor]] = None,
+        voice_clone_prompt: list[dict] = None,
+        languages: list[str] = None,
+        speakers: list[str] = None,
+        non_streaming_mode = False,
+        max_new_tokens: int = 4096,
+        do_sample: bool = True,
+        top_k: int = 50,
+        top_p: float = 1.0,
+        temperature: float = 0.9,
+        subtalker_dosample: bool = True,
+        subtalker_top_k: int = 50,
+        subtalker_top_p: float = 1.0,
+        subtalker_temperature: float = 0.9,
+        eos_token_id: Optional[int] = None,
+        repetition_penalty: float = 1.05,
+        codec_streamer=None,
+        prefix_cache=None,
+        **kwargs,
+    ):
+        talker_kwargs = {
+            "max_new_tokens": max_new_tokens,
+            "min_new_tokens": 2,
+            "do_sample": do_sample,
+            "top_k": top_k,
+            "top_p": top_p,
+            "temperature": temperature,
+            "subtalker_dosample": subtalker_dosample, 
+            "subtalker_top_k": subtalker_top_k,
+            "subtalker_top_p": subtalker_top_p,
+            "subtalker_temperature": subtalker_temperature,
+            "eos_token_id": eos_token_id
+            if eos_token_id is not None
+            else self.config.talker_config.codec_eos_token_id,
+            "repetition_penalty": repetition_penalty,
+            "suppress_tokens": [
+                i
+                for i in range(self.config.talker_config.vocab_size - 1024, self.config.talker_config.vocab_size)
+                if i not in (self.config.talker_config.codec_eos_token_id,)
+            ],
+        }
+        # Lean mode: per-step codec ids and last hidden states go to a preallocated buffer instead of
+        # keeping every layer's hidden states of every step in `talker_result.hidden_states`.
+        output_hidden_states = kwargs.get("output_hidden_states", False)
+        if output_hidden_states:
+            talker_kwargs["output_hidden_states"] = True
+            talker_kwargs["return_dict_in_generate"] = True
+        else:
+            talker_kwargs["output_hidden_states"] = False
+            talker_kwargs["return_dict_in_generate"] = False
+        if codec_streamer is not None:
+            talker_kwargs["codec_streamer"] = codec_streamer
+        
+        talker_input_embeds, trailing_text_hiddens, tts_pad_embed, prefix_lengths = self.build_talker_prompts(
+            input_ids=input_ids,
+            instruct_ids=instruct_ids,
+            ref_ids=ref_ids,
+            voice_clone_prompt=voice_clone_prompt,
+            languages=languages,
+            speakers=speakers,
+            non_streaming_mode=non_streaming_mode,
+            return_prefix_lengths=True,
+        )
+
+        if not output_hidden_states and codec_streamer is None:
+            # Rows that emit `codec_eos_token_id` are dropped from the KV cache, the trailing text and the sampling
+            # state right away, so the remaining steps run at the size of the unfinished batch. With a
+            # `Qwen3TTSTalkerPrefixCache`, the text-independent prompt prefix of each voice is prefilled only once.
+            from .scheduling_qwen3_tts import Qwen3TTSTalkerScheduler
+
+            scheduler = Qwen3TTSTalkerScheduler(
+                self,
+                max_batch_size=len(talker_input_embeds),
+                max_new_tokens=max_new_tokens,
+                do_sample=do_sample,
+                top_k=top_k,
+                top_p=top_p,
+                temperature=temperature,
+                subtalker_dosample=subtalker_dosample,
+                subtalker_top_k=subtalker_top_k,
+                subtalker_top_p=subtalker_top_p,
+                subtalker_temperature=subtalker_temperature,
+                eos_token_id=talker_kwargs["eos_token_id"],
+                repetition_penalty=repetition_penalty,
+                min_new_tokens=talker_kwargs["min_new_tokens"],
+                prefix_cache=prefix_cache,
+            )
+            for talker_input_embed, trailing_text_hidden, prefix_length in zip(
+                talker_input_embeds, trailing_text_hiddens, prefix_lengths
+            ):
+                scheduler.add_request(talker_input_embed, trailing_text_hidden, tts_pad_embed, prefix_length=prefix_length)
+            results = {}
+            while scheduler.has_unfinished_requests():
+                for request_id, codes, hidden_states in scheduler.step():
+                    results[request_id] = (codes, hidden_states)
+            talker_codes_list = [results[i][0] for i in range(len(talker_input_embeds))]
+            talker_hidden_states_list = [results[i][1] for i in range(len(talker_input_embeds))]
+            return talker_codes_list, talker_hidden_states_list
+
         # for batch inferquence
         original_lengths = torch.tensor([t.shape[1] for t in talker_input_embeds])
         # left padding for talker input embeds
@@ -2268,6 +2674,16 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         padded_hiddens[padding_mask] = pad_embedding_vector
         trailing_text_hiddens = padded_hiddens
 
+        if not output_hidden_states:
+            talker_kwargs["talker_output_buffer"] = Qwen3TTSTalkerOutputBuffer(
+                batch_size=talker_input_embeds.shape[0],
+                max_frames=max_new_tokens,
+                num_code_groups=self.config.talker_config.num_code_groups,
+                hidden_size=self.config.talker_config.hidden_size,
+                device=talker_input_embeds.device,
+                dtype=talker_input_embeds.dtype,
+            )
+
         # forward
         talker_result = self.talker.generate(
             inputs_embeds=talker_input_embeds,
@@ -2276,10 +2692,17 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
             tts_pad_embed=tts_pad_embed,
             **talker_kwargs,
         )
+        if codec_streamer is not None:
+            codec_streamer.end()
+
+        if output_hidden_states:
+            talker_codes = torch.stack([hid[-1] for hid in talker_result.hidden_states if hid[-1] is not None], dim=1)
+            talker_hidden_states = torch.cat([hid[0][-1][:, -1:] for hid in talker_result.hidden_states], dim=1)[:, :-1]
+        else:
+            talker_output_buffer = talker_kwargs["talker_output_buffer"]
+            talker_codes = talker_output_buffer.codes[:, :talker_output_buffer.num_frames]
+            talker_hidden_states = talker_output_buffer.hidden_states[:, :talker_output_buffer.num_frames]
 
-        talker_codes = torch.stack([hid[-1] for hid in talker_result.hidden_states if hid[-1] is not None], dim=1)
-        talker_hidden_states = torch.cat([hid[0][-1][:, -1:] for hid in talker_result.hidden_states], dim=1)[:, :-1]
-        
         first_codebook = talker_codes[:, :, 0]
         is_stop_token = (first_codebook ==  self.config.talker_config.codec_eos_token_id)
         stop_indices = torch.argmax(is_stop_token.int(), dim=1)
@@ -0,0 +1,490 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Continuous batching for the Qwen3TTS talker."""
+
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+import torch
+from transformers.cache_utils import DynamicCache
+
+from .modeling_qwen3_tts import Qwen3TTSForConditionalGeneration, sample_next_token
+
+
+def _left_pad(tensor: torch.Tensor, length: int, dim: int, value=0) -> torch.Tensor:
+    pad = length - tensor.shape[dim]
+    if pad <= 0:
+        return tensor
+    shape = list(tensor.shape)
+    shape[dim] = pad
+    return torch.cat([tensor.new_full(shape, value), tensor], dim=dim)
+
+
+def _right_pad(tensor: torch.Tensor, length: int, dim: int, fill: torch.Tensor) -> torch.Tensor:
+    pad = length - tensor.shape[dim]
+    if pad <= 0:
+        return tensor
+    shape = list(tensor.shape)
+    shape[dim] = pad
+    return torch.cat([tensor, fill.expand(shape).to(tensor.dtype)], dim=dim)
+
+
+class Qwen3TTSTalkerPrefixCache:
+    """
+    LRU cache of talker KV states after the text-independent part of a prompt.
+
+    The prefix covers instruct, role, codec tags, speaker / x-vector and, in ICL mode, the reference text positions
+    (see `prefix_lengths` of `Qwen3TTSForConditionalGeneration.build_talker_prompts`). Entries are keyed by the
+    content of the prefix embeddings, so requests with the same voice prompt, language, speaker and instruct share an
+    entry whatever their text is. A hit prefills only the text-dependent suffix on top of a copy of the cached state.
+
+    One cache can be shared by several schedulers and `generate` calls.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        if max_entries < 1:
+            raise ValueError(f"`max_entries` must be >= 1, got {max_entries}")
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(prefix_embeds: torch.Tensor) -> str:
+        data = prefix_embeds.detach().to(torch.float32).cpu().contiguous().numpy().tobytes()
+        return hashlib.sha1(data).hexdigest()
+
+    def get(self, key: str) -> Optional[list[tuple[torch.Tensor, torch.Tensor]]]:
+        """Per-layer `(keys, values)` of shape `(1, num_key_value_heads, prefix_length, head_dim)`, or None."""
+        with self._lock:
+            layers = self._entries.get(key)
+            if layers is not None:
+                self._entries.move_to_end(key)
+            return layers
+
+    def put(self, key: str, layers: list[tuple[torch.Tensor, torch.Tensor]]) -> None:
+        with self._lock:
+            self._entries[key] = layers
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class TalkerRequest:
+    """State of one utterance handled by [`Qwen3TTSTalkerScheduler`]."""
+
+    request_id: int
+    input_embeds: torch.Tensor  # (prompt_length, hidden_size)
+    trailing_text_hidden: torch.Tensor  # (text_length, hidden_size)
+    max_new_tokens: int
+    prefix_length: int = 0  # leading prompt positions that may be served from the prefix cache
+    frames: list = field(default_factory=list)  # (num_code_groups,) codec frames generated so far
+    hidden_states: list = field(default_factory=list)  # (hidden_size,) last talker hidden state behind each frame
+    num_tokens: int = 0  # first-group tokens sampled so far, including the pending one
+
+
+class Qwen3TTSTalkerScheduler:
+    """
+    Continuous-batching decode loop for [`Qwen3TTSTalkerForConditionalGeneration`].
+
+    Unlike `Qwen3TTSForConditionalGeneration.generate`, whose batch is fixed for the whole run, the scheduler keeps one
+    KV cache row per running request. Between decode steps it prefills newly added prompts and merges them into the
+    running batch, and it drops a request's row (and its share of the cache) as soon as it emits
+    `codec_eos_token_id` or reaches its token budget.
+
+    Rows are kept left-padded against each other. Every row carries its own rope position, so admitting or retiring
+    requests never shifts the positions of the others.
+
+    With a [`Qwen3TTSTalkerPrefixCache`], requests added with a `prefix_length` reuse the KV state of their voice
+    prefix and only prefill the rest of their prompt.
+
+    `add_request` is thread-safe; `step` must be driven from a single thread.
+    """
+
+    def __init__(
+        self,
+        model: Qwen3TTSForConditionalGeneration,
+        max_batch_size: int = 16,
+        max_new_tokens: int = 4096,
+        do_sample: bool = True,
+        top_k: int = 50,
+        top_p: float = 1.0,
+        temperature: float = 0.9,
+        subtalker_dosample: bool = True,
+        subtalker_top_k: int = 50,
+        subtalker_top_p: float = 1.0,
+        subtalker_temperature: float = 0.9,
+        eos_token_id: Optional[int] = None,
+        repetition_penalty: float = 1.05,
+        min_new_tokens: int = 2,
+        prefix_cache: Optional[Qwen3TTSTalkerPrefixCache] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"`max_batch_size` must be >= 1, got {max_batch_size}")
+        self.model = model
+        self.talker = model.talker
+        self.max_batch_size = max_batch_size
+        self.max_new_tokens = max_new_tokens
+        self.do_sample = do_sample
+        self.top_k = top_k
+        self.top_p = top_p
+        self.temperature = temperature
+        self.subtalker_dosample = subtalker_dosample
+        self.subtalker_top_k = subtalker_top_k
+        self.subtalker_top_p = subtalker_top_p
+        self.subtalker_temperature = subtalker_temperature
+        self.repetition_penalty = repetition_penalty
+        self.min_new_tokens = min_new_tokens
+        self.prefix_cache = prefix_cache
+
+        talker_config = model.config.talker_config
+        self.eos_token_id = eos_token_id if eos_token_id is not None else talker_config.codec_eos_token_id
+        suppress_mask = torch.zeros(talker_config.vocab_size, dtype=torch.bool)
+        suppress_mask[talker_config.vocab_size - 1024:] = True
+        suppress_mask[talker_config.codec_eos_token_id] = False
+        self.suppress_mask = suppress_mask.to(self.talker.device)
+
+        self._lock = threading.Lock()
+        self._next_request_id = 0
+        self.waiting: deque = deque()
+        self.running: list[TalkerRequest] = []
+
+        # batch state, one row per running request
+        self.cache: Optional[DynamicCache] = None
+        self.attention_mask: Optional[torch.Tensor] = None  # (batch, cache_length)
+        self.rope_positions: Optional[torch.Tensor] = None  # (batch,) position of the next talker input
+        self.generation_steps: Optional[torch.Tensor] = None  # (batch,) index into the trailing text
+        self.trailing_text: Optional[torch.Tensor] = None  # (batch, max_text_length + 1, hidden_size)
+        self.last_tokens: Optional[torch.Tensor] = None  # (batch,) pending first-group tokens
+        self.past_hidden: Optional[torch.Tensor] = None  # (batch, 1, hidden_size)
+        self.seen_tokens: Optional[torch.Tensor] = None  # (batch, vocab_size) for the repetition penalty
+        self.tts_pad_embed: Optional[torch.Tensor] = None
+
+    def add_request(
+        self,
+        talker_input_embed: torch.Tensor,
+        trailing_text_hidden: torch.Tensor,
+        tts_pad_embed: torch.Tensor,
+        max_new_tokens: Optional[int] = None,
+        prefix_length: int = 0,
+    ) -> int:
+        """
+        Queue one prompt built by `Qwen3TTSForConditionalGeneration.build_talker_prompts`. It is prefilled and joins
+        the running batch at the beginning of the next `step`. `prefix_length` is the matching entry of its
+        `prefix_lengths`; it is only used when the scheduler has a `prefix_cache`.
+
+        Returns:
+            `int`: request id, reported back by `step` when the request finishes.
+        """
+        with self._lock:
+            request_id = self._next_request_id
+            self._next_request_id += 1
+            if self.tts_pad_embed is None:
+                self.tts_pad_embed = tts_pad_embed.reshape(1, 1, -1)
+            self.waiting.append(
+                TalkerRequest(
+                    request_id=request_id,
+                    input_embeds=talker_input_embed.reshape(-1, talker_input_embed.shape[-1]),
+                    trailing_text_hidden=trailing_text_hidden.reshape(-1, trailing_text_hidden.shape[-1]),
+                    max_new_tokens=max_new_tokens if max_new_tokens is not None else self.max_new_tokens,
+                    prefix_length=prefix_length,
+                )
+            )
+        return request_id
+
+    def has_unfinished_requests(self) -> bool:
+        return bool(self.running) or bool(self.waiting)
+
+    def num_running(self) -> int:
+        return len(self.running)
+
+    @torch.no_grad()
+    def step(self) -> list[tuple[int, torch.Tensor, torch.Tensor]]:
+        """
+        Admit waiting requests, run one talker decode step for the whole running batch and retire finished requests.
+
+        Returns:
+            `list[tuple[int, torch.LongTensor, torch.FloatTensor]]`: `(request_id, codes, hidden_states)` for every
+            request that finished during this step, `codes` being the `(num_frames, num_code_groups)` codec frames
+            without the EOS frame and `hidden_states` the `(num_frames, hidden_size)` talker hidden states that
+            predicted them.
+        """
+        finished = []
+        admitted = self._admit()
+        if admitted:
+            finished += self._retire()
+        if self.running:
+            self._decode()
+            finished += self._retire()
+        return finished
+
+    def _admit(self) -> bool:
+        with self._lock:
+            capacity = self.max_batch_size - len(self.running)
+            new_requests = [self.waiting.popleft() for _ in range(min(capacity, len(self.waiting)))]
+        if not new_requests:
+            return False
+
+        groups = {}  # prefix key -> requests, None for requests prefilled from scratch
+        for request in new_requests:
+            key = None
+            if self.prefix_cache is not None and 0 < request.prefix_length < request.input_embeds.shape[0]:
+                key = self.prefix_cache.key(request.input_embeds[:request.prefix_length])
+            groups.setdefault(key, []).append(request)
+        for key, requests in groups.items():
+            prefix = None
+            if key is not None:
+                prefix = self.prefix_cache.get(key)
+                if prefix is None:
+                    prefix = self._prefill_prefix(requests[0].input_embeds[:requests[0].prefix_length])
+                    self.prefix_cache.put(key, prefix)
+            self._merge(self._prefill(requests, prefix))
+            self.running += requests
+        return True
+
+    def _prefill_prefix(self, prefix_embeds: torch.Tensor) -> list[tuple[torch.Tensor, torch.Tensor]]:
+        cache = DynamicCache()
+        length = prefix_embeds.shape[0]
+        self.talker.model(
+            inputs_embeds=prefix_embeds.unsqueeze(0).to(self.talker.device),
+            attention_mask=torch.ones((1, length), dtype=torch.long, device=self.talker.device),
+            position_ids=torch.arange(length, device=self.talker.device).view(1, 1, -1).expand(3, -1, -1),
+            past_key_values=cache,
+            use_cache=True,
+        )
+        return [cache[i] for i in range(self.talker.config.num_hidden_layers)]
+
+    def _prefill(self, requests: list[TalkerRequest], prefix: Optional[list] = None) -> dict:
+        """
+        Prefill `requests` as one left-padded batch and sample their first token. With `prefix`, the requests share
+        its cached KV state and only their prompt positions after it are run.
+        """
+        device = self.talker.device
+        prefix_length = requests[0].prefix_length if prefix is not None else 0
+        lengths = [r.input_embeds.shape[0] - prefix_length for r in requests]
+        max_len = max(lengths)
+        input_embeds = torch.stack(
+            [_left_pad(r.input_embeds[prefix_length:], max_len, dim=0) for r in requests]
+        ).to(device)
+        attention_mask = torch.stack(
+            [_left_pad(torch.ones(length, dtype=torch.long), max_len, dim=0) for length in lengths]
+        ).to(device)
+
+        cache = DynamicCache()
+        cache_position = None
+        if prefix is None:
+            position_ids, _ = self.talker.get_rope_index(attention_mask)
+        else:
+            # [prefix | padding | suffix]: the padding sits between the shared prefix and each row's suffix
+            for layer_idx, (keys, values) in enumerate(prefix):
+                cache.update(
+                    keys.expand(len(requests), -1, -1, -1), values.expand(len(requests), -1, -1, -1), layer_idx
+                )
+            attention_mask = torch.cat(
+                [attention_mask.new_ones((len(requests), prefix_length)), attention_mask], dim=1
+            )
+            position_ids = (attention_mask.cumsum(-1) - 1)[:, prefix_length:]
+            position_ids = position_ids.unsqueeze(0).expand(3, -1, -1)
+            cache_position = torch.arange(prefix_length, prefix_length + max_len, device=device)
+
+        outputs = self.talker.model(
+            inputs_embeds=input_embeds,
+            attention_mask=attention_mask,
+            position_ids=position_ids,
+            past_key_values=cache,
+            use_cache=True,
+            cache_position=cache_position,
+        )
+        hidden_states = outputs.last_hidden_state
+
+        pad_embed = self.tts_pad_embed.reshape(1, -1).to(device)
+        text_length = max(r.trailing_text_hidden.shape[0] for r in requests) + 1
+        trailing_text = torch.stack(
+            [_right_pad(r.trailing_text_hidden.to(device), text_length, dim=0, fill=pad_embed) for r in requests]
+        )
+        seen_tokens = torch.zeros((len(requests), self.suppress_mask.shape[0]), dtype=torch.bool, device=device)
+        batch = dict(
+            cache=[cache[i] for i in range(self.talker.config.num_hidden_layers)],
+            attention_mask=attention_mask,
+            rope_positions=attention_mask.sum(-1),
+            generation_steps=torch.zeros(len(requests), dtype=torch.long, device=device),
+            trailing_text=trailing_text,
+            past_hidden=hidden_states[:, -1:],
+            seen_tokens=seen_tokens,
+        )
+        num_tokens = torch.zeros(len(requests), dtype=torch.long, device=device)
+        batch["last_tokens"] = self._sample(self.talker.codec_head(hidden_states[:, -1]), seen_tokens, num_tokens)
+        for request in requests:
+            request.num_tokens = 1
+        return batch
+
+    def _merge(self, batch: dict) -> None:
+        if not self.running:
+            self.cache = DynamicCache()
+            for layer_idx, (keys, values) in enumerate(batch["cache"]):
+                self.cache.update(keys, values, layer_idx)
+            self.attention_mask = batch["attention_mask"]
+            self.rope_positions = batch["rope_positions"]
+            self.generation_steps = batch["generation_steps"]
+            self.trailing_text = batch["trailing_text"]
+            self.last_tokens = batch["last_tokens"]
+            self.past_hidden = batch["past_hidden"]
+            self.seen_tokens = batch["seen_tokens"]
+            return
+
+        cache_length = max(self.attention_mask.shape[1], batch["attention_mask"].shape[1])
+        merged_cache = DynamicCache()
+        for layer_idx, (new_keys, new_values) in enumerate(batch["cache"]):
+            keys, values = self.cache[layer_idx]
+            merged_cache.update(
+                torch.cat([_left_pad(keys, cache_length, dim=2), _left_pad(new_keys, cache_length, dim=2)]),
+                torch.cat([_left_pad(values, cache_length, dim=2), _left_pad(new_values, cache_length, dim=2)]),
+                layer_idx,
+            )
+        self.cache = merged_cache
+        self.attention_mask = torch.cat(
+            [
+                _left_pad(self.attention_mask, cache_length, dim=1),
+                _left_pad(batch["attention_mask"], cache_length, dim=1),
+            ]
+        )
+        pad_embed = self.tts_pad_embed.reshape(1, 1, -1)
+        text_length = max(self.trailing_text.shape[1], batch["trailing_text"].shape[1])
+        self.trailing_text = torch.cat(
+            [
+                _right_pad(self.trailing_text, text_length, dim=1, fill=pad_embed),
+                _right_pad(batch["trailing_text"], text_length, dim=1, fill=pad_embed),
+            ]
+        )
+        self.rope_positions = torch.cat([self.rope_positions, batch["rope_positions"]])
+        self.generation_steps = torch.cat([self.generation_steps, batch["generation_steps"]])
+        self.last_tokens = torch.cat([self.last_tokens, batch["last_tokens"]])
+        self.past_hidden = torch.cat([self.past_hidden, batch["past_hidden"]])
+        self.seen_tokens = torch.cat([self.seen_tokens, batch["seen_tokens"]])
+
+    def _decode(self) -> None:
+        batch_size = len(self.running)
+        device = self.talker.device
+        codec_ids, inputs_embeds = self.talker.predict_codec_frame(
+            self.last_tokens.unsqueeze(1),
+            self.past_hidden,
+            subtalker_dosample=self.subtalker_dosample,
+            subtalker_top_k=self.subtalker_top_k,
+            subtalker_top_p=self.subtalker_top_p,
+            subtalker_temperature=self.subtalker_temperature,
+        )
+        for request, frame, hidden_state in zip(self.running, codec_ids, self.past_hidden[:, 0]):
+            request.frames.append(frame)
+            request.hidden_states.append(hidden_state)
+
+        text_index = self.generation_steps.clamp(max=self.trailing_text.shape[1] - 1)
+        rows = torch.arange(batch_size, device=device)
+        inputs_embeds = inputs_embeds + self.trailing_text[rows, text_index].unsqueeze(1)
+
+        cache_length = self.attention_mask.shape[1]
+        self.attention_mask = torch.cat(
+            [self.attention_mask, self.attention_mask.new_ones((batch_size, 1))], dim=1
+        )
+        outputs = self.talker.model(
+            inputs_embeds=inputs_embeds,
+            attention_mask=self.attention_mask,
+            position_ids=self.rope_positions.view(1, -1, 1).expand(3, -1, -1),
+            past_key_values=self.cache,
+            use_cache=True,
+            cache_position=torch.tensor([cache_length], device=device),
+        )
+        hidden_states = outputs.last_hidden_state
+        self.past_hidden = hidden_states[:, -1:]
+        num_tokens = torch.tensor([r.num_tokens for r in self.running], device=device)
+        self.last_tokens = self._sample(self.talker.codec_head(hidden_states[:, -1]), self.seen_tokens, num_tokens)
+        for request in self.running:
+            request.num_tokens += 1
+        self.rope_positions = self.rope_positions + 1
+        self.generation_steps = self.generation_steps + 1
+
+    def _sample(self, logits: torch.Tensor, seen_tokens: torch.Tensor, num_tokens: torch.Tensor) -> torch.Tensor:
+        """Apply the talker logits processors of `generate` row-wise, sample, and record the sampled tokens."""
+        scores = logits.float()
+        if self.repetition_penalty is not None and self.repetition_penalty != 1.0:
+            penalized = torch.where(scores < 0, scores * self.repetition_penalty, scores / self.repetition_penalty)
+            scores = torch.where(seen_tokens, penalized, scores)
+        if self.min_new_tokens > 0:
+            scores[:, self.eos_token_id] = torch.where(
+                num_tokens < self.min_new_tokens, -float("inf"), scores[:, self.eos_token_id]
+            )
+        scores = scores.masked_fill(self.suppress_mask, -float("inf"))
+        next_tokens = sample_next_token(
+            scores, do_sample=self.do_sample, top_k=self.top_k, top_p=self.top_p, temperature=self.temperature
+        )
+        seen_tokens[torch.arange(seen_tokens.shape[0], device=seen_tokens.device), next_tokens] = True
+        return next_tokens
+
+    def _retire(self) -> list[tuple[int, torch.Tensor, torch.Tensor]]:
+        num_groups = self.talker.config.num_code_groups
+        hidden_size = self.talker.config.hidden_size
+        done = [
+            int(token) == self.eos_token_id or request.num_tokens >= request.max_new_tokens
+            for request, token in zip(self.running, self.last_tokens.tolist())
+        ]
+        if not any(done):
+            return []
+
+        finished = []
+        for request, is_done in zip(self.running, done):
+            if is_done:
+                if request.frames:
+                    codes = torch.stack(request.frames)
+                    hidden_states = torch.stack(request.hidden_states)
+                else:
+                    codes = torch.zeros((0, num_groups), dtype=torch.long, device=self.talker.device)
+                    hidden_states = self.past_hidden.new_zeros((0, hidden_size))
+                finished.append((request.request_id, codes, hidden_states))
+        keep = [i for i, is_done in enumerate(done) if not is_done]
+        self.running = [self.running[i] for i in keep]
+        if not self.running:
+            self.cache = None
+            return finished
+
+        keep = torch.tensor(keep, device=self.talker.device)
+        attention_mask = self.attention_mask.index_select(0, keep)
+        # drop cache columns that are padding for every remaining row
+        start = int((attention_mask.cumsum(-1) == 0).sum(-1).min())
+        self.attention_mask = attention_mask[:, start:]
+        cache = DynamicCache()
+        for layer_idx in range(self.talker.config.num_hidden_layers):
+            keys, values = self.cache[layer_idx]
+            cache.update(keys.index_select(0, keep)[:, :, start:], values.index_select(0, keep)[:, :, start:], layer_idx)
+        self.cache = cache
+        self.rope_positions = self.rope_positions.index_select(0, keep)
+        self.generation_steps = self.generation_steps.index_select(0, keep)
+        self.trailing_text = self.trailing_text.index_select(0, keep)
+        self.last_tokens = self.last_tokens.index_select(0, keep)
+        self.past_hidden = self.past_hidden.index_select(0, keep)
+        self.seen_tokens = self.seen_tokens.index_select(0, keep)
+        return finished
+
+
+__all__ = ["Qwen3TTSTalkerPrefixCache", "Qwen3TTSTalkerScheduler"]
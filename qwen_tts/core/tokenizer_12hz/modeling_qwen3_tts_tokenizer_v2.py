@@ -156,6 +156,54 @@ class Qwen3TTSTokenizerV2DecoderPreTrainedModel(PreTrainedModel):
     _supports_attention_backend = True
 
 
+class Qwen3TTSTokenizerV2DecoderPaddingCache:
+    """
+    Left context of the causal convolutions of `Qwen3TTSTokenizerV2Decoder`, used for streaming decoding.
+
+    Every causal (transposed) convolution looks a fixed number of input frames into the past. This cache keeps those
+    frames from the previous call for each layer, so that decoding a sequence piece by piece gives the same output as
+    decoding it at once. Layers are identified by the `layer_idx` that `Qwen3TTSTokenizerV2Decoder` assigns to them.
+    """
+
+    def __init__(self):
+        self.padding_cache: dict[int, torch.Tensor] = {}
+
+    def update(self, hidden_states: torch.Tensor, layer_idx: int, padding: int, zero_init: bool = True):
+        """
+        Returns the cached context of layer `layer_idx` and replaces it with the last `padding` frames of that context
+        followed by `hidden_states`.
+
+        Parameters:
+            hidden_states (`torch.Tensor` of shape `(batch_size, channels, length)`):
+                New input frames of the layer.
+            layer_idx (`int`):
+                The index of the layer to cache the states for.
+            padding (`int`):
+                Number of past input frames the layer needs.
+            zero_init (`bool`, *optional*, defaults to `True`):
+                Whether the context of the first call is `padding` zero frames, like the left padding of a causal
+                convolution, or empty.
+        Returns:
+            `torch.Tensor` of shape `(batch_size, channels, context_length)`, the context to prepend to `hidden_states`.
+        """
+        current_cache = self.padding_cache.get(layer_idx)
+        if current_cache is None:
+            batch_size, channels = hidden_states.shape[:2]
+            current_cache = hidden_states.new_zeros(batch_size, channels, padding if zero_init else 0)
+        self.padding_cache[layer_idx] = torch.cat([current_cache, hidden_states], dim=-1)[..., -padding:]
+        return current_cache
+
+
+def _fold_scale_into_linear(linear: nn.Linear, scale: nn.Parameter):
+    """Multiply the output channels of `linear` by `scale` in place and reset `scale` to ones."""
+    with torch.no_grad():
+        scale_fp32 = scale.float()
+        linear.weight.copy_(linear.weight.float() * scale_fp32[:, None])
+        if linear.bias is not None:
+            linear.bias.copy_(linear.bias.float() * scale_fp32)
+        scale.fill_(1.0)
+
+
 class Qwen3TTSTokenizerV2CausalConvNet(nn.Module):
     def __init__(
         self,
@@ -179,6 +227,7 @@ class Qwen3TTSTokenizerV2CausalConvNet(nn.Module):
         self.kernel_size = (kernel_size - 1) * dilation + 1
         self.dilation = dilation
         self.padding = self.kernel_size - self.stride
+        self.layer_idx = None
 
     def _get_extra_padding_for_conv1d(self, hidden_state: torch.Tensor) -> int:
         length = hidden_state.shape[-1]
@@ -186,7 +235,12 @@ class Qwen3TTSTokenizerV2CausalConvNet(nn.Module):
         ideal_length = (math.ceil(n_frames) - 1) * self.stride + (self.kernel_size - self.padding)
         return ideal_length - length
 
-    def forward(self, hidden_state):
+    def forward(self, hidden_state, padding_cache=None):
+        if padding_cache is not None and self.padding > 0:
+            if self.stride != 1:
+                raise ValueError("`padding_cache` is only supported for convolutions with stride 1.")
+            context = padding_cache.update(hidden_state, self.layer_idx, self.padding)
+            return self.conv(torch.cat([context, hidden_state], dim=-1)).contiguous()
         extra_padding = self._get_extra_padding_for_conv1d(hidden_state)
         hidden_state = F.pad(hidden_state, (self.padding, extra_padding), mode="constant", value=0)
         return self.conv(hidden_state).contiguous()
@@ -200,8 +254,20 @@ class Qwen3TTSTokenizerV2CausalTransConvNet(nn.Module):
         pad = kernel_size - stride
         self.left_pad = math.ceil(pad)
         self.right_pad = pad = self.left_pad
-
-    def forward(self, hidden_state):
+        self.kernel_size = kernel_size
+        self.stride = stride
+        self.layer_idx = None
+
+    def forward(self, hidden_state, padding_cache=None):
+        if padding_cache is not None and self.kernel_size > self.stride:
+            if self.kernel_size % self.stride != 0:
+                raise ValueError("`padding_cache` requires the kernel size to be a multiple of the stride.")
+            # each output frame also depends on the next `kernel_size // stride - 1` input frames; they are kept
+            # until that input has arrived, so nothing is returned for it before
+            context = padding_cache.update(
+                hidden_state, self.layer_idx, self.kernel_size // self.stride - 1, zero_init=False
+            )
+            hidden_state = torch.cat([context, hidden_state], dim=-1)
         hidden_state = self.conv(hidden_state)
         hidden_state = hidden_state[..., self.left_pad : hidden_state.shape[-1] - self.right_pad]
         return hidden_state.contiguous()
@@ -223,10 +289,14 @@ class Qwen3TTSTokenizerV2ConvNeXtBlock(nn.Module):
         self.pwconv2 = nn.Linear(4 * dim, dim)
         self.gamma = nn.Parameter(1e-6 * torch.ones(dim))
 
-    def forward(self, hidden_states):
+    def prepare_for_inference(self):
+        """Fold `gamma` into `pwconv2`; it stays applied, as ones, so reloading original weights still works."""
+        _fold_scale_into_linear(self.pwconv2, self.gamma)
+
+    def forward(self, hidden_states, padding_cache=None):
         input = hidden_states
 
-        hidden_states = self.dwconv(hidden_states)
+        hidden_states = self.dwconv(hidden_states, padding_cache=padding_cache)
         hidden_states = hidden_states.permute(0, 2, 1)
         hidden_states = self.norm(hidden_states)
         hidden_states = self.pwconv1(hidden_states)
@@ -417,6 +487,11 @@ class Qwen3TTSTokenizerV2DecoderTransformerLayer(GradientCheckpointingLayer):
         self.mlp_layer_scale = Qwen3TTSTokenizerV2DecoderLayerScale(config)
         self.attention_type = "sliding_attention"
 
+    def prepare_for_inference(self):
+        """Fold the layer scales into the attention output and MLP down projections."""
+        _fold_scale_into_linear(self.self_attn.o_proj, self.self_attn_layer_scale.scale)
+        _fold_scale_into_linear(self.mlp.down_proj, self.mlp_layer_scale.scale)
+
     def forward(
         self,
         hidden_states: torch.Tensor,
@@ -598,12 +673,32 @@ class SnakeBeta(nn.Module):
 
         self.no_div_by_zero = 0.000000001
 
+        # set by `prepare_for_inference`, recomputed when new weights are loaded
+        self.register_buffer("inference_alpha", None, persistent=False)
+        self.register_buffer("inference_inv_beta", None, persistent=False)
+        self.register_load_state_dict_post_hook(SnakeBeta._refresh_inference_buffers)
+
+    @staticmethod
+    def _refresh_inference_buffers(module, incompatible_keys):
+        if module.inference_alpha is not None:
+            module.prepare_for_inference()
+
+    def prepare_for_inference(self):
+        """Cache `exp(alpha)` and `1 / exp(beta)`; call it again after changing `alpha` or `beta` in place."""
+        with torch.no_grad():
+            self.inference_alpha = torch.exp(self.alpha)[None, :, None]
+            self.inference_inv_beta = 1.0 / (torch.exp(self.beta)[None, :, None] + self.no_div_by_zero)
+
     def forward(self, hidden_states):
         """
         Forward pass of the function.
         Applies the function to the input elementwise.
         SnakeBeta ∶= x + 1/b * sin^2 (xa)
         """
+        if self.inference_alpha is not None:
+            return hidden_states + self.inference_inv_beta * torch.pow(
+                torch.sin(hidden_states * self.inference_alpha), 2
+            )
         alpha = self.alpha.unsqueeze(0).unsqueeze(-1)  # line up with x to [B, C, T]
         beta = self.beta.unsqueeze(0).unsqueeze(-1)
         alpha = torch.exp(alpha)
@@ -624,13 +719,13 @@ class Qwen3TTSTokenizerV2DecoderDecoderResidualUnit(nn.Module):
         self.act2 = SnakeBeta(dim)
         self.conv2 = Qwen3TTSTokenizerV2CausalConvNet(dim, dim, kernel_size=1)
 
-    def forward(self, hidden_state):
+    def forward(self, hidden_state, padding_cache=None):
         residual = hidden_state
 
         hidden_state = self.act1(hidden_state)
-        hidden_state = self.conv1(hidden_state)
+        hidden_state = self.conv1(hidden_state, padding_cache=padding_cache)
         hidden_state = self.act2(hidden_state)
-        hidden_state = self.conv2(hidden_state)
+        hidden_state = self.conv2(hidden_state, padding_cache=padding_cache)
         return hidden_state + residual
 
 
@@ -651,9 +746,9 @@ class Qwen3TTSTokenizerV2DecoderDecoderBlock(Qwen3TTSTokenizerV2DecoderPreTraine
 
         self.block = nn.ModuleList(block)
 
-    def forward(self, hidden):
+    def forward(self, hidden, padding_cache=None):
         for block in self.block:
-            hidden = block(hidden)
+            hidden = block(hidden) if isinstance(block, SnakeBeta) else block(hidden, padding_cache=padding_cache)
         return hidden
 
 
@@ -672,9 +767,13 @@ class EuclideanCodebook(nn.Module):
         self.cluster_usage = nn.Parameter(torch.ones(codebook_size))
         self.embedding_sum = nn.Parameter(torch.zeros(codebook_size, dim))
 
+    @property
+    def embedding(self) -> torch.Tensor:
+        """Normalized codebook of shape `(codebook_size, dim)`."""
+        return self.embedding_sum / self.cluster_usage.clamp(min=self.epsilon)[:, None]
+
     def decode(self, codes: torch.Tensor) -> torch.Tensor:
-        embedding = self.embedding_sum / self.cluster_usage.clamp(min=self.epsilon)[:, None]
-        quantized = F.embedding(codes, embedding)
+        quantized = F.embedding(codes, self.embedding)
         return quantized
 
 
@@ -726,6 +825,14 @@ class ResidualVectorQuantization(nn.Module):
         return quantized
 
 
+def _gather_codebooks(codebooks: torch.Tensor, codes: torch.Tensor) -> torch.Tensor:
+    """Sum of `codebooks[k, codes[:, k]]` over the layers `k`, as one lookup: `(B, K, T)` codes -> `(B, dim, T)`."""
+    num_layers, codebook_size = codes.shape[1], codebooks.shape[1]
+    offsets = torch.arange(num_layers, device=codes.device)[None, :, None] * codebook_size
+    quantized = F.embedding(codes + offsets, codebooks[:num_layers].flatten(0, 1)).sum(dim=1)
+    return quantized.transpose(1, 2)
+
+
 class ResidualVectorQuantizer(nn.Module):
     def __init__(
         self,
@@ -768,8 +875,50 @@ class ResidualVectorQuantizer(nn.Module):
             codebook_size=self.bins,
             num_quantizers=self.n_q
         )
+        # set by `freeze_codebooks`, recomputed when new weights are loaded
+        self.register_buffer("frozen_codebooks", None, persistent=False)
+        self.frozen_projections = False
+        self.register_load_state_dict_post_hook(ResidualVectorQuantizer._refresh_frozen_codebooks)
+
+    @staticmethod
+    def _refresh_frozen_codebooks(module, incompatible_keys):
+        if module.frozen_codebooks is not None:
+            module.freeze_codebooks(module.frozen_projections)
+
+    def codebook_table(self, fold_projections: bool = False) -> torch.Tensor:
+        """
+        Decoded vector of every code of every layer, computed from the current weights.
+
+        Args:
+            fold_projections (`bool`, *optional*, defaults to `False`):
+                Also apply `output_proj`, so that decoding is a plain lookup and sum.
+
+        Returns:
+            `torch.Tensor` of shape `(n_q, bins, dim)`, with `dim` the output dimension if `fold_projections` else
+            the codebook dimension.
+        """
+        table = torch.stack([layer.project_out(layer._codebook.embedding) for layer in self.vq.layers])
+        if fold_projections and not isinstance(self.output_proj, nn.Identity):
+            table = F.linear(table, self.output_proj.weight[..., 0])
+        return table
+
+    def freeze_codebooks(self, fold_projections: bool = False):
+        """
+        Inference-time export: materialize the normalized codebooks once and decode all layers with a single
+        gather-and-sum. Call it again after changing the weights.
+
+        Args:
+            fold_projections (`bool`, *optional*, defaults to `False`):
+                Fold `output_proj` into the table as well. Costs `output_dimension / dimension` times the memory.
+        """
+        with torch.no_grad():
+            self.frozen_codebooks = self.codebook_table(fold_projections)
+        self.frozen_projections = fold_projections
 
     def decode(self, codes: torch.Tensor) -> torch.Tensor:
+        if self.frozen_codebooks is not None:
+            quantized = _gather_codebooks(self.frozen_codebooks, codes)
+            return quantized if self.frozen_projections else self.output_proj(quantized)
         codes = codes.transpose(0, 1)
         quantized = self.vq.decode(codes)
         quantized = self.output_proj(quantized)
@@ -810,10 +959,39 @@ class SplitResidualVectorQuantizer(nn.Module):
             q_dropout=q_dropout,
             **kwargs,
         )
+        # set by `freeze_codebooks(fold_projections=True)`, recomputed when new weights are loaded
+        self.register_buffer("frozen_codebooks", None, persistent=False)
+        self.register_load_state_dict_post_hook(SplitResidualVectorQuantizer._refresh_frozen_codebooks)
+
+    @staticmethod
+    def _refresh_frozen_codebooks(module, incompatible_keys):
+        if module.frozen_codebooks is not None:
+            module.freeze_codebooks(fold_projections=True)
+
+    def freeze_codebooks(self, fold_projections: bool = True):
+        """
+        Inference-time export of the codebooks, see `ResidualVectorQuantizer.freeze_codebooks`.
+
+        With `fold_projections`, the semantic and acoustic tables are merged into one, so all quantizer layers are
+        decoded by a single gather-and-sum. Otherwise each group keeps its output projection. Call it again after
+        changing the weights.
+        """
+        if fold_projections:
+            with torch.no_grad():
+                self.frozen_codebooks = torch.cat(
+                    [self.rvq_first.codebook_table(True), self.rvq_rest.codebook_table(True)], dim=0
+                )
+        else:
+            # drop a merged table from an earlier folded freeze, `decode` would keep using it
+            self.frozen_codebooks = None
+            self.rvq_first.freeze_codebooks()
+            self.rvq_rest.freeze_codebooks()
 
     def decode(self, codes: torch.Tensor) -> torch.Tensor:
         """Decode the given codes to the quantized representation."""
         # codes is [B, K, T], with T frames, K nb of codebooks.
+        if self.frozen_codebooks is not None:
+            return _gather_codebooks(self.frozen_codebooks, codes)
         quantized = self.rvq_first.decode(codes[:, : self.n_q_semantic])
         if codes.shape[1] > self.n_q_semantic:
             quantized += self.rvq_rest.decode(codes[:, self.n_q_semantic :])
@@ -863,37 +1041,183 @@ class Qwen3TTSTokenizerV2Decoder(Qwen3TTSTokenizerV2DecoderPreTrainedModel):
         ]
         self.decoder = nn.ModuleList(decoder)
 
+        # initialize layer_idx for the causal convolutions, necessary for padding_cache
+        conv_layers = [
+            module
+            for module in self.modules()
+            if isinstance(module, (Qwen3TTSTokenizerV2CausalConvNet, Qwen3TTSTokenizerV2CausalTransConvNet))
+        ]
+        for layer_idx, layer in enumerate(conv_layers):
+            layer.layer_idx = layer_idx
+
         self.post_init()
 
-    def forward(self, codes):
+    def prepare_for_inference(self, freeze_codebooks: bool = True):
+        """
+        Fold inference-time constants into the weights: the SnakeBeta `exp(alpha)` and `1 / exp(beta)`, the ConvNeXt
+        `gamma` (into `pwconv2`) and the pre-transformer layer scales (into `o_proj` / `down_proj`). Optionally also
+        freezes the quantizer codebooks, see `SplitResidualVectorQuantizer.freeze_codebooks`.
+
+        The output matches the original module up to float rounding. Scales are reset to one after folding and still
+        applied, so the state dict of a prepared decoder loads into a fresh one, and loading original weights into a
+        prepared decoder gives the original decoder (the cached SnakeBeta terms and codebook tables are recomputed on
+        load). The transform is meant for inference only; do not train a prepared decoder.
+
+        Returns:
+            The decoder itself.
+        """
+        for module in self.modules():
+            if isinstance(
+                module, (SnakeBeta, Qwen3TTSTokenizerV2ConvNeXtBlock, Qwen3TTSTokenizerV2DecoderTransformerLayer)
+            ):
+                module.prepare_for_inference()
+        if freeze_codebooks:
+            self.quantizer.freeze_codebooks()
+        return self
+
+    def forward(self, codes, past_key_values=None, padding_cache=None):
+        """
+        Args:
+            codes (`torch.LongTensor` of shape `(batch_size, num_quantizers, codes_length)`):
+                Codec frames to decode.
+            past_key_values (`DynamicCache`, *optional*):
+                Pre-transformer cache of the previously decoded frames, updated in place.
+            padding_cache (`Qwen3TTSTokenizerV2DecoderPaddingCache`, *optional*):
+                Convolution context of the previously decoded frames, updated in place. Without it, the convolutions
+                are zero padded as for the start of a sequence.
+        """
         if codes.shape[1] != self.config.num_quantizers:
             raise ValueError(f"Expected {self.config.num_quantizers} layer of codes, got {codes.shape[1]}")
 
         hidden = self.quantizer.decode(codes)
-        hidden = self.pre_conv(hidden).transpose(1, 2)
+        hidden = self.pre_conv(hidden, padding_cache=padding_cache).transpose(1, 2)
 
-        hidden = self.pre_transformer(inputs_embeds=hidden).last_hidden_state
+        hidden = self.pre_transformer(
+            inputs_embeds=hidden, past_key_values=past_key_values, use_cache=past_key_values is not None
+        ).last_hidden_state
         hidden = hidden.permute(0, 2, 1)
         for blocks in self.upsample:
             for block in blocks:
-                hidden = block(hidden)
+                hidden = block(hidden, padding_cache=padding_cache)
         wav = hidden
         for block in self.decoder:
-            wav = block(wav)
+            wav = block(wav) if isinstance(block, SnakeBeta) else block(wav, padding_cache=padding_cache)
         return wav.clamp(min=-1, max=1)
 
-    def chunked_decode(self, codes, chunk_size=300, left_context_size=25):
+    def chunked_decode(
+        self, codes, chunk_size=300, left_context_size=25, parallel=False, max_batch_size=None, forward_fn=None
+    ):
+        """
+        Decode `codes` in chunks of `chunk_size` frames, each preceded by up to `left_context_size` frames of context.
+
+        Args:
+            codes (`torch.LongTensor` of shape `(batch_size, num_quantizers, codes_length)`):
+                Codec frames to decode.
+            chunk_size (`int`, *optional*, defaults to 300):
+                Number of frames decoded per chunk.
+            left_context_size (`int`, *optional*, defaults to 25):
+                Number of preceding frames re-decoded as context for each chunk.
+            parallel (`bool`, *optional*, defaults to `False`):
+                Decode all chunks in one forward pass as a right-padded batch instead of one after the other. The
+                output is the same; fewer, larger calls use many CPU cores much better, at the cost of memory.
+            max_batch_size (`int`, *optional*):
+                With `parallel`, maximum number of chunks (summed over the batch) per forward pass. All at once if
+                unset.
+            forward_fn (`Callable`, *optional*):
+                Replacement for `self.forward`, called with each batch of code chunks (e.g. an ONNX Runtime session).
+        """
+        forward_fn = self if forward_fn is None else forward_fn
+        if parallel:
+            return self._parallel_chunked_decode(codes, chunk_size, left_context_size, max_batch_size, forward_fn)
         wavs = []
         start_index = 0
         while start_index < codes.shape[-1]:
             end_index = min(start_index + chunk_size, codes.shape[-1])
             context_size = left_context_size if start_index - left_context_size > 0 else start_index
             codes_chunk = codes[..., start_index - context_size : end_index]
-            wav_chunk = self(codes_chunk)
+            wav_chunk = forward_fn(codes_chunk)
             wavs.append(wav_chunk[..., context_size * self.total_upsample :])
             start_index = end_index
         return torch.cat(wavs, dim=-1)
 
+    def _parallel_chunked_decode(self, codes, chunk_size, left_context_size, max_batch_size, forward_fn):
+        # same windows as the serial loop in `chunked_decode`
+        windows = []
+        for start_index in range(0, codes.shape[-1], chunk_size):
+            end_index = min(start_index + chunk_size, codes.shape[-1])
+            context_size = left_context_size if start_index - left_context_size > 0 else start_index
+            windows.append((start_index - context_size, context_size, end_index))
+        max_length = max(end_index - begin_index for begin_index, _, end_index in windows)
+
+        # the decoder is causal, so right padding only changes samples past the end of each window, which are cut
+        batch = torch.cat(
+            [
+                F.pad(codes[..., begin_index:end_index], (0, max_length - (end_index - begin_index)))
+                for begin_index, _, end_index in windows
+            ],
+            dim=0,
+        )
+        if max_batch_size is None:
+            wav = forward_fn(batch)
+        else:
+            wav = torch.cat([forward_fn(sub_batch) for sub_batch in batch.split(max_batch_size)], dim=0)
+
+        # samples at the end of the input that the decoder trims because they would need the next frames
+        upsample = int(self.total_upsample)
+        lookahead = max_length * upsample - wav.shape[-1]
+        wav = wav.view(len(windows), codes.shape[0], *wav.shape[1:])
+        wavs = [
+            wav[i, ..., context_size * upsample : (end_index - begin_index) * upsample - lookahead]
+            for i, (begin_index, context_size, end_index) in enumerate(windows)
+        ]
+        return torch.cat(wavs, dim=-1)
+
+
+class Qwen3TTSTokenizerV2DecoderStream:
+    """
+    Incremental decoding with a `Qwen3TTSTokenizerV2Decoder`.
+
+    Codec frames are pushed as they become available. The stream keeps the pre-transformer KV cache (which never
+    grows beyond the sliding window) and the context of every causal convolution, so each pushed frame costs the same
+    whatever the number of frames before it, unlike re-decoding a window of left context with `chunked_decode`.
+
+    The transposed convolutions of the decoder blocks look one input frame ahead, so the samples of a frame are only
+    complete once the next frame is known. `push` returns exactly the samples that are complete: after `n` frames,
+    `n * total_upsample - lookahead` samples have been returned in total, the same as `decoder(codes[..., :n])`, and the
+    concatenation of all returned chunks equals `decoder(codes)`.
+
+    Example:
+        stream = Qwen3TTSTokenizerV2DecoderStream(decoder)
+        for frame in frames:  # (batch_size, num_quantizers, 1)
+            wav_chunk = stream.push(frame)
+    """
+
+    def __init__(self, decoder: Qwen3TTSTokenizerV2Decoder):
+        self.decoder = decoder
+        self.reset()
+
+    def reset(self):
+        """Forget all pushed frames and start a new sequence."""
+        self.past_key_values = DynamicCache(config=self.decoder.config)
+        self.padding_cache = Qwen3TTSTokenizerV2DecoderPaddingCache()
+        self.num_frames = 0
+
+    @torch.no_grad()
+    def push(self, codes: torch.Tensor) -> torch.Tensor:
+        """
+        Decode the next frames of the sequence.
+
+        Args:
+            codes (`torch.LongTensor` of shape `(batch_size, num_quantizers, codes_length)`):
+                New codec frames; the batch size must stay the same for the whole sequence.
+
+        Returns:
+            `torch.FloatTensor` of shape `(batch_size, 1, num_samples)`: the samples completed by these frames.
+        """
+        wav = self.decoder(codes, past_key_values=self.past_key_values, padding_cache=self.padding_cache)
+        self.num_frames += codes.shape[-1]
+        return wav
+
 
 class Qwen3TTSTokenizerV2Encoder(MimiModel):
     def __init__(self, config: MimiConfig):
@@ -993,6 +1317,7 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
         self,
         audio_codes: torch.Tensor,
         return_dict: Optional[bool] = None,
+        parallel_chunks: bool = False,
     ) -> Union[tuple[torch.Tensor, torch.Tensor], Qwen3TTSTokenizerV2DecoderOutput]:
         """
         Decodes the given frames into an output audio waveform.
@@ -1005,11 +1330,13 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
                 Discret code embeddings computed using `model.encode`.
             return_dict (`bool`, *optional*):
                 Whether or not to return a [`~utils.ModelOutput`] instead of a plain tuple.
+            parallel_chunks (`bool`, *optional*, defaults to `False`):
+                Decode all chunks of long inputs in one batched forward pass, see `chunked_decode`.
 
         """
         return_dict = return_dict if return_dict is not None else self.config.return_dict
 
-        audio_values = self.decoder.chunked_decode(audio_codes.transpose(1, 2)).squeeze(1)
+        audio_values = self.decoder.chunked_decode(audio_codes.transpose(1, 2), parallel=parallel_chunks).squeeze(1)
 
         audio_lengths = (audio_codes[..., 0] > 0).sum(1) * self.decode_upsample_rate
         audio_values = [a[:l] for a, l in zip(audio_values, audio_lengths)]
@@ -1022,4 +1349,4 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
         return Qwen3TTSTokenizerV2DecoderOutput(audio_values)
 
 
-__all__ = ["Qwen3TTSTokenizerV2Model", "Qwen3TTSTokenizerV2PreTrainedModel"]
+__all__ = ["Qwen3TTSTokenizerV2Model", "Qwen3TTSTokenizerV2PreTrainedModel", "Qwen3TTSTokenizerV2DecoderStream"]
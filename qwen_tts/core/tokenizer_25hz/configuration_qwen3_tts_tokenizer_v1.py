@@ -64,6 +64,10 @@ class Qwen3TTSTokenizerV1DecoderDiTConfig(PretrainedConfig):
             The scale of the Res2Net block in the encoder.
         enc_se_channels (`int`, *optional*, defaults to 64):
             The number of output channels after squeeze in the SqueezeExcitationBlock.
+        block_local_attention (`bool`, *optional*, defaults to `False`):
+            Compute the attention of each block only against the blocks it can see (see `block_size`,
+            `look_ahead_layers` and `look_backward_layers`) instead of dense attention under a block mask. Same
+            output, with memory linear instead of quadratic in the sequence length.
     """
 
     model_type = "qwen3_tts_tokenizer_v1_decoder_dit"
@@ -93,6 +97,7 @@ class Qwen3TTSTokenizerV1DecoderDiTConfig(PretrainedConfig):
         enc_attention_channels=64,
         enc_res2net_scale=2,
         enc_se_channels=64,
+        block_local_attention=False,
         **kwargs,
     ):
         self.hidden_size = hidden_size
@@ -118,6 +123,7 @@ class Qwen3TTSTokenizerV1DecoderDiTConfig(PretrainedConfig):
         self.enc_attention_channels = enc_attention_channels
         self.enc_res2net_scale = enc_res2net_scale
         self.enc_se_channels = enc_se_channels
+        self.block_local_attention = block_local_attention
         super().__init__(**kwargs)
 
 
@@ -139,6 +145,9 @@ class Qwen3TTSTokenizerV1DecoderBigVGANConfig(PretrainedConfig):
             A list of upsampling rates for each upsampling layer.
         upsample_kernel_sizes (`list[int]`, *optional*, defaults to `[11, 7, 4, 4, 4, 4]`):
             A list of kernel sizes for each upsampling layer.
+        fused_activations (`bool`, *optional*, defaults to `False`):
+            Whether the anti-aliased activations run as fused polyphase filters, which skip the intermediate tensors
+            at twice the sample rate. Gives the same waveform within float rounding.
     """
 
     model_type = "qwen3_tts_tokenizer_v1_decoder_bigvgan"
@@ -151,6 +160,7 @@ class Qwen3TTSTokenizerV1DecoderBigVGANConfig(PretrainedConfig):
         resblock_dilation_sizes=[[1, 3, 5], [1, 3, 5], [1, 3, 5]],
         upsample_rates=[5, 3, 2, 2, 2, 2],
         upsample_kernel_sizes=[11, 7, 4, 4, 4, 4],
+        fused_activations=False,
         **kwargs,
     ):
         self.mel_dim = mel_dim
@@ -159,6 +169,7 @@ class Qwen3TTSTokenizerV1DecoderBigVGANConfig(PretrainedConfig):
         self.resblock_dilation_sizes = resblock_dilation_sizes
         self.upsample_rates = upsample_rates
         self.upsample_kernel_sizes = upsample_kernel_sizes
+        self.fused_activations = fused_activations
         super().__init__(**kwargs)
 
 
@@ -234,6 +245,9 @@ class Qwen3TTSTokenizerV1EncoderConfig(PretrainedConfig):
             Whether to use positional encoding (or position embeddings) inside the VQ module.
         audio_vq_ds_rate (`int`, *optional*, defaults to 2):
             Downsampling rate applied before VQ (e.g., temporal downsample factor).
+        prune_after_vq (`bool`, *optional*, defaults to `False`):
+            Whether to build the encoder only up to the VQ layer. Encoding only needs the codes, so the later
+            transformer layers and the output heads are neither instantiated nor loaded.
     """
 
     model_type = "qwen3_tts_tokenizer_v1_encoder"
@@ -256,6 +270,7 @@ class Qwen3TTSTokenizerV1EncoderConfig(PretrainedConfig):
         audio_vq_codebook_dim=1280,
         audio_vq_pe=True,
         audio_vq_ds_rate=2,
+        prune_after_vq=False,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -275,6 +290,7 @@ class Qwen3TTSTokenizerV1EncoderConfig(PretrainedConfig):
         self.audio_vq_codebook_dim = audio_vq_codebook_dim
         self.audio_vq_pe = audio_vq_pe
         self.audio_vq_ds_rate = audio_vq_ds_rate
+        self.prune_after_vq = prune_after_vq
 
 
 class Qwen3TTSTokenizerV1Config(PretrainedConfig):
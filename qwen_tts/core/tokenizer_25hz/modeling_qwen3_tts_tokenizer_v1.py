@@ -252,7 +252,7 @@ class AttentiveStatisticsPooling(nn.Module):
         if max_len is None:
             max_len = length.max().long().item()  # using arange to generate mask
         mask = torch.arange(max_len, device=length.device, dtype=length.dtype).expand(
-            len(length), max_len
+            length.shape[0], max_len
         ) < length.unsqueeze(1)
 
         mask = torch.as_tensor(mask, dtype=dtype, device=device)
@@ -430,28 +430,48 @@ class DiTInputEmbedding(nn.Module):
             config.mel_dim + config.enc_dim + config.enc_emb_dim + config.emb_dim,
             config.hidden_size,
         )
+        self.mel_dim = config.mel_dim
         self.spk_encoder = ECAPA_TimeDelayNet(config)
 
-    def forward(
+    def embed_conditions(
         self,
-        hidden_states: torch.Tensor,
         speaker_embedding: torch.Tensor,
         condition_vector: torch.Tensor,
         code_embed: torch.Tensor,
         drop_audio_cond: Optional[bool] = False,
-        code_embed_uncond: Optional[bool] = None,
+        code_embed_uncond: Optional[torch.Tensor] = None,
         apply_cfg: Optional[bool] = True,
     ):
+        """Part of the input projection that does not depend on the noisy mel, see `DiTModel.embed_conditions`."""
         if apply_cfg:
-            hidden_states = torch.cat([hidden_states, hidden_states], dim=0)
             speaker_embedding = torch.cat([speaker_embedding, torch.zeros_like(speaker_embedding)], dim=0)
             condition_vector = torch.cat([condition_vector, torch.zeros_like(condition_vector)], dim=0)
             code_embed = torch.cat([code_embed, code_embed_uncond], dim=0)
         elif drop_audio_cond:  # cfg for cond audio
             condition_vector = torch.zeros_like(condition_vector)
             speaker_embedding = torch.zeros_like(speaker_embedding)
-        condition_vector = self.spk_encoder(condition_vector).unsqueeze(1).repeat(1, hidden_states.size(1), 1)
-        hidden_states = self.proj(torch.cat((hidden_states, condition_vector, code_embed, speaker_embedding), dim=-1))
+        condition_vector = self.spk_encoder(condition_vector).unsqueeze(1).repeat(1, code_embed.size(1), 1)
+        conditions = torch.cat((condition_vector, code_embed, speaker_embedding), dim=-1)
+        return F.linear(conditions, self.proj.weight[:, self.mel_dim :], self.proj.bias)
+
+    def forward(
+        self,
+        hidden_states: torch.Tensor,
+        speaker_embedding: Optional[torch.Tensor] = None,
+        condition_vector: Optional[torch.Tensor] = None,
+        code_embed: Optional[torch.Tensor] = None,
+        drop_audio_cond: Optional[bool] = False,
+        code_embed_uncond: Optional[torch.Tensor] = None,
+        apply_cfg: Optional[bool] = True,
+        condition_embedding: Optional[torch.Tensor] = None,
+    ):
+        if condition_embedding is None:
+            condition_embedding = self.embed_conditions(
+                speaker_embedding, condition_vector, code_embed, drop_audio_cond, code_embed_uncond, apply_cfg
+            )
+        if apply_cfg:
+            hidden_states = torch.cat([hidden_states, hidden_states], dim=0)
+        hidden_states = F.linear(hidden_states, self.proj.weight[:, : self.mel_dim]) + condition_embedding
 
         return hidden_states
 
@@ -567,6 +587,48 @@ def apply_rotary_pos_emb(q, k, cos, sin, position_ids=None, unsqueeze_dim=1):
     return q_embed, k_embed
 
 
+def block_local_attention(query, key, value, block_size, look_backward_block=0, look_ahead_block=0):
+    """
+    Attention of each block of `block_size` positions against itself, the `look_backward_block` previous blocks and
+    the `look_ahead_block` next ones, computed block by block.
+
+    Gives the same result as dense attention under the block mask of `DiTDecoderLayer`, without materializing the
+    `seq_len x seq_len` scores.
+
+    Args:
+        query, key, value (`torch.Tensor` of shape `(batch_size, num_heads, seq_len, head_dim)`):
+            Attention inputs.
+
+    Returns:
+        `torch.Tensor` of shape `(batch_size, seq_len, num_heads, head_dim)`, the layout of the attention interfaces.
+    """
+    batch_size, num_heads, seq_len, head_dim = query.shape
+    num_blocks = -(-seq_len // block_size)
+    padding = num_blocks * block_size - seq_len
+    window = look_backward_block + 1 + look_ahead_block
+
+    def to_blocks(x, before, after):
+        x = F.pad(x, (0, 0, before * block_size, padding + after * block_size))
+        return x.view(batch_size, num_heads, -1, block_size, head_dim)
+
+    query = to_blocks(query, 0, 0)
+    key = to_blocks(key, look_backward_block, look_ahead_block)
+    value = to_blocks(value, look_backward_block, look_ahead_block)
+    # (batch, heads, num_blocks, window * block_size, head_dim): the visible blocks of every query block
+    key = torch.cat([key[:, :, i : i + num_blocks] for i in range(window)], dim=3)
+    value = torch.cat([value[:, :, i : i + num_blocks] for i in range(window)], dim=3)
+
+    # mask the padding before the first and after the last position
+    positions = torch.arange(window * block_size, device=query.device) + (
+        torch.arange(num_blocks, device=query.device).unsqueeze(1) - look_backward_block
+    ) * block_size
+    mask = ((positions >= 0) & (positions < seq_len)).unsqueeze(1)
+
+    output = F.scaled_dot_product_attention(query, key, value, attn_mask=mask)
+    output = output.reshape(batch_size, num_heads, -1, head_dim)[:, :, :seq_len]
+    return output.transpose(1, 2)
+
+
 class DiTAttention(nn.Module):
     def __init__(self, config: Qwen3TTSTokenizerV1DecoderBigVGANConfig):
         super().__init__()
@@ -576,6 +638,7 @@ class DiTAttention(nn.Module):
         self.heads = config.num_attention_heads
         self.inner_dim = config.head_dim * config.num_attention_heads
         self.dropout = config.dropout
+        self.block_size = config.block_size
         self.is_causal = False
 
         self.to_q = nn.Linear(config.hidden_size, self.inner_dim)
@@ -589,6 +652,7 @@ class DiTAttention(nn.Module):
         hidden_states,  # noised input x
         position_embeddings=None,  # rotary position embedding for x
         attention_mask=None,
+        block_window=None,  # (look_backward_block, look_ahead_block) for block-local attention
     ) -> torch.Tensor:
         batch_size = hidden_states.shape[0]
 
@@ -609,15 +673,18 @@ class DiTAttention(nn.Module):
         cos, sin = position_embeddings
         query, key = apply_rotary_pos_emb(query, key, cos, sin)
 
-        attention_interface = ALL_ATTENTION_FUNCTIONS[self.config._attn_implementation]
-        attention_weights, _ = attention_interface(
-            self,
-            query,
-            key,
-            value,
-            attention_mask=attention_mask,
-            is_causal=False,
-        )
+        if block_window is not None:
+            attention_weights = block_local_attention(query, key, value, self.block_size, *block_window)
+        else:
+            attention_interface = ALL_ATTENTION_FUNCTIONS[self.config._attn_implementation]
+            attention_weights, _ = attention_interface(
+                self,
+                query,
+                key,
+                value,
+                attention_mask=attention_mask,
+                is_causal=False,
+            )
 
         # mask. e.g. inference got a batch with different target durations, mask out the padding
         attention_weights = attention_weights.reshape(batch_size, -1, self.heads * head_dim)
@@ -672,18 +739,25 @@ class DiTDecoderLayer(nn.Module):
         self.ff = DiTMLP(dim=config.hidden_size, mult=config.ff_mult, dropout=config.dropout)
 
     def forward(
-        self, hidden_states, timestep, position_embeddings=None, block_diff=None
+        self, hidden_states, timestep, position_embeddings=None, block_masks=None
     ):  # x: noised input, t: time embedding
+        """
+        `block_masks` are the masks of `DiTModel.create_block_masks`. Without them, attention is computed
+        block-locally.
+        """
         # pre-norm & modulation for attention input
         norm, gate_msa, shift_mlp, scale_mlp, gate_mlp = self.attn_norm(hidden_states, emb=timestep)
 
         # attention
-        attn_output = self.attn(
-            hidden_states=norm,
-            position_embeddings=position_embeddings,
-            attention_mask=(block_diff >= -float(self.look_backward_block))
-            & (block_diff <= float(self.look_ahead_block)),
-        )
+        block_window = (self.look_backward_block, self.look_ahead_block)
+        if block_masks is None:
+            attn_output = self.attn(
+                hidden_states=norm, position_embeddings=position_embeddings, block_window=block_window
+            )
+        else:
+            attn_output = self.attn(
+                hidden_states=norm, position_embeddings=position_embeddings, attention_mask=block_masks[block_window]
+            )
 
         # process attention output for input x
         hidden_states = hidden_states + gate_msa.unsqueeze(1) * attn_output
@@ -840,6 +914,7 @@ class TorchActivation1d(nn.Module):
         down_ratio: int = 2,
         up_kernel_size: int = 12,
         down_kernel_size: int = 12,
+        fused: bool = False,
     ):
         super().__init__()
         if not callable(activation):
@@ -847,8 +922,85 @@ class TorchActivation1d(nn.Module):
         self.act = activation
         self.upsample = UpSample1d(up_ratio, up_kernel_size)
         self.downsample = DownSample1d(down_ratio, down_kernel_size)
+        self.fused = fused
+        if fused:
+            self._init_polyphase_filters()
+
+    def _init_polyphase_filters(self):
+        """
+        Splits the up- and downsampling filters into one depthwise filter per phase of the 2x signal, expanded to
+        the channel count of the activation.
+
+        Upsampled sample `ratio * i + p` is a short convolution of the (padded) input starting at
+        `up_starts[p] + i`. Downsampled sample `i` sums one short convolution per phase `p`, over the activated
+        phase samples starting at `i + down_offsets[p]`.
+        """
+        upsample, downsample = self.upsample, self.downsample
+        if upsample.ratio != downsample.stride:
+            raise ValueError("The fused activation needs the same up and down ratio.")
+        ratio = upsample.ratio
+        up_kernel_size, down_kernel_size = upsample.kernel_size, downsample.filter.shape[-1]
+        if up_kernel_size % ratio or down_kernel_size % ratio:
+            raise ValueError("The fused activation needs kernel sizes that are multiples of the ratio.")
+        channels = self.act.in_features
+        up_filter, down_filter = upsample.filter.view(-1), downsample.filter.view(-1)
+        up_taps = up_kernel_size // ratio
+
+        self.up_starts, self.down_offsets = [], []
+        up_filters, down_filters = [], []
+        for phase in range(ratio):
+            offset = (phase + upsample.pad_left) % ratio
+            self.up_starts.append((phase + upsample.pad_left - offset) // ratio - up_taps + 1)
+            up_filters.append(ratio * up_filter[offset::ratio].flip(0))
+
+            offset = (phase + downsample.pad_left) % ratio
+            self.down_offsets.append((offset - downsample.pad_left - phase) // ratio)
+            down_filters.append(down_filter[offset::ratio])
+
+        self.register_buffer(
+            "up_filters", torch.stack(up_filters)[:, None, None].expand(-1, channels, -1, -1).contiguous(),
+            persistent=False,
+        )
+        self.register_buffer(
+            "down_filters", torch.stack(down_filters)[:, None, None].expand(-1, channels, -1, -1).contiguous(),
+            persistent=False,
+        )
+
+    def _fused_forward(self, hidden_states):
+        # polyphase up-activate-down: every tensor stays at the input rate, the 2x signal is never materialized
+        channels, length = hidden_states.shape[1:]
+        ratio = self.upsample.ratio
+        up_taps, down_taps = self.up_filters.shape[-1], self.down_filters.shape[-1]
+        downsample = self.downsample
+        out_length = (ratio * length + downsample.pad_left + downsample.pad_right - ratio * down_taps) // ratio + 1
+        padded = F.pad(hidden_states, (self.upsample.pad, self.upsample.pad), mode="replicate")
+
+        def activated_phase(phase, begin, size):
+            start = self.up_starts[phase] + begin
+            window = padded[..., start : start + size + up_taps - 1]
+            return self.act(F.conv1d(window, self.up_filters[phase], groups=channels))
+
+        # the replicate padding of the 2x signal repeats its first and last samples
+        first, last = activated_phase(0, 0, 1), activated_phase(ratio - 1, length - 1, 1)
+        output = None
+        for phase in range(ratio):
+            activated = activated_phase(phase, 0, length)
+            offset = self.down_offsets[phase]
+            pad_left = max(0, -offset)
+            pad_right = max(0, out_length + offset + down_taps - 1 - length)
+            if pad_left or pad_right:
+                activated = torch.cat(
+                    [first.expand(-1, -1, pad_left), activated, last.expand(-1, -1, pad_right)], dim=-1
+                )
+            start = offset + pad_left
+            activated = activated[..., start : start + out_length + down_taps - 1]
+            downsampled = F.conv1d(activated, self.down_filters[phase], groups=channels)
+            output = downsampled if output is None else output + downsampled
+        return output
 
     def forward(self, hidden_states):
+        if self.fused:
+            return self._fused_forward(hidden_states)
         hidden_states = self.upsample(hidden_states)
         hidden_states = self.act(hidden_states)
         hidden_states = self.downsample(hidden_states)
@@ -872,6 +1024,7 @@ class AMPBlock(torch.nn.Module):
         kernel_size=3,
         dilation=(1, 3, 5),
         causal_type='1',
+        fused_activations=False,
     ):
         super().__init__()
 
@@ -960,7 +1113,10 @@ class AMPBlock(torch.nn.Module):
         self.num_layers = len(self.convs1) + len(self.convs2)  # total number of conv layers
 
         self.activations = nn.ModuleList(
-            [TorchActivation1d(activation=SnakeBeta(channels)) for _ in range(self.num_layers)]
+            [
+                TorchActivation1d(activation=SnakeBeta(channels), fused=fused_activations)
+                for _ in range(self.num_layers)
+            ]
         )
 
         if causal_type == '2':
@@ -971,7 +1127,7 @@ class AMPBlock(torch.nn.Module):
                                 stride=1,
                                 padding=self._get_padding(kernel_size, 1),
                             )
-            self.pre_act = TorchActivation1d(activation=SnakeBeta(channels))
+            self.pre_act = TorchActivation1d(activation=SnakeBeta(channels), fused=fused_activations)
         else:
             self.pre_conv = nn.Identity()
             self.pre_act = nn.Identity()
@@ -1022,14 +1178,21 @@ class Qwen3TTSTokenizerV1DecoderBigVGANModel(Qwen3TTSTokenizerV1DecoderPreTraine
 
         self.resblocks = nn.ModuleList(
             [
-                AMPBlock(config.upsample_initial_channel // (2 ** (layer_idx + 1)), kernel_size, dilation, '1' if layer_idx > 1 else '2')
+                AMPBlock(
+                    config.upsample_initial_channel // (2 ** (layer_idx + 1)),
+                    kernel_size,
+                    dilation,
+                    '1' if layer_idx > 1 else '2',
+                    fused_activations=config.fused_activations,
+                )
                 for layer_idx in range(self.num_upsample_layers)
                 for kernel_size, dilation in zip(config.resblock_kernel_sizes, config.resblock_dilation_sizes)
             ]
         )
 
         self.activation_post = TorchActivation1d(
-            activation=SnakeBeta(config.upsample_initial_channel // (2**self.num_upsample_layers))
+            activation=SnakeBeta(config.upsample_initial_channel // (2**self.num_upsample_layers)),
+            fused=config.fused_activations,
         )
         self.conv_post = nn.Conv1d(
             config.upsample_initial_channel // (2**self.num_upsample_layers), 1, 7, 1, padding=3, bias=False
@@ -1067,6 +1230,56 @@ class Qwen3TTSTokenizerV1DecoderBigVGANModel(Qwen3TTSTokenizerV1DecoderPreTraine
         return torch.clamp(output_waveform, min=-1.0, max=1.0).squeeze(1)
 
 
+def _euler_solver(velocity, values, time_grid):
+    for t0, t1 in zip(time_grid[:-1], time_grid[1:]):
+        values = values + velocity(t0, values) * (t1 - t0)
+    return values
+
+
+def _midpoint_solver(velocity, values, time_grid):
+    for t0, t1 in zip(time_grid[:-1], time_grid[1:]):
+        dt = t1 - t0
+        midpoint = values + velocity(t0, values) * (dt / 2)
+        values = values + velocity(t0 + dt / 2, midpoint) * dt
+    return values
+
+
+def _heun_solver(velocity, values, time_grid):
+    for t0, t1 in zip(time_grid[:-1], time_grid[1:]):
+        dt = t1 - t0
+        velocity_start = velocity(t0, values)
+        velocity_end = velocity(t1, values + velocity_start * dt)
+        values = values + (velocity_start + velocity_end) * (dt / 2)
+    return values
+
+
+def _multistep_solver(velocity, values, time_grid):
+    # second-order Adams-Bashforth on the (non-uniform) grid, the flow-matching form of DPM-Solver++(2M):
+    # one evaluation per step, the first step is Euler
+    previous = None
+    for t0, t1 in zip(time_grid[:-1], time_grid[1:]):
+        dt = t1 - t0
+        current = velocity(t0, values)
+        if previous is None:
+            values = values + current * dt
+        else:
+            previous_velocity, previous_dt = previous
+            ratio = dt / (2 * previous_dt)
+            values = values + ((1 + ratio) * current - ratio * previous_velocity) * dt
+        previous = (current, dt)
+    return values
+
+
+# ODE solvers of `DiTModel.sample`, called as `solver(velocity, initial_values, time_grid)`. Evaluations per step of
+# the grid: euler 1, midpoint 2, heun 2, multistep 1.
+DIT_ODE_SOLVERS = {
+    "euler": _euler_solver,
+    "midpoint": _midpoint_solver,
+    "heun": _heun_solver,
+    "multistep": _multistep_solver,
+}
+
+
 @auto_docstring
 class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedModel):
     config: Qwen3TTSTokenizerV1DecoderDiTConfig
@@ -1101,38 +1314,47 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
         self.norm_out = AdaLayerNormZero_Final(config.hidden_size)  # final modulation
         self.proj_out = nn.Linear(config.hidden_size, config.mel_dim)
 
-    def _create_block_diff(self, hidden_states):
-        batch, seq_len = hidden_states.shape[0], hidden_states.shape[1]
-        block_indices = torch.arange(seq_len, device=hidden_states.device) // self.block_size  # [seq_length]
-
-        block_i = block_indices.unsqueeze(1)  # [seq_length, 1]
-        block_j = block_indices.unsqueeze(0)  # [1, seq_length]
-        block_diff = block_j - block_i  # (n, n)
-
-        return block_diff.expand(batch, self.num_attention_heads, seq_len, seq_len)
+    def create_block_masks(self, seq_len, device):
+        """
+        Boolean attention masks of the transformer blocks for a sequence of `seq_len` frames, one per distinct
+        `(look_backward_block, look_ahead_block)` pair, of shape `(1, 1, seq_len, seq_len)`.
 
-    def forward(
+        They only depend on the length, so `sample` builds them once and every layer and ODE step shares them.
+        Returns `None` with `config.block_local_attention`, which needs no mask.
+        """
+        if self.config.block_local_attention:
+            return None
+        block_indices = torch.arange(seq_len, device=device) // self.block_size  # [seq_length]
+        block_diff = block_indices.unsqueeze(0) - block_indices.unsqueeze(1)  # (n, n)
+
+        block_masks = {}
+        for block in self.transformer_blocks:
+            look_backward, look_ahead = block.look_backward_block, block.look_ahead_block
+            if (look_backward, look_ahead) not in block_masks:
+                mask = (block_diff >= -look_backward) & (block_diff <= look_ahead)
+                block_masks[(look_backward, look_ahead)] = mask[None, None]
+        return block_masks
+
+    def embed_conditions(
         self,
-        hidden_states,
         condition_vector,
         speaker_embedding,
         quantized_code,
-        time_step,
         drop_audio_conditioning=False,
         drop_code=False,
         apply_cfg=True,
     ):
-        batch_size = hidden_states.shape[0] * 2
-        if time_step.ndim == 0:
-            time_step = time_step.repeat(batch_size)
+        """
+        Input embedding of everything that stays fixed while sampling: the ECAPA encoding of the reference mel, the
+        code embeddings and the speaker embedding, already through their part of the input projection.
 
-        # Compute embeddings
-        time_embedding = self.time_embed(time_step)
+        `sample` computes it once and passes it to every ODE step as `condition_embedding`. With `apply_cfg`, the
+        conditional rows are followed by the unconditional ones, so `condition_embedding[:batch_size]` is the
+        conditional embedding alone.
+        """
         text_embedding = self.text_embed(quantized_code, drop_code=False if apply_cfg else drop_code)
         text_embedding_unconditioned = self.text_embed(quantized_code, drop_code=True) if apply_cfg else None
-
-        hidden_states = self.input_embed(
-            hidden_states,
+        return self.input_embed.embed_conditions(
             speaker_embedding,
             condition_vector,
             text_embedding,
@@ -1141,9 +1363,48 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
             apply_cfg=apply_cfg,
         )
 
+    def forward(
+        self,
+        hidden_states,
+        condition_vector=None,
+        speaker_embedding=None,
+        quantized_code=None,
+        time_step=None,
+        drop_audio_conditioning=False,
+        drop_code=False,
+        apply_cfg=True,
+        condition_embedding=None,
+        block_masks=None,
+    ):
+        """
+        Predict the flow velocity at `time_step`.
+
+        The conditions (`condition_vector`, `speaker_embedding`, `quantized_code` and the drop flags) can be replaced by
+        a `condition_embedding` from `embed_conditions` computed with the same `apply_cfg`. `block_masks` from
+        `create_block_masks` are built from the sequence length if not given.
+        """
+        batch_size = hidden_states.shape[0] * 2 if apply_cfg else hidden_states.shape[0]
+        if time_step.ndim == 0:
+            time_step = time_step.repeat(batch_size)
+
+        # Compute embeddings
+        time_embedding = self.time_embed(time_step)
+        if condition_embedding is None:
+            condition_embedding = self.embed_conditions(
+                condition_vector,
+                speaker_embedding,
+                quantized_code,
+                drop_audio_conditioning=drop_audio_conditioning,
+                drop_code=drop_code,
+                apply_cfg=apply_cfg,
+            )
+
+        hidden_states = self.input_embed(hidden_states, apply_cfg=apply_cfg, condition_embedding=condition_embedding)
+
         # Compute positional encodings
         position_embeddings = self.rotary_embed(hidden_states)
-        blockwise_difference = self._create_block_diff(hidden_states)
+        if block_masks is None:
+            block_masks = self.create_block_masks(hidden_states.shape[1], hidden_states.device)
 
         # Transformer blocks
         for transformer_block in self.transformer_blocks:
@@ -1151,7 +1412,7 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
                 hidden_states,
                 time_embedding,
                 position_embeddings=position_embeddings,
-                block_diff=blockwise_difference,
+                block_masks=block_masks,
             )
 
         hidden_states = self.norm_out(hidden_states, time_embedding)
@@ -1177,36 +1438,99 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
         num_steps=10,
         guidance_scale=0.5,
         sway_coefficient=-1.0,
+        velocity_fn=None,
+        generator=None,
+        solver="euler",
+        guidance_interval=None,
+        guidance_reuse_steps=0,
+        noise=None,
     ):
-        noise_initialization = torch.randn([quantized_code.shape[0], 30000, self.mel_dim], dtype=reference_mel_spectrogram.dtype)
+        """
+        Generate a mel spectrogram by integrating the flow ODE from noise.
+
+        Classifier-free guidance doubles the batch of a DiT evaluation. `guidance_interval` and `guidance_reuse_steps`
+        trade some of it for single-batch conditional evaluations.
+
+        Args:
+            num_steps (`int`, *optional*, defaults to 10):
+                Number of points of the time grid, i.e. `num_steps - 1` solver steps.
+            solver (`str`, *optional*, defaults to `"euler"`):
+                One of `DIT_ODE_SOLVERS`. `"midpoint"` and `"heun"` are second order with two DiT evaluations per
+                step, `"multistep"` is second order with one evaluation per step.
+            generator (`torch.Generator` or `List[torch.Generator]`, *optional*):
+                Generator(s) of the initial noise, on the device of `quantized_code`. With one generator per sample,
+                the noise of each sample does not depend on the other samples of the batch. The global RNG is used
+                if unset.
+            noise (`torch.Tensor` of shape `(batch_size, codes_length * repeats, mel_dim)`, *optional*):
+                Initial state of the ODE, drawn from `generator` if unset.
+            guidance_interval (`Tuple[float, float]`, *optional*):
+                Time window `(start, end)` of the ODE (0 is noise, 1 is the mel spectrogram) where guidance is applied.
+                Evaluations outside of it are conditional only. Guidance is applied on the whole trajectory if unset.
+            guidance_reuse_steps (`int`, *optional*, defaults to 0):
+                Number of evaluations after a guided one that run conditional only and reuse its guidance term
+                `(conditional - unconditional) * guidance_scale`.
+            velocity_fn (`Callable`, *optional*):
+                Replacement for the DiT forward pass (e.g. an ONNX Runtime session). It is called as
+                `velocity_fn(hidden_states, condition_embedding, time_step, apply_cfg)` and returns the same as the DiT
+                forward with these arguments: the conditional and unconditional predictions concatenated along the
+                batch with `apply_cfg`, the conditional prediction otherwise.
+        """
+        if solver not in DIT_ODE_SOLVERS:
+            raise ValueError(f"Unknown solver: {solver}, expected one of {list(DIT_ODE_SOLVERS)}.")
+        batch_size = quantized_code.shape[0]
         maximum_duration = quantized_code.shape[1] * self.repeats
-        initial_state = noise_initialization[:, :maximum_duration].to(quantized_code.device)
+        noise_kwargs = {"dtype": reference_mel_spectrogram.dtype, "device": quantized_code.device}
+        if noise is not None:
+            initial_state = noise.to(**noise_kwargs)
+        elif isinstance(generator, (list, tuple)):
+            if len(generator) != batch_size:
+                raise ValueError(f"Got {len(generator)} generators for a batch of {batch_size}.")
+            initial_state = torch.cat(
+                [torch.randn(1, maximum_duration, self.mel_dim, generator=g, **noise_kwargs) for g in generator]
+            )
+        else:
+            initial_state = torch.randn(
+                batch_size, maximum_duration, self.mel_dim, generator=generator, **noise_kwargs
+            )
         conditioning_vector = conditioning_vector.unsqueeze(1).repeat(1, maximum_duration, 1)
 
-        def ode_function(time_step, hidden_states):
-            if guidance_scale < 1e-5:
-                prediction = self(
-                    hidden_states=hidden_states,
-                    speaker_embedding=conditioning_vector,
-                    condition_vector=reference_mel_spectrogram,
-                    quantized_code=quantized_code,
-                    time_step=time_step,
-                    drop_audio_conditioning=False,
-                    drop_code=False,
-                )
-                return prediction
-
-            model_output = self(
+        # the conditions do not change between ODE steps: encode them once. With guidance, the conditional rows
+        # come first, so the first `batch_size` rows are the embedding of the conditional-only evaluations.
+        apply_cfg = guidance_scale >= 1e-5
+        condition_embedding = self.embed_conditions(
+            reference_mel_spectrogram, conditioning_vector, quantized_code, apply_cfg=apply_cfg
+        )
+        block_masks = self.create_block_masks(maximum_duration, quantized_code.device)
+        guidance_start, guidance_end = (0.0, 1.0) if guidance_interval is None else guidance_interval
+        # guidance term of the last guided evaluation and the number of times it was reused since
+        guidance_cache = {"guidance": None, "reused": 0}
+
+        def velocity(time_step, hidden_states, guided):
+            embedding = condition_embedding if guided else condition_embedding[:batch_size]
+            if velocity_fn is not None:
+                return velocity_fn(hidden_states, embedding, time_step, guided)
+            return self(
                 hidden_states=hidden_states,
-                quantized_code=quantized_code,
-                speaker_embedding=conditioning_vector,
-                condition_vector=reference_mel_spectrogram,
                 time_step=time_step,
-                apply_cfg=True,
+                apply_cfg=guided,
+                condition_embedding=embedding,
+                block_masks=block_masks,
             )
+
+        def ode_function(time_step, hidden_states):
+            if not apply_cfg or not guidance_start <= float(time_step) <= guidance_end:
+                return velocity(time_step, hidden_states, False)
+
+            if guidance_cache["guidance"] is not None and guidance_cache["reused"] < guidance_reuse_steps:
+                guidance_cache["reused"] += 1
+                return velocity(time_step, hidden_states, False) + guidance_cache["guidance"]
+
+            model_output = velocity(time_step, hidden_states, True)
             guided_prediction, null_prediction = torch.chunk(model_output, 2, dim=0)
+            guidance_cache["guidance"] = (guided_prediction - null_prediction) * guidance_scale
+            guidance_cache["reused"] = 0
 
-            return guided_prediction + (guided_prediction - null_prediction) * guidance_scale
+            return guided_prediction + guidance_cache["guidance"]
 
         initial_time = 0
         time_embedding = torch.linspace(
@@ -1216,11 +1540,7 @@ class Qwen3TTSTokenizerV1DecoderDiTModel(Qwen3TTSTokenizerV1DecoderPreTrainedMod
         if sway_coefficient is not None:
             time_embedding += sway_coefficient * (torch.cos(torch.pi / 2 * time_embedding) - 1 + time_embedding)
 
-        values = initial_state.clone()
-        for t0, t1 in zip(time_embedding[:-1], time_embedding[1:]):
-            dt = t1 - t0
-            vt = ode_function(t0, values)
-            values = values + vt * dt
+        values = DIT_ODE_SOLVERS[solver](ode_function, initial_state, time_embedding)
 
         generated_mel_spectrogram = values.permute(0, 2, 1)
         return generated_mel_spectrogram
@@ -1261,9 +1581,13 @@ class Qwen3TTSTokenizerV1Decoder(Qwen3TTSTokenizerV1DecoderPreTrainedModel):
         num_steps=10,
         guidance_scale=0.5,
         sway_coefficient=-1.0,
+        generator=None,
+        solver="euler",
+        guidance_interval=None,
+        guidance_reuse_steps=0,
         **kwargs,
     ):
-        """Generates a waveform from input code and conditioning parameters."""
+        """Generates a waveform from input code and conditioning parameters, see `DiTModel.sample` for the options."""
 
         mel_spectrogram = self.dit.sample(
             conditioning,
@@ -1272,6 +1596,10 @@ class Qwen3TTSTokenizerV1Decoder(Qwen3TTSTokenizerV1DecoderPreTrainedModel):
             num_steps=num_steps,
             guidance_scale=guidance_scale,
             sway_coefficient=sway_coefficient,
+            generator=generator,
+            solver=solver,
+            guidance_interval=guidance_interval,
+            guidance_reuse_steps=guidance_reuse_steps,
         )
 
         waveform = self.bigvgan(mel_spectrogram)
@@ -1279,6 +1607,182 @@ class Qwen3TTSTokenizerV1Decoder(Qwen3TTSTokenizerV1DecoderPreTrainedModel):
         return waveform
 
 
+class Qwen3TTSTokenizerV1DecoderStream:
+    """
+    Block-wise streaming decode with a `Qwen3TTSTokenizerV1Decoder`.
+
+    The DiT attends within blocks of `block_size` mel frames, and a few layers also see the previous or the next block.
+    Codes are pushed as they become available. Once the `right_context_blocks` blocks after a block are known, the flow
+    ODE is integrated over that block with its `left_context_blocks` previous blocks and the right context only, and
+    the mel frames of the block are final. The noise of every frame is drawn once, so overlapping windows start from
+    the same state.
+
+    Finished mel frames are vocoded by BigVGAN with `vocoder_left_context` frames of already vocoded mel before them and
+    `vocoder_right_context` frames held back after them. BigVGAN mixes causal and non-causal convolutions, so this
+    overlap is its state: with contexts that cover its receptive field (48 frames back and 12 ahead for the released
+    configuration, covered by the defaults) the samples are the same as vocoding the whole streamed mel spectrogram at
+    once.
+
+    The mel spectrogram itself approximates the offline decode, since over the ODE steps information travels further
+    than the context blocks. More context brings it closer at a higher cost per block.
+
+    Example:
+        stream = Qwen3TTSTokenizerV1DecoderStream(decoder, xvectors, ref_mels)
+        for codes in code_chunks:  # (batch_size, codes_length)
+            wav_chunk = stream.push(codes)
+        wav_chunk = stream.flush()
+    """
+
+    def __init__(
+        self,
+        decoder: "Qwen3TTSTokenizerV1Decoder",
+        conditioning: torch.Tensor,
+        reference_mel: torch.Tensor,
+        left_context_blocks: Optional[int] = None,
+        right_context_blocks: Optional[int] = None,
+        vocoder_left_context: int = 64,
+        vocoder_right_context: int = 16,
+        generator: Optional[torch.Generator] = None,
+        **sample_kwargs,
+    ):
+        """
+        Args:
+            decoder (`Qwen3TTSTokenizerV1Decoder`):
+                The 25Hz decoder.
+            conditioning (`torch.FloatTensor` of shape `(batch_size, xvector_dim)`):
+                X-vectors, as `xvectors` of `Qwen3TTSTokenizerV1Model.decode`.
+            reference_mel (`torch.FloatTensor` of shape `(batch_size, mel_length, mel_dim)`):
+                Reference mel spectrograms, as `ref_mels` of `Qwen3TTSTokenizerV1Model.decode`.
+            left_context_blocks (`int`, *optional*):
+                DiT blocks of left context, defaults to the number of look-backward layers.
+            right_context_blocks (`int`, *optional*):
+                DiT blocks of right context (the latency of the stream), defaults to the number of look-ahead layers.
+            vocoder_left_context (`int`, *optional*, defaults to 64):
+                Mel frames of left context of the vocoder.
+            vocoder_right_context (`int`, *optional*, defaults to 16):
+                Mel frames of right context of the vocoder, held back until more frames or `flush`.
+            generator (`torch.Generator`, *optional*):
+                Generator of the DiT noise, on the device of the codes.
+            sample_kwargs:
+                Options of `DiTModel.sample` (`num_steps`, `guidance_scale`, `solver`, ...).
+        """
+        dit_config = decoder.dit.config
+        if dit_config.block_size % dit_config.repeats != 0:
+            raise ValueError(
+                f"Streaming needs DiT blocks of whole codes, got block_size={dit_config.block_size} and "
+                f"repeats={dit_config.repeats}."
+            )
+        self.decoder = decoder
+        self.conditioning = conditioning
+        self.reference_mel = reference_mel
+        self.left_context_blocks = (
+            len(dit_config.look_backward_layers) if left_context_blocks is None else left_context_blocks
+        )
+        self.right_context_blocks = (
+            len(dit_config.look_ahead_layers) if right_context_blocks is None else right_context_blocks
+        )
+        self.vocoder_left_context = vocoder_left_context
+        self.vocoder_right_context = vocoder_right_context
+        self.generator = generator
+        self.sample_kwargs = sample_kwargs
+        self.block_size = dit_config.block_size
+        self.repeats = dit_config.repeats
+        self.total_upsample = int(np.prod(decoder.bigvgan.config.upsample_rates))
+        self.reset()
+
+    def reset(self):
+        """Forget all pushed codes and start a new sequence."""
+        self.codes = None  # pushed codes from mel frame `frames_start` on
+        self.noise = None  # DiT noise of the same frames
+        self.frames_start = 0
+        self.num_frames = 0  # mel frames of all pushed codes
+        self.num_mel_frames = 0  # mel frames finished by the DiT
+        self.mel = None  # finished mel frames from `mel_start` on: vocoder left context and frames to vocode
+        self.mel_start = 0
+        self.num_vocoded_frames = 0
+
+    @torch.no_grad()
+    def push(self, codes: torch.Tensor) -> torch.Tensor:
+        """
+        Decode the next codes of the sequence.
+
+        Args:
+            codes (`torch.LongTensor` of shape `(batch_size, codes_length)`):
+                New codes; the batch size must stay the same for the whole sequence.
+
+        Returns:
+            `torch.FloatTensor` of shape `(batch_size, num_samples)`: the samples finished by these codes, possibly
+            none.
+        """
+        batch_size, num_frames = codes.shape[0], codes.shape[1] * self.repeats
+        noise = torch.randn(
+            batch_size,
+            num_frames,
+            self.decoder.dit.mel_dim,
+            generator=self.generator,
+            dtype=self.reference_mel.dtype,
+            device=codes.device,
+        )
+        self.codes = codes if self.codes is None else torch.cat([self.codes, codes], dim=1)
+        self.noise = noise if self.noise is None else torch.cat([self.noise, noise], dim=1)
+        self.num_frames += num_frames
+        self._decode_mel(self.num_frames // self.block_size - self.right_context_blocks)
+        return self._vocode(self.num_mel_frames - self.vocoder_right_context)
+
+    @torch.no_grad()
+    def flush(self) -> torch.Tensor:
+        """
+        Decode everything still held back as right context, at the end of the sequence.
+
+        Returns:
+            `torch.FloatTensor` of shape `(batch_size, num_samples)`: the remaining samples.
+        """
+        if self.codes is None:
+            raise ValueError("Nothing was pushed to the stream.")
+        self._decode_mel(-(-self.num_frames // self.block_size))
+        return self._vocode(self.num_mel_frames)
+
+    def _decode_mel(self, end_block: int):
+        start_block = self.num_mel_frames // self.block_size
+        if end_block <= start_block:
+            return
+        # windows start on a block boundary, so that their blocks are the ones of the whole sequence
+        window_start = max(start_block - self.left_context_blocks, 0) * self.block_size
+        window_end = min((end_block + self.right_context_blocks) * self.block_size, self.num_frames)
+        offset = window_start - self.frames_start
+        mel = self.decoder.dit.sample(
+            self.conditioning,
+            self.reference_mel,
+            self.codes[:, offset // self.repeats : (window_end - self.frames_start) // self.repeats],
+            noise=self.noise[:, offset : window_end - self.frames_start],
+            **self.sample_kwargs,
+        )
+        end_frame = min(end_block * self.block_size, self.num_frames)
+        mel = mel[..., self.num_mel_frames - window_start : end_frame - window_start]
+        self.num_mel_frames = end_frame
+        self.mel = mel if self.mel is None else torch.cat([self.mel, mel], dim=-1)
+
+        # drop what no later window will see
+        frames_start = max(end_block - self.left_context_blocks, 0) * self.block_size
+        self.codes = self.codes[:, (frames_start - self.frames_start) // self.repeats :]
+        self.noise = self.noise[:, frames_start - self.frames_start :]
+        self.frames_start = frames_start
+
+    def _vocode(self, end_frame: int) -> torch.Tensor:
+        if end_frame <= self.num_vocoded_frames:
+            batch_size = self.conditioning.shape[0]
+            return self.conditioning.new_zeros(batch_size, 0)
+        wav = self.decoder.bigvgan(self.mel)
+        start, end = self.num_vocoded_frames - self.mel_start, end_frame - self.mel_start
+        wav = wav[..., start * self.total_upsample : end * self.total_upsample]
+        self.num_vocoded_frames = end_frame
+
+        mel_start = max(end_frame - self.vocoder_left_context, self.mel_start)
+        self.mel = self.mel[..., mel_start - self.mel_start :]
+        self.mel_start = mel_start
+        return wav
+
+
 class Qwen3TTSTokenizerV1Encoder(Qwen3TTSTokenizerV1EncoderPreTrainedModel):
     config: Qwen3TTSTokenizerV1EncoderConfig
     def __init__(self, config: Qwen3TTSTokenizerV1EncoderConfig):
@@ -1301,7 +1805,14 @@ class Qwen3TTSTokenizerV1Encoder(Qwen3TTSTokenizerV1EncoderPreTrainedModel):
             audio_vq_codebook_dim=config.audio_vq_codebook_dim,
             audio_vq_pe=config.audio_vq_pe,
             audio_vq_ds_rate=config.audio_vq_ds_rate,
+            prune_after_vq=config.prune_after_vq,
         )
+        if config.prune_after_vq:
+            # checkpoint weights of the pruned layers and heads are skipped without a warning
+            pruned_layers = "|".join(str(layer_idx) for layer_idx in range(config.audio_vq_layers, config.n_layer))
+            self._keys_to_ignore_on_load_unexpected = [r"tokenizer\.(ln_post|proj|audio_bos_eos_token)\."]
+            if pruned_layers:
+                self._keys_to_ignore_on_load_unexpected.append(rf"tokenizer\.blocks\.({pruned_layers})\.")
 
         self.padding = True
         self.audio_vq_ds_rate = self.tokenizer.audio_vq_ds_rate
@@ -1370,6 +1881,7 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
 
         self.encoder = Qwen3TTSTokenizerV1Encoder._from_config(self.config.encoder_config)
         self.decoder = Qwen3TTSTokenizerV1Decoder._from_config(self.config.decoder_config)
+        self._keys_to_ignore_on_load_unexpected = self.encoder._keys_to_ignore_on_load_unexpected
 
         self.encoder_xvector_extractor = None
 
@@ -1490,6 +2002,11 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
         xvectors: torch.Tensor,
         ref_mels: torch.Tensor,
         return_dict: Optional[bool] = None,
+        generator: Optional[Union[torch.Generator, list[torch.Generator]]] = None,
+        num_steps: int = 10,
+        solver: str = "euler",
+        guidance_interval: Optional[tuple[float, float]] = None,
+        guidance_reuse_steps: int = 0,
     ) -> Union[tuple[torch.Tensor, torch.Tensor], Qwen3TTSTokenizerV1DecoderOutput]:
         """
         Decodes the given frames into an output audio waveform.
@@ -1506,13 +2023,28 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
                 Reference mel spectrogram computed using `model.encode`.
             return_dict (`bool`, *optional*):
                 Whether or not to return a [`~utils.ModelOutput`] instead of a plain tuple.
+            generator (`torch.Generator` or `List[torch.Generator]`, *optional*):
+                Generator(s) of the DiT initial noise, one for the batch or one per sample, on the model device.
+            num_steps (`int`, *optional*, defaults to 10):
+                Points of the DiT ODE time grid.
+            solver (`str`, *optional*, defaults to `"euler"`):
+                DiT ODE solver, one of `"euler"`, `"midpoint"`, `"heun"` and `"multistep"`.
+            guidance_interval (`Tuple[float, float]`, *optional*):
+                ODE time window where classifier-free guidance is applied, everywhere if unset.
+            guidance_reuse_steps (`int`, *optional*, defaults to 0):
+                DiT evaluations that reuse the guidance term of the previous guided one instead of recomputing it.
 
         """
         return_dict = return_dict if return_dict is not None else self.config.return_dict
 
         audio_values = self.decoder(code=audio_codes,
                                     reference_mel=ref_mels,
-                                    conditioning=xvectors)
+                                    conditioning=xvectors,
+                                    generator=generator,
+                                    num_steps=num_steps,
+                                    solver=solver,
+                                    guidance_interval=guidance_interval,
+                                    guidance_reuse_steps=guidance_reuse_steps)
         
         audio_lengths = (audio_codes > 0).sum(1) * self.decode_upsample_rate
         audio_values = [a[:l] for a, l in zip(audio_values, audio_lengths)]
@@ -1525,4 +2057,4 @@ class Qwen3TTSTokenizerV1Model(Qwen3TTSTokenizerV1PreTrainedModel):
         return Qwen3TTSTokenizerV1DecoderOutput(audio_values)
 
 
-__all__ = ["Qwen3TTSTokenizerV1Model", "Qwen3TTSTokenizerV1PreTrainedModel"]
+__all__ = ["Qwen3TTSTokenizerV1Model", "Qwen3TTSTokenizerV1PreTrainedModel", "Qwen3TTSTokenizerV1DecoderStream"]
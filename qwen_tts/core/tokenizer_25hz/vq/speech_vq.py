@@ -194,8 +194,19 @@ class WhisperEncoderVQ(WhisperEncoder):
             audio_vq_threshold_ema_dead_code: float = 0.1,
             audio_vq_codebook_dim: int = None,
             audio_vq_ds_rate: int = None,
+            prune_after_vq: bool = False,
     ):
-        super().__init__(n_mels, n_ctx, n_state, n_head, n_layer, n_window, output_dim, grad_checkpointing, enable_mp, audio_sequence_parallel)
+        # the forward pass with `return_indices` stops at the VQ layer, the later blocks are only built if needed
+        super().__init__(
+            n_mels, n_ctx, n_state, n_head, audio_vq_layers if prune_after_vq else n_layer, n_window, output_dim,
+            grad_checkpointing, enable_mp, audio_sequence_parallel,
+        )
+        self.prune_after_vq = prune_after_vq
+        if prune_after_vq:
+            self.avg_pooler = None
+            self.ln_post = None
+            self.proj = None
+            self.audio_bos_eos_token = None
 
         self.audio_vq_layers = audio_vq_layers
         self.audio_vq_type = audio_vq_type
@@ -291,6 +302,8 @@ class WhisperEncoderVQ(WhisperEncoder):
         x : torch.Tensor, shape = (n_mels, n_ctx)
             the mel spectrogram of the audio
         """
+        if self.prune_after_vq and not return_indices:
+            raise ValueError("The encoder was built with `prune_after_vq`, it can only return the VQ indices.")
 
         aftercnn_x_list = []
         pe_for_vq_list = []
@@ -214,52 +214,66 @@ class MultiHeadAttention(nn.Module):
     def qkv_attention_manual(
         self, q: Tensor, k: Tensor, v: Tensor, cu_seqlens: Tensor
     ):
+        """
+        Attention within each window of the packed sequence with `scaled_dot_product_attention`.
+
+        Windows are mostly exactly `n_window` long: those are viewed as one batch without copies when the whole
+        sequence is made of them, and gathered into one batch otherwise. Only the shorter tail windows are padded.
+        """
         n_ctx, n_state = q.shape
         head_dim = n_state // self.n_head
-        scale = head_dim ** -0.5
 
         q = q.view(n_ctx, self.n_head, head_dim)
         k = k.view(n_ctx, self.n_head, head_dim)
         v = v.view(n_ctx, self.n_head, head_dim)
 
         seqlens = (cu_seqlens[1:] - cu_seqlens[:-1]).tolist()
-        batch_size = len(seqlens)
-        max_seqlen = max(seqlens)
-
-        q_padded = torch.zeros(batch_size, max_seqlen, self.n_head, head_dim, dtype=q.dtype, device=q.device)
-        k_padded = torch.zeros_like(q_padded)
-        v_padded = torch.zeros_like(q_padded)
-
-        for i in range(batch_size):
-            start_idx = cu_seqlens[i]
-            end_idx = cu_seqlens[i+1]
-            seq_len = seqlens[i]
-            q_padded[i, :seq_len] = q[start_idx:end_idx]
-            k_padded[i, :seq_len] = k[start_idx:end_idx]
-            v_padded[i, :seq_len] = v[start_idx:end_idx]
-        
-        q_padded = q_padded.transpose(1, 2)
-        k_padded = k_padded.transpose(1, 2)
-        v_padded = v_padded.transpose(1, 2)
-
-        attn_mask = torch.arange(max_seqlen, device=q.device)[None, :] < torch.tensor(seqlens, device=q.device)[:, None]
-        attn_mask = attn_mask.unsqueeze(1).unsqueeze(2)
-
-        attn_mask = attn_mask.masked_fill(attn_mask == 0, -torch.finfo(q.dtype).max)
-
-        attn_scores = torch.matmul(q_padded, k_padded.transpose(-2, -1)) * scale
-        attn_scores = attn_scores + attn_mask
-        attn_weights = F.softmax(attn_scores, dim=-1)
-
-        context = torch.matmul(attn_weights, v_padded)
-        
-        context = context.transpose(1, 2).contiguous().view(batch_size, max_seqlen, n_state)
-
-        output_packed = torch.cat([context[i, :seqlens[i]] for i in range(batch_size)], dim=0)
-
-        assert output_packed.shape == (n_ctx, n_state)
-        
-        return output_packed
+        window_len = max(seqlens)
+        num_full = seqlens.count(window_len)
+        if num_full == len(seqlens):
+            output = self._window_attention(
+                q.view(num_full, window_len, self.n_head, head_dim),
+                k.view(num_full, window_len, self.n_head, head_dim),
+                v.view(num_full, window_len, self.n_head, head_dim),
+            )
+            return output.reshape(n_ctx, n_state)
+
+        lengths = torch.tensor(seqlens, device=q.device)
+        window_ids = torch.repeat_interleave(lengths)
+        is_full = lengths[window_ids] == window_len
+        output = torch.empty_like(q)
+        if num_full > 0:
+            output[is_full] = self._window_attention(
+                q[is_full].view(num_full, window_len, self.n_head, head_dim),
+                k[is_full].view(num_full, window_len, self.n_head, head_dim),
+                v[is_full].view(num_full, window_len, self.n_head, head_dim),
+            ).flatten(0, 1)
+
+        # ragged windows, padded to the longest of them
+        is_ragged = ~is_full
+        ragged_windows = lengths != window_len
+        ragged_lengths = lengths[ragged_windows]
+        max_ragged_len = max(seqlen for seqlen in seqlens if seqlen != window_len)
+        rows = (ragged_windows.cumsum(0) - 1)[window_ids[is_ragged]]
+        positions = (torch.arange(n_ctx, device=q.device) - cu_seqlens[window_ids])[is_ragged]
+
+        def pad(x):
+            padded = x.new_zeros(len(ragged_lengths), max_ragged_len, self.n_head, head_dim)
+            padded[rows, positions] = x[is_ragged]
+            return padded
+
+        attn_mask = torch.arange(max_ragged_len, device=q.device) < ragged_lengths[:, None]
+        context = self._window_attention(pad(q), pad(k), pad(v), attn_mask=attn_mask[:, None, None, :])
+        output[is_ragged] = context[rows, positions]
+        return output.view(n_ctx, n_state)
+
+    @staticmethod
+    def _window_attention(q: Tensor, k: Tensor, v: Tensor, attn_mask: Optional[Tensor] = None):
+        # (num_windows, window_len, n_head, head_dim) in and out
+        context = F.scaled_dot_product_attention(
+            q.transpose(1, 2), k.transpose(1, 2), v.transpose(1, 2), attn_mask=attn_mask
+        )
+        return context.transpose(1, 2)
 
 
 class ResidualAttentionBlock(nn.Module):
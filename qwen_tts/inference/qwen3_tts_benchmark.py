@@ -0,0 +1,191 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Quality / speed benchmarks of the speech tokenizer decoder options.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import torch
+from torch.nn.utils.rnn import pad_sequence
+
+from ..core.tokenizer_25hz.modeling_qwen3_tts_tokenizer_v1 import DIT_ODE_SOLVERS
+
+# (solver, num_steps) pairs of 4 to 6 DiT evaluations
+DEFAULT_DIT_SOLVER_SETTINGS = [
+    ("euler", 5),
+    ("euler", 7),
+    ("midpoint", 3),
+    ("midpoint", 4),
+    ("heun", 3),
+    ("heun", 4),
+    ("multistep", 5),
+    ("multistep", 7),
+]
+
+# `DiTModel.sample` guidance options, applied on top of the default solver
+DEFAULT_DIT_GUIDANCE_SETTINGS = [
+    {"guidance_interval": (0.0, 0.5)},
+    {"guidance_interval": (0.0, 0.3)},
+    {"guidance_interval": (0.2, 0.8)},
+    {"guidance_reuse_steps": 1},
+    {"guidance_reuse_steps": 2},
+    {"guidance_interval": (0.0, 0.5), "guidance_reuse_steps": 1},
+    {"guidance_scale": 0.0},
+]
+
+
+def _batch_25hz_inputs(tokenizer, encoded) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    dtype = tokenizer.model.dtype
+    codes = pad_sequence([torch.as_tensor(c) for c in encoded["audio_codes"]], batch_first=True, padding_value=0)
+    xvectors = torch.stack([torch.as_tensor(x) for x in encoded["xvectors"]])
+    ref_mels = pad_sequence([torch.as_tensor(m) for m in encoded["ref_mels"]], batch_first=True, padding_value=0)
+    return (
+        codes.to(tokenizer.device),
+        xvectors.to(tokenizer.device, dtype),
+        ref_mels.to(tokenizer.device, dtype),
+    )
+
+
+def _benchmark_dit_sampling(
+    tokenizer, encoded, settings: Sequence[Dict[str, Any]], reference: Dict[str, Any], seed: int
+) -> List[Dict[str, Any]]:
+    if tokenizer.get_model_type() != "qwen3_tts_tokenizer_25hz":
+        raise ValueError("DiT sampling options only exist in the 25Hz tokenizer.")
+    for setting in [reference, *settings]:
+        solver = setting.get("solver", "euler")
+        if solver not in DIT_ODE_SOLVERS:
+            raise ValueError(f"Unknown solver: {solver}, expected one of {list(DIT_ODE_SOLVERS)}.")
+
+    dit = tokenizer.model.decoder.dit
+    codes, xvectors, ref_mels = _batch_25hz_inputs(tokenizer, encoded)
+    valid_frames = (codes > 0).repeat_interleave(dit.repeats, dim=1)
+
+    num_calls = 0
+    forward_cost = 0
+
+    def count_call(module, args, kwargs, output):
+        nonlocal num_calls, forward_cost
+        num_calls += 1
+        forward_cost += 2 if kwargs.get("apply_cfg", True) else 1
+
+    def run(setting):
+        nonlocal num_calls, forward_cost
+        num_calls = forward_cost = 0
+        generator = torch.Generator(device=codes.device).manual_seed(seed)
+        if codes.device.type == "cuda":
+            torch.cuda.synchronize(codes.device)
+        start = time.perf_counter()
+        mel = dit.sample(xvectors, ref_mels, codes, generator=generator, **setting)
+        if codes.device.type == "cuda":
+            torch.cuda.synchronize(codes.device)
+        seconds = time.perf_counter() - start
+        return mel.float(), dict(setting, nfe=num_calls, forward_cost=forward_cost, seconds=seconds)
+
+    hook = dit.register_forward_hook(count_call, with_kwargs=True)
+    try:
+        reference_mel, row = run(reference)
+        rows = [dict(row, mel_distance=0.0)]
+        for setting in settings:
+            mel, row = run(setting)
+            distance = (mel - reference_mel).abs().mean(dim=1)[valid_frames].mean().item()
+            rows.append(dict(row, mel_distance=distance))
+    finally:
+        hook.remove()
+    return rows
+
+
+@torch.no_grad()
+def benchmark_dit_solvers(
+    tokenizer,
+    encoded,
+    settings: Optional[Sequence[Tuple[str, int]]] = None,
+    reference: Tuple[str, int] = ("euler", 10),
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Mel quality against the number of DiT evaluations (NFE) of the 25Hz ODE solvers.
+
+    Every setting integrates the flow ODE from the same noise as the reference, and is scored by the mean absolute
+    difference of its mel spectrogram to the reference one over the valid frames. The vocoder is not run: it costs
+    the same for every setting.
+
+    Args:
+        tokenizer (Qwen3TTSTokenizer):
+            Loaded 25Hz tokenizer.
+        encoded:
+            Output of `tokenizer.encode(...)` on representative audio, or a dict with the same lists
+            (`audio_codes`, `xvectors`, `ref_mels`).
+        settings (Optional[Sequence[Tuple[str, int]]]):
+            `(solver, num_steps)` pairs to compare. Defaults to `DEFAULT_DIT_SOLVER_SETTINGS`.
+        reference (Tuple[str, int]):
+            Setting the others are compared with, the default decode.
+        seed (int):
+            Seed of the initial noise.
+
+    Returns:
+        List[Dict[str, Any]]: one row per setting, reference first, with keys `solver`, `num_steps`, `nfe` (DiT
+        forward passes), `forward_cost` (DiT forward passes in single-batch units, a guided one counts twice),
+        `mel_distance` and `seconds`.
+    """
+    settings = DEFAULT_DIT_SOLVER_SETTINGS if settings is None else settings
+    return _benchmark_dit_sampling(
+        tokenizer,
+        encoded,
+        [dict(solver=solver, num_steps=num_steps) for solver, num_steps in settings],
+        dict(solver=reference[0], num_steps=reference[1]),
+        seed,
+    )
+
+
+@torch.no_grad()
+def benchmark_dit_guidance(
+    tokenizer,
+    encoded,
+    settings: Optional[Sequence[Dict[str, Any]]] = None,
+    reference: Optional[Dict[str, Any]] = None,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Mel quality against the DiT forward cost of the guidance options of the 25Hz sampler (`guidance_interval`,
+    `guidance_reuse_steps`, `guidance_scale`).
+
+    Scored like `benchmark_dit_solvers`. Every setting runs on top of the reference keyword arguments (solver,
+    number of steps), so the distances only measure the guidance options. Conditional-only evaluations run half the
+    batch of guided ones, so the cost to compare is `forward_cost` rather than `nfe`.
+
+    Args:
+        tokenizer (Qwen3TTSTokenizer):
+            Loaded 25Hz tokenizer.
+        encoded:
+            Same as `benchmark_dit_solvers`.
+        settings (Optional[Sequence[Dict[str, Any]]]):
+            `DiTModel.sample` keyword arguments to compare, e.g. `{"guidance_interval": (0.0, 0.5)}`. Defaults to
+            `DEFAULT_DIT_GUIDANCE_SETTINGS`.
+        reference (Optional[Dict[str, Any]]):
+            Keyword arguments of the reference, the default decode if unset. Also applied to every setting.
+        seed (int):
+            Seed of the initial noise.
+
+    Returns:
+        List[Dict[str, Any]]: one row per setting, reference first, with the setting's keyword arguments and `nfe`,
+        `forward_cost`, `mel_distance` and `seconds`.
+    """
+    settings = DEFAULT_DIT_GUIDANCE_SETTINGS if settings is None else settings
+    reference = reference or {}
+    settings = [{**reference, **setting} for setting in settings]
+    return _benchmark_dit_sampling(tokenizer, encoded, settings, reference, seed)
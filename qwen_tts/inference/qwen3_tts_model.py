@@ -14,19 +14,28 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import base64
+import hashlib
 import io
+import json
+import os
+import queue
+import threading
 import urllib.request
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import librosa
 import numpy as np
 import soundfile as sf
 import torch
+from safetensors import safe_open
+from safetensors.torch import save_file
 from transformers import AutoConfig, AutoModel, AutoProcessor
 
 from ..core.models import Qwen3TTSConfig, Qwen3TTSForConditionalGeneration, Qwen3TTSProcessor
+from ..core.tokenizer_12hz.modeling_qwen3_tts_tokenizer_v2 import Qwen3TTSTokenizerV2DecoderStream
 
 AudioLike = Union[
     str,                     # wav path, URL, base64
@@ -51,6 +60,211 @@ class VoiceClonePromptItem:
     ref_text: Optional[str] = None
 
 
+VOICE_LIBRARY_FORMAT = "qwen3_tts_voice_library"
+VOICE_LIBRARY_VERSION = 1
+
+
+class VoiceLibrary:
+    """
+    Voice-clone prompts stored in one safetensors file and looked up by voice id.
+
+    File layout:
+      - tensors `<voice_id>/ref_spk_embedding` and, for ICL voices, `<voice_id>/ref_code`;
+      - header metadata `format`, `version` and `voices`, a JSON object mapping each voice id to its
+        `x_vector_only_mode`, `icl_mode` and `ref_text`.
+
+    Opening a library only parses the header. Tensors are memory-mapped and read when a voice is first accessed, so
+    one file can hold thousands of voices.
+
+    Example:
+        VoiceLibrary.save("voices.safetensors", {"alice": item})
+        library = VoiceLibrary("voices.safetensors")
+        wavs, sr = tts.generate_voice_clone(text, voice_clone_prompt=[library["alice"]])
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = safe_open(path, framework="pt")
+        metadata = self._file.metadata() or {}
+        if metadata.get("format") != VOICE_LIBRARY_FORMAT:
+            raise ValueError(f"{path} is not a voice library file.")
+        version = int(metadata.get("version", 0))
+        if version > VOICE_LIBRARY_VERSION:
+            raise ValueError(
+                f"{path} has voice library version {version}, this package reads up to {VOICE_LIBRARY_VERSION}."
+            )
+        self._voices: Dict[str, Dict[str, Any]] = json.loads(metadata["voices"])
+
+    def __len__(self) -> int:
+        return len(self._voices)
+
+    def __contains__(self, voice_id: str) -> bool:
+        return voice_id in self._voices
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._voices)
+
+    def ids(self) -> List[str]:
+        return list(self._voices)
+
+    def __getitem__(self, voice_id: str) -> VoiceClonePromptItem:
+        info = self._voices[voice_id]
+        ref_code = self._file.get_tensor(f"{voice_id}/ref_code") if info["has_ref_code"] else None
+        return VoiceClonePromptItem(
+            ref_code=ref_code,
+            ref_spk_embedding=self._file.get_tensor(f"{voice_id}/ref_spk_embedding"),
+            x_vector_only_mode=info["x_vector_only_mode"],
+            icl_mode=info["icl_mode"],
+            ref_text=info["ref_text"],
+        )
+
+    def get(self, voice_id: str, default: Optional[VoiceClonePromptItem] = None) -> Optional[VoiceClonePromptItem]:
+        return self[voice_id] if voice_id in self._voices else default
+
+    @staticmethod
+    def save(path: str, voices: Dict[str, VoiceClonePromptItem]) -> None:
+        """
+        Write `voices` (voice id -> prompt item) as a new library file, replacing `path` atomically.
+        """
+        tensors: Dict[str, torch.Tensor] = {}
+        index: Dict[str, Dict[str, Any]] = {}
+        for voice_id, item in voices.items():
+            tensors[f"{voice_id}/ref_spk_embedding"] = item.ref_spk_embedding.detach().cpu().contiguous()
+            if item.ref_code is not None:
+                tensors[f"{voice_id}/ref_code"] = item.ref_code.detach().cpu().contiguous()
+            index[voice_id] = dict(
+                has_ref_code=item.ref_code is not None,
+                x_vector_only_mode=bool(item.x_vector_only_mode),
+                icl_mode=bool(item.icl_mode),
+                ref_text=item.ref_text,
+            )
+        metadata = {
+            "format": VOICE_LIBRARY_FORMAT,
+            "version": str(VOICE_LIBRARY_VERSION),
+            "voices": json.dumps(index, ensure_ascii=False),
+        }
+        # write-then-rename so concurrent readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        save_file(tensors, tmp_path, metadata=metadata)
+        os.replace(tmp_path, path)
+
+
+class VoiceClonePromptCache:
+    """
+    Content-addressed cache of `create_voice_clone_prompt` results.
+
+    Entries are keyed by a hash of the decoded reference waveform and its sampling rate, `ref_text` and
+    `x_vector_only_mode`, so the same voice hits the cache whether it arrives as a path, URL, base64 string or array.
+    The key also covers `model_identity` (checkpoint, speech tokenizer type, speaker embedding width): the cached
+    codes and x-vector belong to that model, so a `cache_dir` shared between models never serves another model's
+    entries.
+    Two tiers:
+      - an in-memory LRU of up to `max_entries` items;
+      - optionally `cache_dir`, holding one single-voice `VoiceLibrary` file `<key>.safetensors` per item, which
+        survives restarts and is promoted into the LRU on hit.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        cache_dir: Optional[str] = None,
+        model_identity: Optional[Dict[str, Any]] = None,
+    ):
+        if max_entries < 1:
+            raise ValueError(f"`max_entries` must be >= 1, got {max_entries}")
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.model_identity = dict(model_identity or {})
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._entries: "OrderedDict[str, VoiceClonePromptItem]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, wav: np.ndarray, sr: int, ref_text: Optional[str], x_vector_only_mode: bool) -> str:
+        h = hashlib.sha256()
+        h.update(np.ascontiguousarray(wav, dtype=np.float32).tobytes())
+        h.update(
+            json.dumps([int(sr), ref_text, bool(x_vector_only_mode), self.model_identity], sort_keys=True).encode(
+                "utf-8"
+            )
+        )
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.safetensors")
+
+    def get(self, key: str) -> Optional[VoiceClonePromptItem]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                self._entries.move_to_end(key)
+                return item
+        if self.cache_dir is None or not os.path.exists(self._path(key)):
+            return None
+        item = self._load(key)
+        self._remember(key, item)
+        return item
+
+    def put(self, key: str, item: VoiceClonePromptItem) -> None:
+        self._remember(key, item)
+        if self.cache_dir is not None:
+            self._save(key, item)
+
+    def clear(self) -> None:
+        """Drop the in-memory tier; files in `cache_dir` are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, item: VoiceClonePromptItem) -> None:
+        with self._lock:
+            self._entries[key] = item
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _save(self, key: str, item: VoiceClonePromptItem) -> None:
+        VoiceLibrary.save(self._path(key), {key: item})
+
+    def _load(self, key: str) -> VoiceClonePromptItem:
+        return VoiceLibrary(self._path(key))[key]
+
+
+class _StreamCancelled(Exception):
+    """Raised inside the generation thread when the consumer of a `stream_*` generator goes away."""
+
+
+class _CodecFrameStreamer:
+    """
+    Hands codec frames from the talker generation thread to a `stream_*` generator.
+
+    `Qwen3TTSForConditionalGeneration.generate(..., codec_streamer=...)` calls `put` with every completed
+    `(1, num_code_groups)` frame and `end` once generation stops.
+    """
+
+    def __init__(self, eos_token_id: int):
+        self.eos_token_id = eos_token_id
+        self.frames: "queue.Queue[Optional[torch.Tensor]]" = queue.Queue()
+        self.cancelled = threading.Event()
+        self.error: Optional[BaseException] = None
+        self._ended = False
+
+    def put(self, codec_ids: torch.Tensor) -> None:
+        if self.cancelled.is_set():
+            raise _StreamCancelled()
+        frame = codec_ids[0]
+        if int(frame[0]) == self.eos_token_id:
+            return
+        self.frames.put(frame.detach().clone())
+
+    def end(self) -> None:
+        if not self._ended:
+            self._ended = True
+            self.frames.put(None)
+
+
 class Qwen3TTSModel:
     """
     A HuggingFace-style wrapper for Qwen3 TTS models (CustomVoice/VoiceDesign/Base) that provides:
@@ -71,6 +285,7 @@ class Qwen3TTSModel:
         self.model = model
         self.processor = processor
         self.generate_defaults = generate_defaults or {}
+        self.voice_clone_prompt_cache: Optional[VoiceClonePromptCache] = None
 
         self.device = getattr(model, "device", None)
         if self.device is None:
@@ -120,6 +335,41 @@ class Qwen3TTSModel:
         generate_defaults = model.generate_config
         return cls(model=model, processor=processor, generate_defaults=generate_defaults)
 
+    def enable_voice_clone_prompt_cache(
+        self,
+        max_entries: int = 128,
+        cache_dir: Optional[str] = None,
+    ) -> VoiceClonePromptCache:
+        """
+        Cache `create_voice_clone_prompt` results (also used by `generate_voice_clone(ref_audio=...)`), so repeated
+        reference audios skip the speech tokenizer encoder and the speaker encoder.
+
+        Entries are tied to this model: the key includes its checkpoint path, speech tokenizer type and speaker
+        embedding width, so other models sharing `cache_dir` get their own entries.
+
+        Args:
+            max_entries (int):
+                Size of the in-memory LRU tier.
+            cache_dir (Optional[str]):
+                Directory of the on-disk tier. If None, only the in-memory tier is used.
+
+        Returns:
+            VoiceClonePromptCache: the installed cache, also available as `self.voice_clone_prompt_cache`.
+        """
+        self.voice_clone_prompt_cache = VoiceClonePromptCache(
+            max_entries=max_entries, cache_dir=cache_dir, model_identity=self._voice_clone_prompt_model_identity()
+        )
+        return self.voice_clone_prompt_cache
+
+    def _voice_clone_prompt_model_identity(self) -> Dict[str, Any]:
+        config = self.model.config
+        speech_tokenizer = getattr(self.model, "speech_tokenizer", None)
+        return {
+            "name_or_path": str(config.name_or_path),
+            "speech_tokenizer": None if speech_tokenizer is None else speech_tokenizer.get_model_type(),
+            "speaker_encoder_dim": config.speaker_encoder_config.enc_dim,
+        }
+
     def _supported_languages_set(self) -> Optional[set]:
         langs = getattr(self.model, "get_supported_languages", None)
         if callable(langs):
@@ -415,11 +665,30 @@ class Qwen3TTSModel:
                 f"Batch size mismatch: ref_audio={len(ref_audio_list)}, ref_text={len(ref_text_list)}, x_vector_only_mode={len(xvec_list)}"
             )
 
+        for i, (rtext, xvec_only) in enumerate(zip(ref_text_list, xvec_list)):
+            if not xvec_only:
+                if rtext is None or rtext == "":
+                    raise ValueError(f"ref_text is required when x_vector_only_mode=False (ICL mode). Bad index={i}")
+
         normalized = self._normalize_audio_inputs(ref_audio_list)
 
+        cache = self.voice_clone_prompt_cache
+        cache_keys: List[Optional[str]] = [None] * len(normalized)
+        items: Dict[int, VoiceClonePromptItem] = {}
+        if cache is not None:
+            for i, ((wav, sr), rtext, xvec_only) in enumerate(zip(normalized, ref_text_list, xvec_list)):
+                cache_keys[i] = cache.key(wav, sr, rtext, xvec_only)
+                item = cache.get(cache_keys[i])
+                if item is not None:
+                    items[i] = item
+        missing = [i for i in range(len(normalized)) if i not in items]
+        if not missing:
+            return [items[i] for i in range(len(normalized))]
+
         ref_wavs_for_code: List[np.ndarray] = []
         ref_sr_for_code: List[int] = []
-        for wav, sr in normalized:
+        for i in missing:
+            wav, sr = normalized[i]
             ref_wavs_for_code.append(wav)
             ref_sr_for_code.append(sr)
 
@@ -428,34 +697,32 @@ class Qwen3TTSModel:
             ref_codes = enc.audio_codes
         else:
             ref_codes = []
-            for wav, sr in normalized:
+            for wav, sr in zip(ref_wavs_for_code, ref_sr_for_code):
                 ref_codes.append(self.model.speech_tokenizer.encode(wav, sr=sr).audio_codes[0])
 
-        items: List[VoiceClonePromptItem] = []
-        for i, ((wav, sr), code, rtext, xvec_only) in enumerate(zip(normalized, ref_codes, ref_text_list, xvec_list)):
-            if not xvec_only:
-                if rtext is None or rtext == "":
-                    raise ValueError(f"ref_text is required when x_vector_only_mode=False (ICL mode). Bad index={i}")
-
+        wavs_for_spk: List[np.ndarray] = []
+        for wav, sr in zip(ref_wavs_for_code, ref_sr_for_code):
             wav_resample = wav
             if sr != self.model.speaker_encoder_sample_rate:
                 wav_resample = librosa.resample(y=wav_resample.astype(np.float32), 
                                            orig_sr=int(sr), 
                                            target_sr=self.model.speaker_encoder_sample_rate)
-
-            spk_emb = self.model.extract_speaker_embedding(audio=wav_resample,
-                                                           sr=self.model.speaker_encoder_sample_rate)
-
-            items.append(
-                VoiceClonePromptItem(
-                    ref_code=None if xvec_only else code,
-                    ref_spk_embedding=spk_emb,
-                    x_vector_only_mode=bool(xvec_only),
-                    icl_mode=bool(not xvec_only),
-                    ref_text=rtext,
-                )
+            wavs_for_spk.append(wav_resample)
+        spk_embs = self.model.extract_speaker_embeddings(audios=wavs_for_spk,
+                                                         sr=self.model.speaker_encoder_sample_rate)
+
+        for i, code, spk_emb in zip(missing, ref_codes, spk_embs):
+            rtext, xvec_only = ref_text_list[i], xvec_list[i]
+            items[i] = VoiceClonePromptItem(
+                ref_code=None if xvec_only else code,
+                ref_spk_embedding=spk_emb,
+                x_vector_only_mode=bool(xvec_only),
+                icl_mode=bool(not xvec_only),
+                ref_text=rtext,
             )
-        return items
+            if cache is not None:
+                cache.put(cache_keys[i], items[i])
+        return [items[i] for i in range(len(normalized))]
 
     def _prompt_items_to_voice_clone_prompt(self, items: List[VoiceClonePromptItem]) -> Dict[str, Any]:
         return dict(
@@ -465,6 +732,85 @@ class Qwen3TTSModel:
             icl_mode=[it.icl_mode for it in items],
         )
 
+    def _prepare_voice_clone_inputs(
+        self,
+        text: Union[str, List[str]],
+        language: Union[str, List[str]],
+        ref_audio: Optional[Union[AudioLike, List[AudioLike]]],
+        ref_text: Optional[Union[str, List[Optional[str]]]],
+        x_vector_only_mode: Union[bool, List[bool]],
+        voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]],
+        non_streaming_mode: bool,
+        api_name: str,
+    ) -> Dict[str, Any]:
+        """
+        Validate voice-clone inputs and build the keyword arguments for `model.generate(...)`.
+
+        Shared by `generate_voice_clone` and `stream_voice_clone`; see `generate_voice_clone` for the arguments.
+        """
+        if self.model.tts_model_type != "base":
+            raise ValueError(
+                f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
+                f"tts_model_size: {self.model.tts_model_size}\n"
+                f"tts_model_type: {self.model.tts_model_type}\n"
+                f"does not support {api_name}, Please check Model Card or Readme for more details."
+            )
+        
+        texts = self._ensure_list(text)
+        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
+        if len(languages) == 1 and len(texts) > 1:
+            languages = languages * len(texts)
+        if len(texts) != len(languages):
+            raise ValueError(f"Batch size mismatch: text={len(texts)}, language={len(languages)}")
+
+        self._validate_languages(languages)
+
+        if isinstance(voice_clone_prompt, VoiceClonePromptItem):
+            voice_clone_prompt = [voice_clone_prompt]
+        if voice_clone_prompt is None:
+            if ref_audio is None:
+                raise ValueError("Either `voice_clone_prompt` or `ref_audio` must be provided.")
+            prompt_items = self.create_voice_clone_prompt(ref_audio=ref_audio, ref_text=ref_text, x_vector_only_mode=x_vector_only_mode)
+            if len(prompt_items) == 1 and len(texts) > 1:
+                prompt_items = prompt_items * len(texts)
+            if len(prompt_items) != len(texts):
+                raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
+            voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
+            ref_texts_for_ids = [it.ref_text for it in prompt_items]
+        else:
+            if isinstance(voice_clone_prompt, list):
+                prompt_items = voice_clone_prompt
+                if len(prompt_items) == 1 and len(texts) > 1:
+                    prompt_items = prompt_items * len(texts)
+                if len(prompt_items) != len(texts):
+                    raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
+                voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
+                ref_texts_for_ids = [it.ref_text for it in prompt_items]
+            else:
+                voice_clone_prompt_dict = voice_clone_prompt
+                ref_texts_for_ids = None
+
+        input_texts = [self._build_assistant_text(t) for t in texts]
+        input_ids = self._tokenize_texts(input_texts)
+
+        ref_ids = None
+        if ref_texts_for_ids is not None:
+            ref_ids = []
+            for i, rt in enumerate(ref_texts_for_ids):
+                if rt is None or rt == "":
+                    ref_ids.append(None)
+                else:
+                    ref_tok = self._tokenize_texts([self._build_ref_text(rt)])[0]
+                    ref_ids.append(ref_tok)
+
+        return dict(
+            input_ids=input_ids,
+            ref_ids=ref_ids,
+            voice_clone_prompt=voice_clone_prompt_dict,
+            languages=languages,
+            non_streaming_mode=non_streaming_mode,
+        )
+
     # voice clone model
     @torch.no_grad()
     def generate_voice_clone(
@@ -476,6 +822,7 @@ class Qwen3TTSModel:
         x_vector_only_mode: Union[bool, List[bool]] = False,
         voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]] = None,
         non_streaming_mode: bool = False,
+        ref_context_size: int = 25,
         **kwargs,
     ) -> Tuple[List[np.ndarray], int]:
         """
@@ -513,6 +860,9 @@ class Qwen3TTSModel:
             non_streaming_mode:
                 Using non-streaming text input, this option currently only simulates streaming text input when set to `false`, 
                 rather than enabling true streaming input or streaming generation.
+            ref_context_size:
+                ICL mode only: number of trailing reference frames given to the speech tokenizer decoder as left
+                context. Only the generated frames are vocoded (12Hz tokenizer).
             do_sample:
                 Whether to use sampling, recommended to be set to `true` for most use cases.
             top_k:
@@ -545,93 +895,124 @@ class Qwen3TTSModel:
             ValueError:
                 If batch sizes mismatch or required prompt inputs are missing.
         """
-        if self.model.tts_model_type != "base":
+        model_inputs = self._prepare_voice_clone_inputs(
+            text=text,
+            language=language,
+            ref_audio=ref_audio,
+            ref_text=ref_text,
+            x_vector_only_mode=x_vector_only_mode,
+            voice_clone_prompt=voice_clone_prompt,
+            non_streaming_mode=non_streaming_mode,
+            api_name="generate_voice_clone",
+        )
+        voice_clone_prompt_dict = model_inputs["voice_clone_prompt"]
+
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
+
+        talker_codes_list, _ = self.model.generate(**model_inputs, **gen_kwargs)
+
+        return self._decode_codes(
+            talker_codes_list, voice_clone_prompt_dict.get("ref_code", None), ref_context_size=ref_context_size
+        )
+
+    def _decode_codes(
+        self,
+        talker_codes_list: List[torch.Tensor],
+        ref_code_list: Optional[List[Optional[torch.Tensor]]] = None,
+        ref_context_size: int = 25,
+    ) -> Tuple[List[np.ndarray], int]:
+        """
+        Vocode generated codec frames.
+
+        In ICL mode reference codes are prepended as decoder left context. With the 12Hz tokenizer only the last
+        `ref_context_size` reference frames are used (as in `chunked_decode`) and exactly their samples are cut off
+        again, so the reference itself is not re-synthesized. Other tokenizers get the whole reference and a
+        proportional cut.
+        """
+        speech_tokenizer = self.model.speech_tokenizer
+        bounded_context = speech_tokenizer.get_model_type() == "qwen3_tts_tokenizer_12hz"
+        if bounded_context and ref_context_size < 0:
+            raise ValueError(f"`ref_context_size` must be >= 0, got {ref_context_size}")
+
+        codes_for_decode = []
+        context_lens = []
+        for i, codes in enumerate(talker_codes_list):
+            ref_code = ref_code_list[i] if ref_code_list is not None else None
+            if ref_code is not None:
+                if bounded_context:
+                    ref_code = ref_code[ref_code.shape[0] - min(ref_context_size, ref_code.shape[0]):]
+                codes_for_decode.append(torch.cat([ref_code.to(codes.device), codes], dim=0))
+                context_lens.append(int(ref_code.shape[0]))
+            else:
+                codes_for_decode.append(codes)
+                context_lens.append(0)
+
+        wavs_all, fs = speech_tokenizer.decode([{"audio_codes": c} for c in codes_for_decode])
+
+        wavs_out: List[np.ndarray] = []
+        for wav, codes, context_len in zip(wavs_all, codes_for_decode, context_lens):
+            if context_len == 0:
+                wavs_out.append(wav)
+            elif bounded_context:
+                # the decoder is causal and trims at the end, so frame k starts at sample k * upsample rate
+                wavs_out.append(wav[context_len * speech_tokenizer.get_decode_upsample_rate():])
+            else:
+                cut = int(context_len / max(int(codes.shape[0]), 1) * wav.shape[0])
+                wavs_out.append(wav[cut:])
+
+        return wavs_out, fs
+
+    def _prepare_voice_design_inputs(
+        self,
+        text: Union[str, List[str]],
+        instruct: Union[str, List[str]],
+        language: Union[str, List[str]],
+        non_streaming_mode: bool,
+        api_name: str,
+    ) -> Dict[str, Any]:
+        """
+        Validate voice-design inputs and build the keyword arguments for `model.generate(...)`.
+
+        Shared by `generate_voice_design` and `stream_voice_design`; see `generate_voice_design` for the arguments.
+        """
+        if self.model.tts_model_type != "voice_design":
             raise ValueError(
                 f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
                 f"tts_model_size: {self.model.tts_model_size}\n"
                 f"tts_model_type: {self.model.tts_model_type}\n"
-                "does not support generate_voice_clone, Please check Model Card or Readme for more details."
+                f"does not support {api_name}, Please check Model Card or Readme for more details."
             )
         
         texts = self._ensure_list(text)
         languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
+        instructs = self._ensure_list(instruct)
+
         if len(languages) == 1 and len(texts) > 1:
             languages = languages * len(texts)
-        if len(texts) != len(languages):
-            raise ValueError(f"Batch size mismatch: text={len(texts)}, language={len(languages)}")
-
-        self._validate_languages(languages)
+        if len(instructs) == 1 and len(texts) > 1:
+            instructs = instructs * len(texts)
 
-        if voice_clone_prompt is None:
-            if ref_audio is None:
-                raise ValueError("Either `voice_clone_prompt` or `ref_audio` must be provided.")
-            prompt_items = self.create_voice_clone_prompt(ref_audio=ref_audio, ref_text=ref_text, x_vector_only_mode=x_vector_only_mode)
-            if len(prompt_items) == 1 and len(texts) > 1:
-                prompt_items = prompt_items * len(texts)
-            if len(prompt_items) != len(texts):
-                raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
-            voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
-            ref_texts_for_ids = [it.ref_text for it in prompt_items]
-        else:
-            if isinstance(voice_clone_prompt, list):
-                prompt_items = voice_clone_prompt
-                if len(prompt_items) == 1 and len(texts) > 1:
-                    prompt_items = prompt_items * len(texts)
-                if len(prompt_items) != len(texts):
-                    raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
-                voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
-                ref_texts_for_ids = [it.ref_text for it in prompt_items]
-            else:
-                voice_clone_prompt_dict = voice_clone_prompt
-                ref_texts_for_ids = None
+        if not (len(texts) == len(languages) == len(instructs)):
+            raise ValueError(f"Batch size mismatch: text={len(texts)}, language={len(languages)}, instruct={len(instructs)}")
 
-        input_texts = [self._build_assistant_text(t) for t in texts]
-        input_ids = self._tokenize_texts(input_texts)
+        self._validate_languages(languages)
 
-        ref_ids = None
-        if ref_texts_for_ids is not None:
-            ref_ids = []
-            for i, rt in enumerate(ref_texts_for_ids):
-                if rt is None or rt == "":
-                    ref_ids.append(None)
-                else:
-                    ref_tok = self._tokenize_texts([self._build_ref_text(rt)])[0]
-                    ref_ids.append(ref_tok)
+        input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
 
-        gen_kwargs = self._merge_generate_kwargs(**kwargs)
+        instruct_ids: List[Optional[torch.Tensor]] = []
+        for ins in instructs:
+            if ins is None or ins == "":
+                instruct_ids.append(None)
+            else:
+                instruct_ids.append(self._tokenize_texts([self._build_instruct_text(ins)])[0])
 
-        talker_codes_list, _ = self.model.generate(
+        return dict(
             input_ids=input_ids,
-            ref_ids=ref_ids,
-            voice_clone_prompt=voice_clone_prompt_dict,
+            instruct_ids=instruct_ids,
             languages=languages,
             non_streaming_mode=non_streaming_mode,
-            **gen_kwargs,
         )
 
-        codes_for_decode = []
-        for i, codes in enumerate(talker_codes_list):
-            ref_code_list = voice_clone_prompt_dict.get("ref_code", None)
-            if ref_code_list is not None and ref_code_list[i] is not None:
-                codes_for_decode.append(torch.cat([ref_code_list[i].to(codes.device), codes], dim=0))
-            else:
-                codes_for_decode.append(codes)
-
-        wavs_all, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in codes_for_decode])
-
-        wavs_out: List[np.ndarray] = []
-        for i, wav in enumerate(wavs_all):
-            ref_code_list = voice_clone_prompt_dict.get("ref_code", None)
-            if ref_code_list is not None and ref_code_list[i] is not None:
-                ref_len = int(ref_code_list[i].shape[0])
-                total_len = int(codes_for_decode[i].shape[0])
-                cut = int(ref_len / max(total_len, 1) * wav.shape[0])
-                wavs_out.append(wav[cut:])
-            else:
-                wavs_out.append(wav)
-
-        return wavs_out, fs
-
     # voice design model
     @torch.no_grad()
     def generate_voice_design(
@@ -683,27 +1064,64 @@ class Qwen3TTSModel:
             Tuple[List[np.ndarray], int]:
                 (wavs, sample_rate)
         """
-        if self.model.tts_model_type != "voice_design":
+        model_inputs = self._prepare_voice_design_inputs(
+            text=text,
+            instruct=instruct,
+            language=language,
+            non_streaming_mode=non_streaming_mode,
+            api_name="generate_voice_design",
+        )
+
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
+
+        talker_codes_list, _ = self.model.generate(**model_inputs, **gen_kwargs)
+
+        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
+        return wavs, fs
+
+    def _prepare_custom_voice_inputs(
+        self,
+        text: Union[str, List[str]],
+        speaker: Union[str, List[str]],
+        language: Union[str, List[str]],
+        instruct: Optional[Union[str, List[str]]],
+        non_streaming_mode: bool,
+        api_name: str,
+    ) -> Dict[str, Any]:
+        """
+        Validate custom-voice inputs and build the keyword arguments for `model.generate(...)`.
+
+        Shared by `generate_custom_voice` and `stream_custom_voice`; see `generate_custom_voice` for the arguments.
+        """
+        if self.model.tts_model_type != "custom_voice":
             raise ValueError(
                 f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
                 f"tts_model_size: {self.model.tts_model_size}\n"
                 f"tts_model_type: {self.model.tts_model_type}\n"
-                "does not support generate_voice_design, Please check Model Card or Readme for more details."
+                f"does not support {api_name}, Please check Model Card or Readme for more details."
             )
-        
+
         texts = self._ensure_list(text)
         languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
-        instructs = self._ensure_list(instruct)
+        speakers = self._ensure_list(speaker)
+        if self.model.tts_model_size in "0b6": # for 0b6 model, instruct is not supported
+            instruct = None
+        instructs = self._ensure_list(instruct) if isinstance(instruct, list) else ([instruct] * len(texts) if instruct is not None else [""] * len(texts))
 
         if len(languages) == 1 and len(texts) > 1:
             languages = languages * len(texts)
+        if len(speakers) == 1 and len(texts) > 1:
+            speakers = speakers * len(texts)
         if len(instructs) == 1 and len(texts) > 1:
             instructs = instructs * len(texts)
 
-        if not (len(texts) == len(languages) == len(instructs)):
-            raise ValueError(f"Batch size mismatch: text={len(texts)}, language={len(languages)}, instruct={len(instructs)}")
+        if not (len(texts) == len(languages) == len(speakers) == len(instructs)):
+            raise ValueError(
+                f"Batch size mismatch: text={len(texts)}, language={len(languages)}, speaker={len(speakers)}, instruct={len(instructs)}"
+            )
 
         self._validate_languages(languages)
+        self._validate_speakers(speakers)
 
         input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
 
@@ -714,19 +1132,14 @@ class Qwen3TTSModel:
             else:
                 instruct_ids.append(self._tokenize_texts([self._build_instruct_text(ins)])[0])
 
-        gen_kwargs = self._merge_generate_kwargs(**kwargs)
-
-        talker_codes_list, _ = self.model.generate(
+        return dict(
             input_ids=input_ids,
             instruct_ids=instruct_ids,
             languages=languages,
+            speakers=speakers,
             non_streaming_mode=non_streaming_mode,
-            **gen_kwargs,
         )
 
-        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
-        return wavs, fs
-
     # custom voice model
     @torch.no_grad()
     def generate_custom_voice(
@@ -785,59 +1198,240 @@ class Qwen3TTSModel:
             ValueError:
                 If any speaker/language is unsupported or batch sizes mismatch.
         """
-        if self.model.tts_model_type != "custom_voice":
-            raise ValueError(
-                f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
-                f"tts_model_size: {self.model.tts_model_size}\n"
-                f"tts_model_type: {self.model.tts_model_type}\n"
-                "does not support generate_custom_voice, Please check Model Card or Readme for more details."
-            )
+        model_inputs = self._prepare_custom_voice_inputs(
+            text=text,
+            speaker=speaker,
+            language=language,
+            instruct=instruct,
+            non_streaming_mode=non_streaming_mode,
+            api_name="generate_custom_voice",
+        )
 
-        texts = self._ensure_list(text)
-        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
-        speakers = self._ensure_list(speaker)
-        if self.model.tts_model_size in "0b6": # for 0b6 model, instruct is not supported
-            instruct = None
-        instructs = self._ensure_list(instruct) if isinstance(instruct, list) else ([instruct] * len(texts) if instruct is not None else [""] * len(texts))
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
-        if len(languages) == 1 and len(texts) > 1:
-            languages = languages * len(texts)
-        if len(speakers) == 1 and len(texts) > 1:
-            speakers = speakers * len(texts)
-        if len(instructs) == 1 and len(texts) > 1:
-            instructs = instructs * len(texts)
+        talker_codes_list, _ = self.model.generate(**model_inputs, **gen_kwargs)
 
-        if not (len(texts) == len(languages) == len(speakers) == len(instructs)):
+        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
+        return wavs, fs
+
+
+    def _stream_generate(
+        self,
+        model_inputs: Dict[str, Any],
+        gen_kwargs: Dict[str, Any],
+        chunk_size: int,
+        ref_code: Optional[torch.Tensor] = None,
+        left_context_size: Optional[int] = None,
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Run `model.generate(...)` in a background thread and vocode its codec frames while they are produced.
+
+        Every `chunk_size` frames are pushed to a `Qwen3TTSTokenizerV2DecoderStream`, which keeps the decoder state
+        between chunks instead of re-decoding left context. In ICL mode the stream is first primed with the last
+        `left_context_size` frames of `ref_code` (required with `ref_code`), and their samples are dropped. The
+        decoder looks one frame ahead, so each chunk ends a few samples before a frame boundary; concatenating the
+        chunks gives the same waveform as decoding all frames at once.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"`chunk_size` must be >= 1, got {chunk_size}")
+        if ref_code is not None and (left_context_size is None or left_context_size < 1):
+            raise ValueError(f"`left_context_size` must be >= 1, got {left_context_size}")
+        if len(model_inputs["input_ids"]) != 1:
             raise ValueError(
-                f"Batch size mismatch: text={len(texts)}, language={len(languages)}, speaker={len(speakers)}, instruct={len(instructs)}"
+                f"Streaming synthesis handles one utterance at a time, got a batch of {len(model_inputs['input_ids'])}."
+            )
+        speech_tokenizer = self.model.speech_tokenizer
+        if speech_tokenizer.get_model_type() != "qwen3_tts_tokenizer_12hz":
+            raise ValueError(
+                f"Streaming synthesis requires the 12Hz speech tokenizer, got {speech_tokenizer.get_model_type()}."
             )
+        decoder_stream = Qwen3TTSTokenizerV2DecoderStream(speech_tokenizer.model.decoder)
+        upsample = int(decoder_stream.decoder.total_upsample)
+        fs = int(speech_tokenizer.get_output_sample_rate())
 
-        self._validate_languages(languages)
-        self._validate_speakers(speakers)
+        streamer = _CodecFrameStreamer(eos_token_id=self.model.config.talker_config.codec_eos_token_id)
 
-        input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
+        def _run():
+            try:
+                self.model.generate(**model_inputs, codec_streamer=streamer, **gen_kwargs)
+            except _StreamCancelled:
+                pass
+            except BaseException as e:
+                streamer.error = e
+            finally:
+                streamer.end()
+
+        def _push(codes: torch.Tensor) -> torch.Tensor:
+            with torch.inference_mode():
+                return decoder_stream.push(codes.transpose(0, 1).unsqueeze(0).to(speech_tokenizer.device))[0, 0]
+
+        num_skipped = 0  # reference samples still to drop from the stream output
+        if ref_code is not None:
+            context = ref_code[-left_context_size:].to(torch.long)
+            num_skipped = context.shape[0] * upsample - _push(context).shape[-1]
+
+        def _decode(frames: List[torch.Tensor]) -> np.ndarray:
+            nonlocal num_skipped
+            wav = _push(torch.stack(frames, dim=0))
+            skipped = min(num_skipped, wav.shape[-1])
+            wav = wav[skipped:]
+            num_skipped -= skipped
+            return wav.to(torch.float32).cpu().numpy()
+
+        thread = threading.Thread(target=_run, daemon=True)
+        thread.start()
+        try:
+            pending: List[torch.Tensor] = []
+            while True:
+                frame = streamer.frames.get()
+                if frame is None:
+                    break
+                pending.append(frame.cpu())
+                if len(pending) == chunk_size:
+                    yield _decode(pending), fs
+                    pending = []
+            if pending:
+                yield _decode(pending), fs
+            if streamer.error is not None:
+                raise streamer.error
+        finally:
+            streamer.cancelled.set()
+            thread.join()
 
-        instruct_ids: List[Optional[torch.Tensor]] = []
-        for ins in instructs:
-            if ins is None or ins == "":
-                instruct_ids.append(None)
-            else:
-                instruct_ids.append(self._tokenize_texts([self._build_instruct_text(ins)])[0])
+    @torch.no_grad()
+    def stream_voice_clone(
+        self,
+        text: str,
+        language: str = None,
+        ref_audio: Optional[AudioLike] = None,
+        ref_text: Optional[str] = None,
+        x_vector_only_mode: bool = False,
+        voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]] = None,
+        non_streaming_mode: bool = False,
+        chunk_size: int = 8,
+        left_context_size: int = 25,
+        **kwargs,
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Streaming variant of `generate_voice_clone` for a single utterance.
+
+        Audio is yielded while the talker is still generating: every `chunk_size` codec frames are vocoded as soon as
+        they are sampled. In ICL mode the reference codes are only used as decoder left context, they are never
+        re-synthesized.
+
+        Args:
+            text, language, ref_audio, ref_text, x_vector_only_mode, voice_clone_prompt, non_streaming_mode:
+                Same as `generate_voice_clone`, restricted to one sample.
+            chunk_size:
+                Number of codec frames per yielded chunk. Each chunk holds
+                `chunk_size * speech_tokenizer.get_decode_upsample_rate()` samples (the first and last ones may be
+                shorter).
+            left_context_size:
+                Number of trailing reference frames decoded ahead of the generated ones in ICL mode, as decoder left
+                context. Later chunks continue from the decoder state of the previous one.
+            **kwargs:
+                Generation arguments, same as `generate_voice_clone`.
+
+        Yields:
+            Tuple[np.ndarray, int]:
+                (float32 waveform chunk, sample_rate)
+
+        Raises:
+            ValueError:
+                If more than one sample is requested, the speech tokenizer is not 12Hz, or prompt inputs are invalid.
+        """
+        model_inputs = self._prepare_voice_clone_inputs(
+            text=text,
+            language=language,
+            ref_audio=ref_audio,
+            ref_text=ref_text,
+            x_vector_only_mode=x_vector_only_mode,
+            voice_clone_prompt=voice_clone_prompt,
+            non_streaming_mode=non_streaming_mode,
+            api_name="stream_voice_clone",
+        )
+        ref_code_list = model_inputs["voice_clone_prompt"].get("ref_code", None)
+        ref_code = ref_code_list[0] if ref_code_list is not None else None
 
         gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
-        talker_codes_list, _ = self.model.generate(
-            input_ids=input_ids,
-            instruct_ids=instruct_ids,
-            languages=languages,
-            speakers=speakers,
+        yield from self._stream_generate(model_inputs, gen_kwargs, chunk_size, ref_code, left_context_size)
+
+    @torch.no_grad()
+    def stream_voice_design(
+        self,
+        text: str,
+        instruct: str,
+        language: str = None,
+        non_streaming_mode: bool = True,
+        chunk_size: int = 8,
+        **kwargs,
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Streaming variant of `generate_voice_design` for a single utterance.
+
+        Args:
+            text, instruct, language, non_streaming_mode:
+                Same as `generate_voice_design`, restricted to one sample.
+            chunk_size:
+                Number of codec frames per yielded chunk.
+            **kwargs:
+                Generation arguments, same as `generate_voice_design`.
+
+        Yields:
+            Tuple[np.ndarray, int]:
+                (float32 waveform chunk, sample_rate)
+        """
+        model_inputs = self._prepare_voice_design_inputs(
+            text=text,
+            instruct=instruct,
+            language=language,
             non_streaming_mode=non_streaming_mode,
-            **gen_kwargs,
+            api_name="stream_voice_design",
         )
 
-        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
-        return wavs, fs
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
+
+        yield from self._stream_generate(model_inputs, gen_kwargs, chunk_size)
+
+    @torch.no_grad()
+    def stream_custom_voice(
+        self,
+        text: str,
+        speaker: str,
+        language: str = None,
+        instruct: Optional[str] = None,
+        non_streaming_mode: bool = True,
+        chunk_size: int = 8,
+        **kwargs,
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Streaming variant of `generate_custom_voice` for a single utterance.
+
+        Args:
+            text, speaker, language, instruct, non_streaming_mode:
+                Same as `generate_custom_voice`, restricted to one sample.
+            chunk_size:
+                Number of codec frames per yielded chunk.
+            **kwargs:
+                Generation arguments, same as `generate_custom_voice`.
+
+        Yields:
+            Tuple[np.ndarray, int]:
+                (float32 waveform chunk, sample_rate)
+        """
+        model_inputs = self._prepare_custom_voice_inputs(
+            text=text,
+            speaker=speaker,
+            language=language,
+            instruct=instruct,
+            non_streaming_mode=non_streaming_mode,
+            api_name="stream_custom_voice",
+        )
+
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
+        yield from self._stream_generate(model_inputs, gen_kwargs, chunk_size)
 
     def get_supported_speakers(self) -> Optional[List[str]]:
         """
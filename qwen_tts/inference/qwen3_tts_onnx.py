@@ -0,0 +1,310 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+ONNX Runtime export and CPU backend for the speech tokenizer decoders.
+"""
+
+import copy
+import json
+import os
+from functools import partial
+from typing import List, Optional, Tuple, Union
+
+import torch
+from torch import nn
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+ONNX_DECODER_CONFIG_NAME = "onnx_decoder_config.json"
+
+# graphs written by `export_onnx_decoder`, per tokenizer type
+_ONNX_GRAPHS = {
+    "qwen3_tts_tokenizer_12hz": {"decoder": "decoder.onnx"},
+    "qwen3_tts_tokenizer_25hz": {
+        "dit": "dit.onnx",
+        "dit_conditional": "dit_conditional.onnx",
+        "bigvgan": "bigvgan.onnx",
+    },
+}
+
+
+class _DiTForward(nn.Module):
+    """
+    Forward pass of the 25Hz DiT from the condition embedding, with classifier-free guidance (`dit.onnx`) or
+    conditional only (`dit_conditional.onnx`).
+    """
+
+    def __init__(self, dit, apply_cfg):
+        super().__init__()
+        self.dit = dit
+        self.apply_cfg = apply_cfg
+
+    def forward(self, hidden_states, condition_embedding, time_step):
+        return self.dit(
+            hidden_states=hidden_states,
+            time_step=time_step,
+            apply_cfg=self.apply_cfg,
+            condition_embedding=condition_embedding,
+        )
+
+
+def _export_graph(module, args, dynamic_dims, path, input_names, output_names, opset_version):
+    dynamic_shapes = tuple(
+        None if dims is None else {dim: torch.export.Dim.AUTO for dim in dims} for dims in dynamic_dims
+    )
+    torch.onnx.export(
+        module,
+        args,
+        path,
+        dynamo=True,
+        input_names=input_names,
+        output_names=output_names,
+        dynamic_shapes=dynamic_shapes,
+        opset_version=opset_version,
+    )
+
+
+@torch.no_grad()
+def export_onnx_decoder(tokenizer, output_dir: str, opset_version: int = 18) -> List[str]:
+    """
+    Export the decoder of a speech tokenizer to ONNX, for `Qwen3TTSTokenizer.load_onnx_decoder`.
+
+    12Hz: `decoder.onnx` maps codes to the waveform. 25Hz: `dit.onnx` and `dit_conditional.onnx` are one DiT
+    evaluation from the condition embedding, with and without classifier-free guidance (the conditions are encoded
+    once per decode and the ODE loop stays in Python), and `bigvgan.onnx` maps the mel spectrogram to the waveform.
+    Batch size and sequence lengths are dynamic.
+    Graphs are exported in float32 on CPU, whatever the dtype and device of the loaded model.
+
+    Args:
+        tokenizer (Qwen3TTSTokenizer):
+            Loaded speech tokenizer.
+        output_dir (str):
+            Directory for the graphs and `onnx_decoder_config.json`.
+        opset_version (int):
+            ONNX opset.
+
+    Returns:
+        List[str]: paths of the exported graphs.
+    """
+    model_type = tokenizer.get_model_type()
+    if model_type not in _ONNX_GRAPHS:
+        raise ValueError(f"Unknown model type: {model_type}")
+    os.makedirs(output_dir, exist_ok=True)
+    graphs = _ONNX_GRAPHS[model_type]
+    decoder = copy.deepcopy(tokenizer.model.decoder).float().cpu().eval()
+
+    # example inputs use a batch of 2 so that the batch dimension is not specialized
+    if model_type == "qwen3_tts_tokenizer_12hz":
+        config = decoder.config
+        # longer than the sliding window, so that the exported mask handles both cases
+        codes = torch.randint(0, config.codebook_size, (2, config.num_quantizers, 2 * config.sliding_window))
+        _export_graph(
+            decoder,
+            (codes,),
+            ({0, 2},),
+            os.path.join(output_dir, graphs["decoder"]),
+            ["codes"],
+            ["wav"],
+            opset_version,
+        )
+    else:
+        config = decoder.dit.config
+        code_length = 16
+        mel_length = code_length * config.repeats
+        for name, apply_cfg in (("dit", True), ("dit_conditional", False)):
+            args = (
+                torch.randn(2, mel_length, config.mel_dim),
+                # with guidance, conditional rows followed by the unconditional ones
+                torch.randn(4 if apply_cfg else 2, mel_length, config.hidden_size),
+                torch.tensor(0.5),
+            )
+            _export_graph(
+                _DiTForward(decoder.dit, apply_cfg),
+                args,
+                ({0, 1}, {0, 1}, None),
+                os.path.join(output_dir, graphs[name]),
+                ["hidden_states", "condition_embedding", "time_step"],
+                ["velocity"],
+                opset_version,
+            )
+        _export_graph(
+            decoder.bigvgan,
+            (torch.randn(2, config.mel_dim, mel_length),),
+            ({0, 2},),
+            os.path.join(output_dir, graphs["bigvgan"]),
+            ["mel"],
+            ["wav"],
+            opset_version,
+        )
+
+    with open(os.path.join(output_dir, ONNX_DECODER_CONFIG_NAME), "w", encoding="utf-8") as f:
+        json.dump({"model_type": model_type, "opset_version": opset_version, "graphs": graphs}, f, indent=2)
+    return [os.path.join(output_dir, name) for name in graphs.values()]
+
+
+class Qwen3TTSOnnxDecoder:
+    """
+    Runs the decoder networks of a speech tokenizer with ONNX Runtime on CPU.
+
+    Only the network evaluations move to ONNX Runtime. Chunking (12Hz), the DiT condition encoding and ODE loop (25Hz)
+    are the ones of the PyTorch decoder, so both backends give the same audio up to float rounding.
+    """
+
+    def __init__(self, onnx_dir: str, num_threads: Optional[int] = None):
+        """
+        Args:
+            onnx_dir (str):
+                Directory written by `export_onnx_decoder`.
+            num_threads (Optional[int]):
+                Intra-op threads of each session. ONNX Runtime picks one per physical core if unset.
+        """
+        if onnxruntime is None:
+            raise ImportError("onnxruntime is required for the ONNX decoder. Please install it.")
+        config_path = os.path.join(onnx_dir, ONNX_DECODER_CONFIG_NAME)
+        if not os.path.isfile(config_path):
+            raise ValueError(f"{config_path} not found, export the decoder with `export_onnx_decoder` first.")
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        self.model_type = config["model_type"]
+
+        option = onnxruntime.SessionOptions()
+        option.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads is not None:
+            option.intra_op_num_threads = num_threads
+        providers = ["CPUExecutionProvider"]
+        self.sessions = {
+            name: onnxruntime.InferenceSession(os.path.join(onnx_dir, file), sess_options=option, providers=providers)
+            for name, file in config["graphs"].items()
+        }
+
+    def _run(self, name: str, *inputs: torch.Tensor) -> torch.Tensor:
+        session = self.sessions[name]
+        feed = {
+            arg.name: (x.float() if x.is_floating_point() else x).detach().cpu().numpy()
+            for arg, x in zip(session.get_inputs(), inputs)
+        }
+        output = torch.from_numpy(session.run(None, feed)[0])
+        dtype = inputs[0].dtype if inputs[0].is_floating_point() else output.dtype
+        return output.to(device=inputs[0].device, dtype=dtype)
+
+    def _dit_velocity(self, hidden_states, condition_embedding, time_step, apply_cfg):
+        name = "dit" if apply_cfg else "dit_conditional"
+        if name not in self.sessions:
+            raise ValueError(f"{name}.onnx is missing, export the decoder again with `export_onnx_decoder`.")
+        return self._run(name, hidden_states, condition_embedding, time_step)
+
+    @torch.no_grad()
+    def decode(
+        self,
+        model,
+        audio_codes: torch.Tensor,
+        xvectors: Optional[torch.Tensor] = None,
+        ref_mels: Optional[torch.Tensor] = None,
+        parallel_chunks: bool = False,
+        generator: Optional[Union[torch.Generator, List[torch.Generator]]] = None,
+        num_steps: int = 10,
+        solver: str = "euler",
+        guidance_interval: Optional[Tuple[float, float]] = None,
+        guidance_reuse_steps: int = 0,
+    ) -> List[torch.Tensor]:
+        """
+        Same as `model.decode(...).audio_values`, with the decoder networks run by ONNX Runtime.
+
+        Args:
+            model:
+                The `Qwen3TTSTokenizerV1Model` / `Qwen3TTSTokenizerV2Model` the graphs were exported from.
+            audio_codes, xvectors, ref_mels, parallel_chunks, generator, num_steps, solver, guidance_interval,
+            guidance_reuse_steps:
+                Same as `model.decode`.
+
+        Returns:
+            List[torch.Tensor]: one waveform per sample.
+        """
+        if model.get_model_type() != self.model_type:
+            raise ValueError(f"ONNX graphs were exported for {self.model_type}, got a {model.get_model_type()} model.")
+        if self.model_type == "qwen3_tts_tokenizer_12hz":
+            audio_values = model.decoder.chunked_decode(
+                audio_codes.transpose(1, 2), parallel=parallel_chunks, forward_fn=partial(self._run, "decoder")
+            ).squeeze(1)
+            audio_lengths = (audio_codes[..., 0] > 0).sum(1) * model.decode_upsample_rate
+        else:
+            mel_spectrogram = model.decoder.dit.sample(
+                xvectors,
+                ref_mels,
+                audio_codes,
+                num_steps=num_steps,
+                velocity_fn=self._dit_velocity,
+                generator=generator,
+                solver=solver,
+                guidance_interval=guidance_interval,
+                guidance_reuse_steps=guidance_reuse_steps,
+            )
+            audio_values = self._run("bigvgan", mel_spectrogram)
+            audio_lengths = (audio_codes > 0).sum(1) * model.decode_upsample_rate
+        return [a[:l] for a, l in zip(audio_values, audio_lengths)]
+
+
+@torch.no_grad()
+def check_onnx_decoder_parity(
+    tokenizer,
+    onnx_decoder: Qwen3TTSOnnxDecoder,
+    batch_size: int = 2,
+    num_frames: int = 150,
+    seed: int = 0,
+) -> float:
+    """
+    Decode random codes with the PyTorch and the ONNX Runtime decoder and compare.
+
+    Args:
+        tokenizer (Qwen3TTSTokenizer):
+            Tokenizer the graphs were exported from.
+        onnx_decoder (Qwen3TTSOnnxDecoder):
+            Loaded graphs.
+        batch_size (int):
+            Number of random utterances.
+        num_frames (int):
+            Codec frames per utterance.
+        seed (int):
+            Seed of the random codes and of the 25Hz ODE noise, which both paths draw identically.
+
+    Returns:
+        float: maximum absolute sample difference.
+    """
+    model = tokenizer.model
+    generator = torch.Generator().manual_seed(seed)
+    kwargs = {}
+    if tokenizer.get_model_type() == "qwen3_tts_tokenizer_12hz":
+        config = model.decoder.config
+        # codes are > 0, which `decode` treats as valid frames
+        codes = torch.randint(
+            1, config.codebook_size, (batch_size, num_frames, config.num_quantizers), generator=generator
+        )
+    else:
+        config = model.decoder.dit.config
+        codes = torch.randint(1, config.num_embeds, (batch_size, num_frames), generator=generator)
+        kwargs["xvectors"] = torch.randn(batch_size, config.enc_emb_dim, generator=generator).to(tokenizer.device)
+        kwargs["ref_mels"] = torch.randn(batch_size, 64, config.mel_dim, generator=generator).to(tokenizer.device)
+        kwargs["generator"] = torch.Generator(device=tokenizer.device).manual_seed(seed)
+    codes = codes.to(tokenizer.device)
+
+    expected = model.decode(codes, return_dict=True, **kwargs).audio_values
+    if "generator" in kwargs:
+        kwargs["generator"].manual_seed(seed)
+    actual = onnx_decoder.decode(model, codes, **kwargs)
+    return max((e.float() - a.float()).abs().max().item() for e, a in zip(expected, actual))
@@ -0,0 +1,178 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import torch
+
+from ..core.models.scheduling_qwen3_tts import Qwen3TTSTalkerScheduler
+from .qwen3_tts_model import AudioLike, Qwen3TTSModel, VoiceClonePromptItem
+
+
+class Qwen3TTSScheduler:
+    """
+    Continuous-batching front end for a `Qwen3TTSModel`.
+
+    Requests can be added at any time, also while others are being generated. Each call to `step` runs one talker
+    decode step for all running requests; a request leaves the batch as soon as it finishes, and waiting requests
+    take its place at the next step. This keeps the batch full when utterances have very different lengths, which a
+    single `generate_*` call cannot do.
+
+    Example:
+        scheduler = Qwen3TTSScheduler(tts, max_batch_size=8)
+        scheduler.add_custom_voice("Hello.", speaker="Vivian")
+        for request_id, wav, sr in scheduler.run():
+            ...
+
+    Notes:
+      - Sampling parameters are shared by all requests and fixed at construction time; they are merged with
+        `generate_config.json` exactly like in the `generate_*` methods.
+      - `add_*` may be called from other threads; `step` / `run` must be driven from a single thread.
+    """
+
+    def __init__(self, tts: Qwen3TTSModel, max_batch_size: int = 16, **kwargs):
+        """
+        Args:
+            tts:
+                Loaded `Qwen3TTSModel`.
+            max_batch_size:
+                Maximum number of requests decoded together.
+            **kwargs:
+                Generation arguments, same as `Qwen3TTSModel.generate_custom_voice` (do_sample, top_k, top_p,
+                temperature, repetition_penalty, subtalker_*, max_new_tokens, eos_token_id) and `prefix_cache`, a
+                `Qwen3TTSTalkerPrefixCache` reusing the prefill of repeated voice prompts.
+        """
+        self.tts = tts
+        gen_kwargs = tts._merge_generate_kwargs(**kwargs)
+        self.scheduler = Qwen3TTSTalkerScheduler(tts.model, max_batch_size=max_batch_size, **gen_kwargs)
+        self._ref_codes: Dict[int, Optional[torch.Tensor]] = {}
+
+    def _add(self, model_inputs: Dict[str, Any], ref_code_list: Optional[List[Optional[torch.Tensor]]]) -> List[int]:
+        talker_input_embeds, trailing_text_hiddens, tts_pad_embed, prefix_lengths = self.tts.model.build_talker_prompts(
+            **model_inputs, return_prefix_lengths=True
+        )
+        request_ids = []
+        for i, (talker_input_embed, trailing_text_hidden) in enumerate(zip(talker_input_embeds, trailing_text_hiddens)):
+            request_id = self.scheduler.add_request(
+                talker_input_embed, trailing_text_hidden, tts_pad_embed, prefix_length=prefix_lengths[i]
+            )
+            self._ref_codes[request_id] = ref_code_list[i] if ref_code_list is not None else None
+            request_ids.append(request_id)
+        return request_ids
+
+    @torch.no_grad()
+    def add_voice_clone(
+        self,
+        text: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        ref_audio: Optional[Union[AudioLike, List[AudioLike]]] = None,
+        ref_text: Optional[Union[str, List[Optional[str]]]] = None,
+        x_vector_only_mode: Union[bool, List[bool]] = False,
+        voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]] = None,
+        non_streaming_mode: bool = False,
+    ) -> List[int]:
+        """
+        Queue voice-clone request(s). Arguments are the same as `Qwen3TTSModel.generate_voice_clone`.
+
+        Returns:
+            List[int]: one request id per text.
+        """
+        model_inputs = self.tts._prepare_voice_clone_inputs(
+            text=text,
+            language=language,
+            ref_audio=ref_audio,
+            ref_text=ref_text,
+            x_vector_only_mode=x_vector_only_mode,
+            voice_clone_prompt=voice_clone_prompt,
+            non_streaming_mode=non_streaming_mode,
+            api_name="add_voice_clone",
+        )
+        return self._add(model_inputs, model_inputs["voice_clone_prompt"].get("ref_code", None))
+
+    @torch.no_grad()
+    def add_voice_design(
+        self,
+        text: Union[str, List[str]],
+        instruct: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        non_streaming_mode: bool = True,
+    ) -> List[int]:
+        """
+        Queue voice-design request(s). Arguments are the same as `Qwen3TTSModel.generate_voice_design`.
+
+        Returns:
+            List[int]: one request id per text.
+        """
+        model_inputs = self.tts._prepare_voice_design_inputs(
+            text=text,
+            instruct=instruct,
+            language=language,
+            non_streaming_mode=non_streaming_mode,
+            api_name="add_voice_design",
+        )
+        return self._add(model_inputs, None)
+
+    @torch.no_grad()
+    def add_custom_voice(
+        self,
+        text: Union[str, List[str]],
+        speaker: Union[str, List[str]],
+        language: Union[str, List[str]] = None,
+        instruct: Optional[Union[str, List[str]]] = None,
+        non_streaming_mode: bool = True,
+    ) -> List[int]:
+        """
+        Queue custom-voice request(s). Arguments are the same as `Qwen3TTSModel.generate_custom_voice`.
+
+        Returns:
+            List[int]: one request id per text.
+        """
+        model_inputs = self.tts._prepare_custom_voice_inputs(
+            text=text,
+            speaker=speaker,
+            language=language,
+            instruct=instruct,
+            non_streaming_mode=non_streaming_mode,
+            api_name="add_custom_voice",
+        )
+        return self._add(model_inputs, None)
+
+    def has_unfinished_requests(self) -> bool:
+        return self.scheduler.has_unfinished_requests()
+
+    @torch.no_grad()
+    def step(self) -> List[Tuple[int, np.ndarray, int]]:
+        """
+        Run one decode step and vocode the requests that finished in it.
+
+        Returns:
+            List[Tuple[int, np.ndarray, int]]:
+                (request_id, wav, sample_rate) for every finished request.
+        """
+        finished = self.scheduler.step()
+        if not finished:
+            return []
+        request_ids = [request_id for request_id, _, _ in finished]
+        ref_code_list = [self._ref_codes.pop(request_id) for request_id in request_ids]
+        wavs, fs = self.tts._decode_codes([codes for _, codes, _ in finished], ref_code_list)
+        return [(request_id, wav, fs) for request_id, wav in zip(request_ids, wavs)]
+
+    def run(self):
+        """
+        Step until all queued requests are done, yielding `(request_id, wav, sample_rate)` as they finish.
+        """
+        while self.has_unfinished_requests():
+            yield from self.step()
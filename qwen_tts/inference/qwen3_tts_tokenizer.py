@@ -32,6 +32,9 @@ from ..core import (
     Qwen3TTSTokenizerV2Config,
     Qwen3TTSTokenizerV2Model,
 )
+from ..core.tokenizer_12hz.modeling_qwen3_tts_tokenizer_v2 import Qwen3TTSTokenizerV2DecoderStream
+from ..core.tokenizer_25hz.modeling_qwen3_tts_tokenizer_v1 import Qwen3TTSTokenizerV1DecoderStream
+from .qwen3_tts_onnx import Qwen3TTSOnnxDecoder
 
 AudioInput = Union[
     str,  # wav path, or base64 string
@@ -59,6 +62,7 @@ class Qwen3TTSTokenizer:
         self.feature_extractor = None
         self.config = None
         self.device = None
+        self.onnx_decoder = None
 
     @classmethod
     def from_pretrained(cls, pretrained_model_name_or_path: str, **kwargs) -> "Qwen3TTSTokenizer":
@@ -98,6 +102,24 @@ class Qwen3TTSTokenizer:
 
         return inst
 
+    def load_onnx_decoder(self, onnx_dir: str, num_threads: Optional[int] = None) -> None:
+        """
+        Run `decode` through ONNX Runtime on CPU instead of PyTorch.
+
+        Args:
+            onnx_dir (str):
+                Directory written by `export_onnx_decoder` (or `python -m qwen_tts.cli.export_onnx`) for this
+                tokenizer.
+            num_threads (Optional[int]):
+                Intra-op threads of each ONNX Runtime session.
+        """
+        onnx_decoder = Qwen3TTSOnnxDecoder(onnx_dir, num_threads=num_threads)
+        if onnx_decoder.model_type != self.get_model_type():
+            raise ValueError(
+                f"ONNX graphs were exported for {onnx_decoder.model_type}, this tokenizer is {self.get_model_type()}."
+            )
+        self.onnx_decoder = onnx_decoder
+
     def _is_probably_base64(self, s: str) -> bool:
         if s.startswith("data:audio"):
             return True
@@ -259,6 +281,12 @@ class Qwen3TTSTokenizer:
     def decode(
         self,
         encoded,
+        parallel_chunks: bool = False,
+        generator: Optional[Union[torch.Generator, List[torch.Generator]]] = None,
+        num_steps: int = 10,
+        solver: str = "euler",
+        guidance_interval: Optional[Tuple[float, float]] = None,
+        guidance_reuse_steps: int = 0,
     ) -> Tuple[List[np.ndarray], int]:
         """
         Decode back to waveform.
@@ -277,6 +305,23 @@ class Qwen3TTSTokenizer:
                 - ModelOutput returned by `encode()`, OR
                 - dict, OR
                 - list[dict]
+            parallel_chunks (bool):
+                12Hz only. Decode all chunks of long inputs in one batched forward pass instead of one after the
+                other. Same output, faster on many-core CPUs, uses more memory.
+            generator (Optional[Union[torch.Generator, List[torch.Generator]]]):
+                25Hz only. Generator(s) of the DiT initial noise on the tokenizer device, one for the batch or one per
+                sample, for reproducible outputs without touching the global RNG.
+            num_steps (int):
+                25Hz only. Points of the DiT ODE time grid (`num_steps - 1` solver steps).
+            solver (str):
+                25Hz only. DiT ODE solver: "euler" (default), "midpoint", "heun" or "multistep". Second-order solvers
+                reach the 10-step Euler quality with fewer DiT evaluations, see `benchmark_dit_solvers`.
+            guidance_interval (Optional[Tuple[float, float]]):
+                25Hz only. ODE time window (0 is noise, 1 is the mel spectrogram) where classifier-free guidance is
+                applied; DiT evaluations outside of it run a single conditional batch. Everywhere if unset.
+            guidance_reuse_steps (int):
+                25Hz only. DiT evaluations after a guided one that run conditional only and reuse its guidance term.
+                See `benchmark_dit_guidance` for the quality of both options.
 
         Returns:
             Tuple[List[np.ndarray], int]:
@@ -351,12 +396,40 @@ class Qwen3TTSTokenizer:
                     ref_mels_list = [_to_tensor(m, dtype=torch.float32) for m in ref_mels_list]
                     ref_mels_padded = pad_sequence(ref_mels_list, batch_first=True, padding_value=0).to(self.device).to(self.model.dtype)
 
-                dec = self.model.decode(audio_codes_padded, xvectors_batch, ref_mels_padded, return_dict=True)
-                wav_tensors = dec.audio_values
+                if self.onnx_decoder is not None:
+                    wav_tensors = self.onnx_decoder.decode(
+                        self.model,
+                        audio_codes_padded,
+                        xvectors_batch,
+                        ref_mels_padded,
+                        generator=generator,
+                        num_steps=num_steps,
+                        solver=solver,
+                        guidance_interval=guidance_interval,
+                        guidance_reuse_steps=guidance_reuse_steps,
+                    )
+                else:
+                    dec = self.model.decode(
+                        audio_codes_padded,
+                        xvectors_batch,
+                        ref_mels_padded,
+                        return_dict=True,
+                        generator=generator,
+                        num_steps=num_steps,
+                        solver=solver,
+                        guidance_interval=guidance_interval,
+                        guidance_reuse_steps=guidance_reuse_steps,
+                    )
+                    wav_tensors = dec.audio_values
 
             elif model_type == "qwen3_tts_tokenizer_12hz":
-                dec = self.model.decode(audio_codes_padded, return_dict=True)
-                wav_tensors = dec.audio_values
+                if self.onnx_decoder is not None:
+                    wav_tensors = self.onnx_decoder.decode(
+                        self.model, audio_codes_padded, parallel_chunks=parallel_chunks
+                    )
+                else:
+                    dec = self.model.decode(audio_codes_padded, return_dict=True, parallel_chunks=parallel_chunks)
+                    wav_tensors = dec.audio_values
 
             else:
                 raise ValueError(f"Unknown model type: {model_type}")
@@ -364,6 +437,57 @@ class Qwen3TTSTokenizer:
         wavs = [w.to(torch.float32).detach().cpu().numpy() for w in wav_tensors]
         return wavs, int(self.model.get_output_sample_rate())
 
+    def decode_stream(
+        self,
+        xvectors=None,
+        ref_mels=None,
+        **kwargs,
+    ) -> Union[Qwen3TTSTokenizerV1DecoderStream, Qwen3TTSTokenizerV2DecoderStream]:
+        """
+        Open an incremental decoder for codes that arrive over time, e.g. from a talker generating in real time.
+
+        - 12Hz: a `Qwen3TTSTokenizerV2DecoderStream`. `push(codes)` takes `(batch, num_quantizers, n)` codes and
+          returns the samples they complete, `(batch, 1, num_samples)`.
+        - 25Hz: a `Qwen3TTSTokenizerV1DecoderStream` conditioned on `xvectors` / `ref_mels`. `push(codes)` takes
+          `(batch, n)` codes and returns the finished samples, `(batch, num_samples)`; `flush()` returns the samples
+          held back as right context once the last codes are pushed.
+
+        Streams run the PyTorch decoder on the tokenizer device, also after `load_onnx_decoder`.
+
+        Args:
+            xvectors, ref_mels:
+                25Hz only. Speaker conditioning as returned by `encode(...)`, for one sample or a batch (torch tensors
+                or numpy arrays).
+            **kwargs:
+                25Hz only. Options of `Qwen3TTSTokenizerV1DecoderStream`: context sizes, `generator` and the DiT
+                sampling options of `decode` (`num_steps`, `solver`, `guidance_interval`, ...).
+
+        Returns:
+            The stream.
+        """
+        model_type = self.model.get_model_type()
+        if model_type == "qwen3_tts_tokenizer_12hz":
+            if kwargs:
+                raise ValueError(f"Unsupported options for the 12Hz decoder stream: {sorted(kwargs)}")
+            return Qwen3TTSTokenizerV2DecoderStream(self.model.decoder)
+        if model_type != "qwen3_tts_tokenizer_25hz":
+            raise ValueError(f"Unknown model type: {model_type}")
+        if xvectors is None or ref_mels is None:
+            raise ValueError("25Hz decode requires `xvectors` and `ref_mels`.")
+
+        xvectors = torch.as_tensor(xvectors)
+        ref_mels = torch.as_tensor(ref_mels)
+        if xvectors.dim() == 1:  # (D,) -> (1, D)
+            xvectors = xvectors.unsqueeze(0)
+        if ref_mels.dim() == 2:  # (T, M) -> (1, T, M)
+            ref_mels = ref_mels.unsqueeze(0)
+        return Qwen3TTSTokenizerV1DecoderStream(
+            self.model.decoder,
+            xvectors.to(self.device).to(self.model.dtype),
+            ref_mels.to(self.device).to(self.model.dtype),
+            **kwargs,
+        )
+
     def get_model_type(self) -> str:
         """
         Get the underlying tokenizer model type.